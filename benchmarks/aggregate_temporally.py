@@ -0,0 +1,55 @@
+import sys
+import time
+import numpy as np
+import pandas as pd
+import earth_data_kit.stitching.engines.commons as commons
+from earth_data_kit.stitching.decorators import log_time, log_init
+
+
+def aggregate_temporally_loop(df, start, end, resolution):
+    """Previous implementation, one boolean mask over the rows per bin."""
+    date_range = pd.date_range(start=start, end=end, freq=f"{resolution}", tz="UTC")
+    df["aggregated_date"] = None
+    for date in date_range:
+        mask = (df["date"] >= date) & (df["date"] < date + pd.Timedelta(resolution))
+        df.loc[mask, "aggregated_date"] = date
+    df["date"] = df["aggregated_date"]
+    return df.drop("aggregated_date", axis=1)
+
+
+def create_scans(n_rows, start, end, seed=0):
+    """Rows with random scan times between start and end, like minute level GOES scans."""
+    rng = np.random.default_rng(seed)
+    span = (end - start).value
+    dates = start + pd.to_timedelta(rng.integers(0, span, n_rows), unit="ns")
+    return pd.DataFrame({"engine_path": np.arange(n_rows).astype(str), "date": dates})
+
+
+@log_init
+@log_time
+def aggregate_temporally(n_rows=1_000_000, n_bins=10_000, loop_bins=100):
+    start = pd.Timestamp("2020-01-01", tz="UTC")
+    end = start + pd.Timedelta(hours=n_bins - 1)
+    df = create_scans(n_rows, start, end + pd.Timedelta(hours=1))
+
+    t = time.time()
+    result = commons.aggregate_temporally(df.copy(), start, end, "1h")
+    print(f"searchsorted, {n_rows} rows, {n_bins} bins: {time.time() - t:.3f}s")
+
+    # The loop is O(rows x bins), timed on fewer bins and checked against the new version
+    loop_end = start + pd.Timedelta(hours=loop_bins - 1)
+    sample = df[df["date"] < loop_end + pd.Timedelta(hours=1)]
+    t = time.time()
+    expected = aggregate_temporally_loop(sample.copy(), start, loop_end, "1h")
+    print(f"loop, {len(sample)} rows, {loop_bins} bins: {time.time() - t:.3f}s")
+
+    actual = commons.aggregate_temporally(sample.copy(), start, loop_end, "1h")
+    assert (
+        pd.to_datetime(expected["date"], utc=True).to_numpy()
+        == actual["date"].to_numpy()
+    ).all()
+    return result
+
+
+if __name__ == "__main__":
+    aggregate_temporally(*[int(a) for a in sys.argv[1:]])
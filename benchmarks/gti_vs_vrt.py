@@ -0,0 +1,123 @@
+import sys
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+from osgeo import gdal
+import earth_data_kit.stitching.vrt as vrt
+import earth_data_kit.stitching.gti as gti
+from earth_data_kit.stitching.decorators import log_time, log_init
+
+gdal.UseExceptions()
+
+TILE_SIZE = 256
+RES = 0.0001
+
+
+def create_band_tiles(base_path, n_tiles):
+    """
+    Tile-band rows of a synthetic mosaic of n_tiles tiles on a square grid.
+
+    Every tile points to the same small GeoTIFF, georeferenced at its grid position through
+    a ``vrt://`` connection string, so the benchmark does not need n_tiles files on disk.
+    """
+    cols = int(np.ceil(np.sqrt(n_tiles)))
+    idx = np.arange(n_tiles)
+    x_min = (idx % cols) * TILE_SIZE * RES
+    y_max = 10.0 - (idx // cols) * TILE_SIZE * RES
+    x_max = x_min + TILE_SIZE * RES
+    y_min = y_max - TILE_SIZE * RES
+    gdal_paths = [
+        f"vrt://{base_path}?a_ullr={a},{b},{c},{d}"
+        for a, b, c, d in zip(x_min, y_max, x_max, y_min)
+    ]
+    return pd.DataFrame(
+        {
+            "tile_id": idx,
+            "date_str": "2020-01-01-00:00:00",
+            "gdal_path": gdal_paths,
+            "source_idx": 1,
+            "description": "B1",
+            "dtype": "UInt16",
+            "nodataval": 0.0,
+            "block_x_size": TILE_SIZE,
+            "block_y_size": 16,
+            "color_interp": "Gray",
+            "crs": "EPSG:4326",
+            "projection": "EPSG:4326",
+            "x_min": x_min,
+            "y_min": y_min,
+            "x_max": x_max,
+            "y_max": y_max,
+            "x_size": TILE_SIZE,
+            "y_size": TILE_SIZE,
+        }
+    )
+
+
+def read_windows(path, n_windows=20, window=1024, seed=0):
+    ds = gdal.Open(path)
+    band = ds.GetRasterBand(1)
+    rng = np.random.default_rng(seed)
+    total = 0.0
+    for _ in range(n_windows):
+        x = int(rng.integers(0, max(ds.RasterXSize - window, 1)))
+        y = int(rng.integers(0, max(ds.RasterYSize - window, 1)))
+        total += float(band.ReadAsArray(x, y, window, window).mean())
+    return total
+
+
+@log_init
+@log_time
+def gti_vs_vrt(n_tiles=50000):
+    tmp_dir = tempfile.mkdtemp()
+    base_path = f"{tmp_dir}/base.tif"
+    ds = gdal.GetDriverByName("GTiff").Create(
+        base_path, TILE_SIZE, TILE_SIZE, 1, gdal.GDT_UInt16
+    )
+    ds.GetRasterBand(1).WriteArray(
+        np.random.default_rng(0).integers(
+            1, 1000, (TILE_SIZE, TILE_SIZE), dtype=np.uint16
+        )
+    )
+    ds = None
+
+    band_tiles = create_band_tiles(base_path, n_tiles)
+    bbox = (
+        band_tiles["x_min"].min(),
+        band_tiles["y_min"].min(),
+        band_tiles["x_max"].max(),
+        band_tiles["y_max"].max(),
+    )
+    results = {}
+
+    start = time.time()
+    vrt_path = f"{tmp_dir}/vrt/2020-01-01-00:00:00.vrt"
+    vrt.write_mosaic_vrt(vrt_path, band_tiles, ["B1"], bbox)
+    results["vrt build"] = time.time() - start
+
+    start = time.time()
+    index_path = f"{tmp_dir}/gti/tile_index.gpkg"
+    layers = gti.write_tile_index(index_path, band_tiles)
+    gti_path = f"{tmp_dir}/gti/2020-01-01-00:00:00.vrt"
+    gti.write_mosaic_gti(
+        gti_path, index_path, layers, "2020-01-01-00:00:00", band_tiles, ["B1"], bbox
+    )
+    results["gti build"] = time.time() - start
+
+    for name, path in [("vrt", vrt_path), ("gti", gti_path)]:
+        start = time.time()
+        gdal.Open(path).GetRasterBand(1).GetBlockSize()
+        results[f"{name} open"] = time.time() - start
+
+        start = time.time()
+        read_windows(path)
+        results[f"{name} read 20 windows"] = time.time() - start
+
+    for k, v in results.items():
+        print(f"{k}: {v:.3f}s")
+    return results
+
+
+if __name__ == "__main__":
+    gti_vs_vrt(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,38 @@
+import os
+import sys
+import time
+import datetime
+import earth_data_kit.stitching.engines.s3 as s3
+from earth_data_kit.stitching.decorators import log_time, log_init
+
+# Public bucket, one search path per year of Sentinel-2 L2A COGs over a MGRS tile, the
+# wildcards spanning its month and scene prefixes
+SOURCE = "s3://sentinel-cogs/sentinel-s2-l2a-cogs/34/T/DL/%Y/*/*/B04.tif"
+
+
+def scan(lister, source, time_opts, tmp_dir):
+    os.environ["EDK_S3_LISTER"] = lister
+    t = time.time()
+    df = s3.S3().scan(source, time_opts, {}, tmp_dir, "description")
+    print(f"{lister}: {len(df)} keys in {time.time() - t:.2f}s")
+    return df
+
+
+@log_init
+@log_time
+def s3_listing(years=3, tmp_dir="/tmp"):
+    """Time S3.scan with the s5cmd and the native listers on the same search paths."""
+    os.environ.setdefault("AWS_NO_SIGN_REQUEST", "YES")
+    os.environ.setdefault("AWS_REGION", "us-west-2")
+    time_opts = {
+        "start": datetime.datetime(2023 - years + 1, 1, 1),
+        "end": datetime.datetime(2023, 12, 31),
+    }
+
+    native = scan("native", SOURCE, time_opts, tmp_dir)
+    s5cmd = scan("s5cmd", SOURCE, time_opts, tmp_dir)
+    assert sorted(native["engine_path"]) == sorted(s5cmd["engine_path"])
+
+
+if __name__ == "__main__":
+    s3_listing(*[int(a) for a in sys.argv[1:]])
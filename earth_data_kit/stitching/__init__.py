@@ -1 +1,8 @@
 from earth_data_kit.stitching.classes.dataset import Dataset
+from earth_data_kit.stitching.classes.target_grid import TargetGrid
+from earth_data_kit.stitching.executors import set_client
+from earth_data_kit.stitching.engines.listing_cache import (
+    ListingCache,
+    set_listing_cache,
+)
+from earth_data_kit.stitching.engines.raster_cache import RasterCache, set_raster_cache
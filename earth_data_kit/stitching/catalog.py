@@ -0,0 +1,272 @@
+import os
+import json
+import logging
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import shapely
+import earth_data_kit.utilities.helpers as helpers
+
+logger = logging.getLogger(__name__)
+
+BAND_TYPE = pa.struct(
+    [
+        pa.field("source_idx", pa.int32()),
+        pa.field("description", pa.string()),
+        pa.field("dtype", pa.string()),
+        pa.field("nodataval", pa.float64()),
+        pa.field("block_x_size", pa.int32()),
+        pa.field("block_y_size", pa.int32()),
+        pa.field("color_interp", pa.string()),
+    ]
+)
+
+BBOX_TYPE = pa.struct(
+    [
+        pa.field("xmin", pa.float64()),
+        pa.field("ymin", pa.float64()),
+        pa.field("xmax", pa.float64()),
+        pa.field("ymax", pa.float64()),
+    ]
+)
+
+STATE_KEY = b"edk"
+
+# Columns identifying a tile, stable across rewrites of the catalog unlike row numbers
+KEY_COLUMNS = ["gdal_path", "date"]
+
+GEOMETRY_TYPE_NAMES = {
+    shapely.GeometryType.POINT: "Point",
+    shapely.GeometryType.LINESTRING: "LineString",
+    shapely.GeometryType.POLYGON: "Polygon",
+    shapely.GeometryType.MULTIPOLYGON: "MultiPolygon",
+    shapely.GeometryType.GEOMETRYCOLLECTION: "GeometryCollection",
+}
+
+CATALOG_SCHEMA = pa.schema(
+    [
+        pa.field("engine_path", pa.string()),
+        pa.field("gdal_path", pa.string()),
+        pa.field("date", pa.timestamp("us", tz="UTC")),
+        pa.field("tile_name", pa.string()),
+        pa.field("geo_transform", pa.list_(pa.float64(), 6)),
+        pa.field("projection", pa.dictionary(pa.int32(), pa.string())),
+        pa.field("bands", pa.list_(BAND_TYPE)),
+        pa.field("length_unit", pa.dictionary(pa.int32(), pa.string())),
+        pa.field("x_size", pa.int64()),
+        pa.field("y_size", pa.int64()),
+        pa.field("crs", pa.dictionary(pa.int32(), pa.string())),
+        pa.field("bbox", BBOX_TYPE),
+        pa.field("geometry", pa.binary()),
+    ]
+)
+
+
+def geo_metadata(footprints):
+    """GeoParquet 1.1 file metadata for the footprint column. CRS is omitted as footprints are in OGC:CRS84."""
+    if len(footprints) > 0:
+        bounds = shapely.total_bounds(footprints).tolist()
+        geometry_types = sorted(
+            GEOMETRY_TYPE_NAMES[shapely.GeometryType(t)]
+            for t in np.unique(shapely.get_type_id(footprints))
+        )
+    else:
+        bounds, geometry_types = [], []
+
+    return {
+        "version": "1.1.0",
+        "primary_column": "geometry",
+        "columns": {
+            "geometry": {
+                "encoding": "WKB",
+                "geometry_types": geometry_types,
+                "bbox": bounds,
+                "covering": {
+                    "bbox": {
+                        "xmin": ["bbox", "xmin"],
+                        "ymin": ["bbox", "ymin"],
+                        "xmax": ["bbox", "xmax"],
+                        "ymax": ["bbox", "ymax"],
+                    }
+                },
+            }
+        },
+    }
+
+
+def concat_tables(tables):
+    """
+    Concatenate catalog tables, dropping repeated tiles and refreshing the GeoParquet metadata.
+
+    A tile is considered repeated when its ``gdal_path`` and ``date`` were already seen in an
+    earlier table, so earlier tables take precedence.
+
+    Args:
+        tables (list[pyarrow.Table]): Catalog tables following ``CATALOG_SCHEMA``
+
+    Returns:
+        pyarrow.Table: The combined catalog table
+    """
+    table = pa.concat_tables(
+        [t.replace_schema_metadata(None).cast(CATALOG_SCHEMA) for t in tables]
+    )
+    keys = table.select(KEY_COLUMNS).to_pandas()
+    table = table.filter(pa.array(~keys.duplicated().to_numpy()))
+
+    footprints = shapely.from_wkb(table["geometry"].to_numpy(zero_copy_only=False))
+    return table.replace_schema_metadata({"geo": json.dumps(geo_metadata(footprints))})
+
+
+def write_catalog(table, path, state=None):
+    """
+    Atomically write a catalog table to a (Geo)Parquet file.
+
+    The table is written to a temporary file next to ``path`` and moved in place, so
+    readers never observe a partially written catalog.
+
+    Args:
+        table (pyarrow.Table): Catalog table, see ``TileTable.to_catalog_table``
+        path (str): Output path of the catalog
+        state (dict, optional): JSON serialisable discover state stored in the file metadata,
+            written together with the catalog so both are always consistent
+    """
+    if state is not None:
+        metadata = dict(table.schema.metadata or {})
+        metadata[STATE_KEY] = json.dumps(state)
+        table = table.replace_schema_metadata(metadata)
+
+    helpers.make_sure_dir_exists(path)
+    tmp_path = f"{path}.tmp"
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+
+
+def read_state(path):
+    """
+    Read the discover state stored alongside a catalog.
+
+    Args:
+        path (str): Path of the catalog file
+
+    Returns:
+        dict: The state passed to ``write_catalog``, or None if the catalog does not exist
+            or has no state
+    """
+    if not os.path.exists(path):
+        return None
+    metadata = pq.read_schema(path).metadata or {}
+    if STATE_KEY not in metadata:
+        return None
+    return json.loads(metadata[STATE_KEY])
+
+
+def has_multipart_footprints(path):
+    """
+    Check from the GeoParquet metadata whether any footprint of a catalog is not a single box.
+
+    Args:
+        path (str): Path of the catalog file
+
+    Returns:
+        bool: True if the catalog has multipart (e.g. antimeridian crossing) footprints
+    """
+    metadata = pq.read_schema(path).metadata or {}
+    geo = json.loads(metadata.get(b"geo", b"{}"))
+    geometry_types = (
+        geo.get("columns", {}).get("geometry", {}).get("geometry_types", [])
+    )
+    return any(t != "Polygon" for t in geometry_types)
+
+
+def read_catalog_table(path, columns=None, filters=None):
+    """
+    Read the catalog as a pyarrow Table.
+
+    Args:
+        path (str): Path of the catalog file
+        columns (list[str], optional): Only read these columns. Defaults to all columns
+        filters (list, optional): Row filters passed on to ``pyarrow.parquet.read_table``
+
+    Returns:
+        pyarrow.Table: The catalog table
+    """
+    return pq.read_table(path, columns=columns, filters=filters)
+
+
+def read_keys(path, ids=None):
+    """
+    Read the keys of catalog rows, see ``KEY_COLUMNS``.
+
+    Args:
+        path (str): Path of the catalog file
+        ids (array-like, optional): Row numbers to read the keys of. Defaults to all rows
+
+    Returns:
+        pd.DataFrame: gdal_path and date of the rows
+    """
+    table = read_catalog_table(path, columns=KEY_COLUMNS)
+    if ids is not None:
+        table = table.take(pa.array(np.asarray(ids, dtype=np.int64)))
+    return table.to_pandas()
+
+
+def get_row_ids(path, keys):
+    """
+    Row numbers of tiles in a catalog, from their keys.
+
+    Args:
+        path (str): Path of the catalog file
+        keys (pd.DataFrame): gdal_path and date of the tiles, see ``read_keys``
+
+    Returns:
+        numpy.ndarray: Sorted row numbers of the tiles still in the catalog
+    """
+    rows = read_keys(path)
+    rows["row_id"] = np.arange(len(rows), dtype=np.int64)
+    return np.sort(rows.merge(keys, on=KEY_COLUMNS)["row_id"].to_numpy())
+
+
+def read_catalog(path, columns=None, filters=None):
+    """
+    Read the catalog as a pandas DataFrame.
+
+    ``geo_transform`` is returned as numpy arrays and ``bands`` as sequences of band
+    dictionaries. Reading only the needed columns avoids materialising the nested band
+    column when it is not required.
+
+    Args:
+        path (str): Path of the catalog file
+        columns (list[str], optional): Only read these columns. Defaults to all columns
+        filters (list, optional): Row filters passed on to ``pyarrow.parquet.read_table``
+
+    Returns:
+        pd.DataFrame: The catalog
+    """
+    table = read_catalog_table(path, columns=columns, filters=filters)
+    df = table.to_pandas()
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"], utc=True)
+    for col in ["projection", "length_unit", "crs"]:
+        if col in df.columns:
+            df[col] = df[col].astype(object)
+    return df
+
+
+def export_csv(path, csv_path):
+    """
+    Export a catalog to the legacy CSV layout.
+
+    ``bands`` is JSON encoded and ``geo_transform`` stringified, matching the
+    ``catalog.csv`` files written by earlier versions.
+
+    Args:
+        path (str): Path of the catalog file
+        csv_path (str): Output CSV path
+    """
+    df = read_catalog(path)
+    df["bands"] = df["bands"].apply(lambda bands: json.dumps([dict(b) for b in bands]))
+    df["geo_transform"] = df["geo_transform"].apply(lambda gt: str(tuple(gt.tolist())))
+    df["geometry"] = shapely.to_wkt(shapely.from_wkb(df["geometry"].to_numpy()))
+    df = df.drop(columns=["bbox"])
+    df.to_csv(csv_path, header=True, index=False)
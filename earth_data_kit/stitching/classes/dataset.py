@@ -4,24 +4,37 @@ from earth_data_kit.stitching.formats.netcdf import NetCDFAdapter
 from earth_data_kit.stitching.formats.stac_asset import STACAssetAdapter
 import earth_data_kit.stitching.engines.commons as commons
 import pandas as pd
-import ast
 import geopandas as gpd
 import logging
 from earth_data_kit.xarray_boosted.commons import get_gdal_dtype
 from osgeo import osr
-import uuid
 import os
+import glob
+import copy
+import hashlib
 import earth_data_kit.utilities.helpers as helpers
 import earth_data_kit.utilities.transform as transform
 import earth_data_kit.utilities.geo as geo
 import earth_data_kit.stitching.constants as constants
+import earth_data_kit.stitching.catalog as catalog
+import earth_data_kit.stitching.vrt as vrt
+import earth_data_kit.stitching.gti as gti
+import earth_data_kit.stitching.warp as warp
+import earth_data_kit.stitching.clip as clip
+import earth_data_kit.stitching.mosaic as mosaic
+import earth_data_kit.stitching.pipeline as pipeline
+import earth_data_kit.stitching.executors as executors
+import earth_data_kit.xarray_boosted.regrid as regrid
+from earth_data_kit.stitching.index import CatalogIndex
 import earth_data_kit.stitching.decorators as decorators
 import earth_data_kit.stitching.engines.earth_engine as earth_engine
 import earth_data_kit.stitching.engines.s3 as s3
 import concurrent.futures
-from earth_data_kit.stitching.classes.tile import Tile
+import threading
+from earth_data_kit.stitching.classes.tile_table import TileTable
 import shapely
 import numpy as np
+import pyarrow as pa
 import fiona
 import json
 import xarray as xr
@@ -38,6 +51,23 @@ fiona.drvsupport.supported_drivers["KML"] = "rw"  # type: ignore
 
 logger = logging.getLogger(__name__)
 
+# Tile-band columns defining the content of a date's VRT, see Dataset.__get_date_hashes__
+MOSAIC_HASH_COLUMNS = [
+    "gdal_path",
+    "source_idx",
+    "description",
+    "dtype",
+    "nodataval",
+    "color_interp",
+    "projection",
+    "x_min",
+    "y_min",
+    "x_max",
+    "y_max",
+    "x_size",
+    "y_size",
+]
+
 
 class Dataset:
     """
@@ -100,8 +130,13 @@ class Dataset:
             )
 
         self.source = source
+        # Row ids of the catalog visible to this dataset, None means all rows. Set on views returned by query(),
+        # along with the keys of their tiles and the signature of the catalog the row ids were resolved in
+        self.tile_ids = None
+        self.tile_keys = None
+        self.tile_signature = None
 
-        self.catalog_path = f"{self.__get_ds_tmp_path__()}/catalog.csv"
+        self.catalog_path = f"{self.__get_ds_tmp_path__()}/catalog.parquet"
         if clean:
             helpers.delete_dir(f"{self.__get_ds_tmp_path__()}")
 
@@ -129,7 +164,9 @@ class Dataset:
         Args:
             start (datetime): Start date
             end (datetime): End date (inclusive)
-            resolution (str, optional): Temporal resolution (e.g., 'D' for daily, 'W' for weekly, 'M' for monthly)
+            resolution (str, optional): Temporal resolution (e.g., 'D' for daily, 'W' for weekly, 'MS' for monthly).
+                Images are combined per bin of the resolution, bins being anchored at start, or at 1970-01-01 UTC
+                for incremental discovers, see ``discover()``.
                 See pandas offset aliases for full list:
                 https://pandas.pydata.org/docs/user_guide/timeseries.html#timeseries-offset-aliases
 
@@ -155,8 +192,10 @@ class Dataset:
         in the source path.
 
         Args:
-            bbox (tuple[float, float, float, float]): A tuple of four coordinates in the order
+            bbox (tuple[float, float, float, float] | shapely.Geometry): A tuple of four coordinates in the order
                 (min_longitude, min_latitude, max_longitude, max_latitude)/(xmin, ymin, xmax, ymax) defining the spatial extent.
+                A shapely polygon or multipolygon in EPSG:4326 can also be supplied, in which case tiles are filtered
+                against the exact geometry and its bounds are used wherever a bounding box is required.
             grid_dataframe (geopandas.GeoDataFrame, optional): A GeoDataFrame containing grid cells with columns that match
                 the spatial variables in the source path (e.g., 'h', 'v' for MODIS grid). Each row should have a geometry
                 column defining the spatial extent of the grid cell.
@@ -174,15 +213,24 @@ class Dataset:
             >>> # Assume gdf has columns 'h', 'v' that match the spatial variables in the source path
             >>> # and a 'geometry' column with the spatial extent of each grid cell
             >>> ds.set_spacebounds((19.3044861183, 39.624997667, 21.0200403175, 42.6882473822), grid_dataframe=gdf)
+            >>>
+            >>> # Setting spatial bounds using a polygon:
+            >>> import shapely
+            >>> ds.set_spacebounds(shapely.Polygon([(19.3, 39.6), (21.0, 39.6), (20.1, 42.7)]))
         """
+        aoi = geo.to_aoi_geometry(bbox)
         self.space_opts = {
             "grid_dataframe": grid_dataframe,
         }
-        self.space_opts["bbox"] = bbox
+        # Engines and the final clip work on the bounding box, tile filtering uses the exact geometry
+        self.space_opts["bbox"] = (
+            tuple(aoi.bounds) if isinstance(bbox, shapely.Geometry) else bbox
+        )
+        self.space_opts["aoi"] = aoi
 
     @decorators.log_time
     @decorators.log_init
-    def discover(self, band_locator="description"):
+    def discover(self, band_locator="description", incremental=False):
         """
         Scans the dataset source to identify, catalog, and save the intersecting tiles based on
         provided time and spatial constraints.
@@ -190,6 +238,14 @@ class Dataset:
         Args:
             band_locator (str, optional): Specifies how to locate bands in the dataset.
                 Defaults to "description". Valid options are "description", "color_interp", "filename".
+            incremental (bool, optional): Reuse the catalog of a previous run instead of rediscovering
+                everything. Only time ranges not covered by the existing catalog are scanned, metadata
+                is fetched only for keys missing from it and tiles outside the current bounds are pruned.
+                Falls back to a full discover if the source, engine, format, band locator or temporal
+                resolution changed, or if the previous spatial bounds do not cover the current ones.
+                Requires the dataset to be created with ``clean=False``. With a temporal resolution, bins
+                are anchored at 1970-01-01 UTC rather than at start, so they do not move with the time
+                bounds, and a catalog discovered without ``incremental`` is discovered again. Defaults to False.
 
         Returns:
             None
@@ -216,21 +272,83 @@ class Dataset:
             >>> gdf['v'] = gdf['Name'].str.split(' ').str[1].str.split(':').str[1].astype(int).astype(str).str.zfill(2)
             >>> ds.set_spacebounds((19.30, 39.62, 21.02, 42.69), grid_dataframe=gdf)
             >>> ds.discover() # This will scan the dataset and save the catalog of intersecting tiles
+            >>> # Daily jobs over a rolling window only scan the newly added days
+            >>> ds = edk.stitching.Dataset("modis-pds", "s3://modis-pds/MCD43A4.006/{h}/{v}/%Y%j/*_B0?.TIF", "s3", "geotiff", clean=False)
+            >>> ds.set_timebounds(datetime.datetime(2017, 1, 2), datetime.datetime(2017, 1, 3))
+            >>> ds.set_spacebounds((19.30, 39.62, 21.02, 42.69), grid_dataframe=gdf)
+            >>> ds.discover(incremental=True)
         """
+        if self.tile_ids is not None:
+            raise Exception(
+                "discover() can not be run on a view returned by query(). Run it on the parent dataset instead."
+            )
+
+        fingerprint = self.__get_fingerprint__(band_locator, incremental)
+        previous = self.__get_incremental_state__(fingerprint) if incremental else None
+
+        if previous is None:
+            scan_windows = [self.time_opts]
+        else:
+            scan_windows = self.__get_missing_time_windows__(previous)
+            logger.info(
+                f"Incremental discover, scanning {len(scan_windows)} missing time window(s)"
+            )
+
         # Retrieve tile metadata using the engine's scan function
-        scan_df = self.engine.scan(
-            self.source,
-            self.time_opts,
-            self.space_opts,
-            self.__get_ds_tmp_path__(),
-            band_locator,
-        )
+        scan_dfs = []
+        for time_opts in scan_windows:
+            scan_dfs.append(
+                self.engine.scan(
+                    self.source,
+                    time_opts,
+                    self.space_opts,
+                    self.__get_ds_tmp_path__(),
+                    band_locator,
+                )
+            )
+        scan_df = pd.concat(scan_dfs, ignore_index=True) if scan_dfs else pd.DataFrame()
+
+        existing_table = None
+        if previous is not None:
+            existing_table = catalog.read_catalog_table(self.catalog_path)
+            # Only keys missing from the catalog need their metadata fetched
+            known_keys = existing_table["engine_path"].to_pandas()
+            if not scan_df.empty:
+                scan_df = scan_df[~scan_df["engine_path"].isin(known_keys)].reset_index(
+                    drop=True
+                )
+            existing_table = self.__prune_catalog__(existing_table)
 
         # Temporal aggregation
+        scan_df = self.__aggregate_scan__(scan_df, incremental)
+
+        # Create tiles
+        tiles = self.format.create_tiles(scan_df, band_locator) if not scan_df.empty else TileTable.empty()  # type: ignore
+
+        # Filter tiles by spatial intersection with the area of interest, some engines will handle this in the scan function
+        footprints = tiles.get_wgs84_footprints()
+        mask = geo.intersects_aoi(footprints, self.space_opts["aoi"])
+
+        tables = [] if existing_table is None else [existing_table]
+        if mask.any():
+            tables.append(tiles.filter(mask).to_catalog_table(footprints[mask]))
+
+        if sum(len(t) for t in tables) == 0:
+            raise Exception("No tiles found for the given time and spatial constraints")
+
+        self.__write_catalog__(tables, fingerprint)
+
+    def __aggregate_scan__(self, scan_df, incremental=False):
+        """
+        Set the date of scanned files to the start of their bin of the temporal resolution, if any.
+
+        Bins are anchored at start, or at ``commons.BIN_ORIGIN`` for incremental discovers.
+        """
         time_opts = self.time_opts
 
         if (
-            time_opts
+            not scan_df.empty
+            and time_opts
             and "resolution" in time_opts
             and time_opts["resolution"] is not None
         ):
@@ -243,45 +361,222 @@ class Dataset:
                 pd.to_datetime(time_opts["start"]),
                 pd.to_datetime(time_opts["end"]),
                 time_opts["resolution"],
+                origin=commons.BIN_ORIGIN if incremental else None,
             )
-        
-        # Create tiles
-        tiles = self.format.create_tiles(scan_df, band_locator) # type: ignore
+        return scan_df
+
+    def __write_catalog__(self, tables, fingerprint):
+        """Save catalog of intersecting tiles along with their footprints and the state needed for incremental runs."""
+        catalog.write_catalog(
+            catalog.concat_tables(tables),
+            self.catalog_path,
+            state={
+                "fingerprint": fingerprint,
+                "aoi": shapely.to_wkt(self.space_opts["aoi"]),
+                "start": self.__to_utc__(self.time_opts.get("start")),
+                "end": self.__to_utc__(self.time_opts.get("end")),
+            },
+        )
+        CatalogIndex.build(self.catalog_path)
 
-        # Filter tiles by spatial intersection with bounding box, some engines will handle this in the scan function
-        bbox = shapely.geometry.box(*self.space_opts["bbox"], ccw=True)  # type: ignore
+    def query(self, bbox=None, time=None):
+        """
+        Narrow an already discovered dataset down to a sub area and/or sub period.
 
-        with concurrent.futures.ProcessPoolExecutor(
-            max_workers=helpers.get_processpool_workers()
-        ) as executor:
-            futures = []
-            for tile in tiles:
-                futures.append(executor.submit(geo.tile_intersects, tile, bbox))
-
-            results = []
-            for future in tqdm(
-                futures,
-                total=len(futures),
-                desc="Checking tile intersections",
-            ):
-                results.append(future.result())
+        Uses the spatio-temporal index persisted next to the catalog, so no remote I/O
+        happens. The returned dataset is a view over the same catalog and can be mosaicked
+        like any other dataset, its outputs are written to a separate directory. The view keeps the
+        tiles it matched when the catalog is rewritten, eg: by an incremental discover of this dataset.
+
+        Args:
+            bbox (tuple[float, float, float, float] | shapely.Geometry, optional): Area of interest in
+                EPSG:4326, as a (xmin, ymin, xmax, ymax) tuple or a shapely geometry
+            time (tuple[datetime, datetime], optional): (start, end) of the period, both inclusive
 
-        intersecting_tiles = []
-        for idx in range(len(results)):
-            intersects = results[idx]
-            tile = tiles[idx]
-            if intersects:
-                intersecting_tiles.append(tile)
+        Returns:
+            Dataset: A view of this dataset restricted to the matching tiles
 
-        if len(intersecting_tiles) == 0:
-            raise Exception("No tiles found for the given time and spatial constraints")
+        Example:
+            >>> ds.discover()
+            >>> albania = ds.query(bbox=(19.30, 39.62, 21.02, 42.69), time=(datetime.datetime(2017, 1, 1), datetime.datetime(2017, 1, 1)))
+            >>> albania.mosaic(bands=["Nadir_Reflectance_Band1"])
+        """
+        aoi = geo.to_aoi_geometry(bbox) if bbox is not None else None
+        start, end = time if time is not None else (None, None)
+
+        ids = CatalogIndex.load(self.catalog_path).query(aoi, start, end)
+        if (
+            aoi is not None
+            and len(ids) > 0
+            and catalog.has_multipart_footprints(self.catalog_path)
+        ):
+            # The index is exact for box footprints, only tiles split at the antimeridian need refining
+            geometries = catalog.read_catalog_table(
+                self.catalog_path, columns=["geometry"]
+            )
+            footprints = shapely.from_wkb(
+                geometries["geometry"].take(ids).to_numpy(zero_copy_only=False)
+            )
+            ids = ids[geo.intersects_aoi(footprints, aoi)]
+        if self.tile_ids is not None:
+            ids = np.intersect1d(ids, self.__get_tile_ids__())
+
+        view = copy.copy(self)
+        view.tile_ids = ids
+        view.tile_keys = catalog.read_keys(self.catalog_path, ids)
+        view.tile_signature = CatalogIndex.get_signature(self.catalog_path)
+        view.name = (
+            f"{self.name}-{helpers.cheap_hash(json.dumps([str(bbox), str(time)]))}"
+        )
+        view.space_opts = dict(self.space_opts)
+        if aoi is not None:
+            view.space_opts["bbox"] = (
+                tuple(aoi.bounds) if isinstance(bbox, shapely.Geometry) else bbox
+            )
+            view.space_opts["aoi"] = aoi
+        if time is not None:
+            view.time_opts = {**self.time_opts, "start": start, "end": end}
+
+        logger.info(f"Query matched {len(ids)} tile(s)")
+        return view
+
+    def __get_fingerprint__(self, band_locator, incremental=False):
+        """
+        Fingerprint of everything that determines the content of a catalog apart from the
+        spatial and temporal bounds.
+        """
+        resolution = self.time_opts.get("resolution")
+        return helpers.cheap_hash(
+            json.dumps(
+                {
+                    "source": self.source,
+                    "engine": self.engine.name,
+                    "format": self.format.name,  # type: ignore
+                    "band_locator": band_locator,
+                    "resolution": resolution,
+                    # Bins of incremental discovers are anchored at a fixed origin, see __aggregate_scan__
+                    "bin_origin": (
+                        commons.BIN_ORIGIN.isoformat()
+                        if incremental and resolution is not None
+                        else None
+                    ),
+                },
+                sort_keys=True,
+            )
+        )
+
+    @staticmethod
+    def __to_utc__(ts):
+        """Convert a datetime like value to an ISO formatted UTC string, naive values are assumed to be UTC."""
+        if ts is None:
+            return None
+        ts = pd.Timestamp(ts)
+        ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+        return ts.isoformat()
 
-        # Converting bands column to string while saving to csv
-        df = pd.DataFrame([t.__dict__ for t in intersecting_tiles])
-        df["bands"] = df["bands"].apply(json.dumps)
+    def __get_incremental_state__(self, fingerprint):
+        """
+        Return the state of the existing catalog if it can be extended incrementally, else None.
 
-        # Save catalog of intersecting tiles
-        df.to_csv(self.catalog_path, header=True, index=False)
+        The existing catalog is reusable when it was discovered from the same source, engine,
+        format and band locator, and its area of interest covers the current one.
+        """
+        state = catalog.read_state(self.catalog_path)
+        if state is None:
+            logger.info("No existing catalog found, running a full discover")
+            return None
+        if state["fingerprint"] != fingerprint:
+            logger.info(
+                "Existing catalog was discovered with different options, running a full discover"
+            )
+            return None
+        if not shapely.from_wkt(state["aoi"]).covers(self.space_opts["aoi"]):
+            logger.info(
+                "Existing catalog does not cover the spatial bounds, running a full discover"
+            )
+            return None
+        return state
+
+    def __get_missing_time_windows__(self, state):
+        """
+        Time windows of the current time bounds that are not covered by the existing catalog.
+
+        Returns:
+            list[dict]: List of time_opts dictionaries to scan. Non temporal datasets always
+                return a single window so that new keys are picked up.
+        """
+        start = self.__to_utc__(self.time_opts.get("start"))
+        end = self.__to_utc__(self.time_opts.get("end"))
+        if (
+            start is None
+            or end is None
+            or state["start"] is None
+            or state["end"] is None
+        ):
+            return [self.time_opts]
+
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        covered_start, covered_end = pd.Timestamp(state["start"]), pd.Timestamp(
+            state["end"]
+        )
+        if end < covered_start or start > covered_end:
+            return [self.time_opts]
+
+        windows = []
+        if start < covered_start:
+            windows.append({**self.time_opts, "start": start, "end": covered_start})
+        if end > covered_end:
+            windows.append({**self.time_opts, "start": covered_end, "end": end})
+        return windows
+
+    def __prune_catalog__(self, table):
+        """
+        Drop tiles that fell out of the current time or spatial bounds from a catalog table.
+        """
+        footprints = shapely.from_wkb(table["geometry"].to_numpy(zero_copy_only=False))
+        keep = geo.intersects_aoi(footprints, self.space_opts["aoi"])
+
+        dates = table["date"].to_pandas()
+        if (
+            self.time_opts.get("start") is not None
+            and self.time_opts.get("end") is not None
+        ):
+            start = pd.Timestamp(self.__to_utc__(self.time_opts["start"]))
+            end = pd.Timestamp(self.__to_utc__(self.time_opts["end"]))
+            if self.time_opts.get("resolution") is not None:
+                # Dates were snapped to the start of their bin, the bin containing start is kept
+                start = commons.get_bin_start(
+                    start,
+                    pd.tseries.frequencies.to_offset(self.time_opts["resolution"]),
+                )
+            in_range = dates.isna() | ((dates >= start) & (dates <= end))
+            keep &= in_range.to_numpy()
+
+        logger.info(f"Pruning {int((~keep).sum())} tile(s) outside the current bounds")
+        return table.filter(pa.array(keep))
+
+    def export_catalog(self, path, format="csv"):
+        """
+        Export the catalog written by ``discover()``.
+
+        Args:
+            path (str): Output file path
+            format (str, optional): ``csv`` for the legacy CSV layout (JSON encoded bands and
+                stringified geotransform) or ``parquet`` for a copy of the GeoParquet catalog.
+                Defaults to ``csv``.
+
+        Example:
+            >>> ds.discover()
+            >>> ds.export_catalog("catalog.csv")
+        """
+        if format == "csv":
+            catalog.export_csv(self.catalog_path, path)
+        elif format == "parquet":
+            catalog.write_catalog(catalog.read_catalog_table(self.catalog_path), path)
+        else:
+            raise ValueError(
+                f"Unsupported catalog export format: {format}. Should be one of csv, parquet"
+            )
 
     def get_bands(self):
         """
@@ -301,7 +596,9 @@ class Dataset:
                           - x_res: X resolution
                           - y_res: Y resolution
                           - crs: Coordinate reference system
-                          - tiles: List of Tile objects that contain this band configuration
+                          - tile_ids: Ids (catalog row numbers) of the tiles that contain this band configuration
+                          - tiles: Deprecated, use tile_ids. Tiles that contain this band configuration,
+                            as views on the rows of the catalog
 
         Example:
             >>> import datetime
@@ -318,71 +615,74 @@ class Dataset:
             >>> ds.discover()
             >>> bands_df = ds.get_bands()
             >>> print(bands_df.head())
-               source_idx                description    dtype  x_res  y_res         crs                                              tiles
-            0           1  Nadir_Reflectance_Band1  uint16   30.0   30.0   EPSG:4326  [<earth_data_kit.stitching.classes.tile.Tile object...
-            1           1  Nadir_Reflectance_Band2  uint16   30.0   30.0   EPSG:4326  [<earth_data_kit.stitching.classes.tile.Tile object...
-            2           1  Nadir_Reflectance_Band3  uint16   30.0   30.0   EPSG:4326  [<earth_data_kit.stitching.classes.tile.Tile object...
+               source_idx                description    dtype  x_res  y_res         crs                  tile_ids                                              tiles
+            0           1  Nadir_Reflectance_Band1  uint16   30.0   30.0   EPSG:4326  [0, 7, 14, 21, 28, ...]  [TileView('/vsis3/modis-pds/MCD43A4.006/19/05/...
+            1           1  Nadir_Reflectance_Band2  uint16   30.0   30.0   EPSG:4326  [1, 8, 15, 22, 29, ...]  [TileView('/vsis3/modis-pds/MCD43A4.006/19/05/...
+            2           1  Nadir_Reflectance_Band3  uint16   30.0   30.0   EPSG:4326  [2, 9, 16, 23, 30, ...]  [TileView('/vsis3/modis-pds/MCD43A4.006/19/05/...
 
         Notes:
             The 'source_idx' column typically represents the band index within the source files.
             In some cases, this value will be 1 for all bands, especially when each band
             is stored in a separate file.
+
+            The 'tiles' column is deprecated and will be removed in a future release, use
+            'tile_ids' instead.
         """
-        tile_bands = self.__get_tile_bands__()
-        df = pd.DataFrame(tile_bands)
-        df["x_res"] = df.apply(lambda row: row.tile.get_res()[0], axis=1)
-        df["y_res"] = df.apply(lambda row: row.tile.get_res()[1], axis=1)
-        df["crs"] = df.apply(lambda row: row.tile.crs, axis=1)
+        tiles = self.__get_tiles__()
+        df = tiles.band_table()
+        # Position of each tile in the table, to build the deprecated 'tiles' column
+        df["tile_pos"] = np.repeat(np.arange(len(tiles)), np.diff(tiles.band_offsets))
         # Group the bands by columns: source_idx, description, dtype, x_res, y_res, and crs.
         by = ["source_idx", "description", "dtype", "x_res", "y_res", "crs"]
         df["x_res"] = df["x_res"].astype(np.float32)
         df["y_res"] = df["y_res"].astype(np.float32)
 
-        # Group by the specified columns and collect tiles in each group
-        grouped = df.groupby(by=by)
-        # Create a new dataframe with the grouped columns and a new 'tiles' column
-        result = grouped.agg({"tile": lambda x: list(x)}).reset_index()
-        # Rename the aggregated column to 'tiles'
-        result = result.rename(columns={"tile": "tiles"})
+        # Group by the specified columns and collect the ids of the tiles in each group
+        result = (
+            df.groupby(by=by)
+            .agg(tile_ids=("tile_id", list), tiles=("tile_pos", list))
+            .reset_index()
+        )
+        # Deprecated: tiles as views on the table, cheap to create, only the ids are needed internally
+        result["tiles"] = result["tiles"].apply(
+            lambda positions: [tiles[p] for p in positions]
+        )
         return result
 
-    def __get_tile_bands__(self):
+    def __get_tiles__(self):
         """
-        Collect band metadata from all tiles.
+        Load tiles from the catalog.
 
-        Iterates over each tile (from __get_tiles__) and builds a list of band dictionaries,
-        each enhanced with its corresponding tile information.
+        Reads the typed columns of the catalog into a TileTable, restricted to the tiles
+        visible to this dataset.
 
         Returns:
-            list: List of band dictionaries.
+            TileTable: The tiles, ids being their row numbers in the catalog.
         """
-        tiles = self.__get_tiles__()
-
-        tile_bands = []
-        for tile in tiles:
-            for i in range(len(tile.bands)):
-                band = tile.bands[i]
-                band["tile"] = tile
-                tile_bands.append(band)
-
-        return tile_bands
+        table = catalog.read_catalog_table(
+            self.catalog_path,
+            columns=[
+                c for c in catalog.CATALOG_SCHEMA.names if c not in ("bbox", "geometry")
+            ],
+        )
+        tiles = TileTable.from_catalog_table(table)
+        if self.tile_ids is not None:
+            tiles = tiles.take(self.__get_tile_ids__())
+        return tiles
 
-    def __get_tiles__(self):
+    def __get_tile_ids__(self):
         """
-        Load tiles from the catalog CSV.
-
-        Reads the catalog file, converts necessary fields, and creates Tile objects.
+        Row ids of the tiles of a view in the current catalog.
 
-        Returns:
-            list: List of Tile objects.
+        Views keep the keys of their tiles, see ``catalog.KEY_COLUMNS``, so their row ids are resolved
+        again when the catalog was rewritten since, eg: by an incremental discover of the parent dataset.
+        Tiles no longer in the catalog are dropped from the view.
         """
-        df = pd.read_csv(self.catalog_path)
-        df["bands"] = df["bands"].apply(json.loads)
-        df["geo_transform"] = df["geo_transform"].apply(ast.literal_eval)
-        df["date"] = pd.to_datetime(df["date"], format="ISO8601")
-
-        tiles = Tile.from_df(df)
-        return tiles
+        signature = CatalogIndex.get_signature(self.catalog_path)
+        if not np.array_equal(signature, self.tile_signature):
+            self.tile_ids = catalog.get_row_ids(self.catalog_path, self.tile_keys)
+            self.tile_signature = signature
+        return self.tile_ids
 
     def __get_ds_tmp_path__(self):
         """
@@ -431,173 +731,9 @@ class Dataset:
         else:
             return gdal_path
 
-    def __validate_band_properties__(self, tiles_df, resolution, dtype, crs):
-        """
-        Validates that all tiles in a band have consistent data types, crs, and resolutions.
-        Ensures tiles can be properly mosaicked together.
-
-        Args:
-            tiles_df (pd.DataFrame): DataFrame with tile info (dtype, tile objects with projection/resolution)
-
-        Raises:
-            ValueError: If tiles have mismatched data types, crs, or resolutions
-        """
-        # Get unique values for each property
-        unique_dtypes = tiles_df["dtype"].unique()
-        unique_crs = tiles_df["tile"].apply(lambda x: x.crs).unique()
-        unique_resolutions = tiles_df["tile"].apply(lambda x: x.get_res()).unique()
-
-        # Check data type consistency
-        if len(unique_dtypes) > 1 and dtype is None:
-            raise ValueError(
-                f"Band tiles have inconsistent data types. Found: {', '.join(map(str, unique_dtypes))}. "
-                "Please pass the desired data type using the 'dtype' parameter in mosaic() function."
-            )
-
-        # Check CRS consistency
-        if len(unique_crs) > 1 and crs is None:
-            raise ValueError(
-                f"Band tiles have inconsistent coordinate reference systems (CRS). Found: {', '.join(map(str, unique_crs))}. "
-                "Please pass the desired CRS using the 'crs' parameter in mosaic() function."
-            )
-
-        # Check resolution consistency
-        if len(unique_resolutions) > 1 and resolution is None:
-            raise ValueError(
-                f"Band tiles have inconsistent resolutions. Found: {', '.join(map(str, unique_resolutions))}. "
-                "Please pass the desired resolution using the 'resolution' parameter in mosaic() function."
-            )
-
-    @decorators.log_time
-    @decorators.log_init
-    def __create_band_mosaic__(self, band_tiles, date, bands, resolution, dtype, crs):
-        """
-        Create mosaic VRT files for the specified bands.
-
-        For each band, filters the relevant tiles, validates their properties, and creates a mosaic VRT
-        using gdalbuildvrt. Handles both Earth Engine and standard GDAL data sources differently.
-
-        Args:
-            band_tiles (pd.DataFrame): DataFrame containing tile information including band descriptions
-                                      and GDAL paths for each tile.
-            date (datetime): Date associated with the mosaics, used in output filenames.
-            bands (list): List of band descriptions to assemble into mosaics.
-
-        Returns:
-            list: Paths to the created band mosaic VRT files.
-
-        Note:
-            For Earth Engine data sources, band paths are optimized and band index is set to 1.
-            For standard GDAL sources, band index is taken from the source_idx column.
-        """
-        date_str = date.strftime("%Y-%m-%d-%H:%M:%S")
-        band_mosaics = []
-        # Track only bands that were actually found to avoid "Illegal band #" error when setting descriptions on VRT
-        # If some requested bands are missing for this date, the VRT will have fewer bands than requested, causing a mismatch
-        bands_found_per_date = []
-
-        for band_desc in bands:
-            # Filter tiles for current band
-            current_bands_df = band_tiles[band_tiles["description"] == band_desc]
-            current_bands_df = current_bands_df.assign(
-                gdal_path=current_bands_df["tile"].apply(lambda x: x.gdal_path)
-            )
-
-            # If no tiles are present for this band on the given date, skip it
-            if current_bands_df.empty:
-                logger.warning(
-                    f"No tiles found for band '{band_desc}' on date {date}. Skipping this band."
-                )
-                continue
-            # Set up output path and validate band properties
-            band_mosaic_path = f"{self.__get_ds_tmp_path__()}/pre-processing/{date_str}-{band_desc}.vrt"
-            self.__validate_band_properties__(current_bands_df, resolution, dtype, crs)
-
-            if (resolution is None and crs is not None) or (
-                resolution is not None and crs is None
-            ):
-                raise ValueError(
-                    "Both 'resolution' and 'crs' parameters must be provided together, or neither should be provided. "
-                    "Found only one of them."
-                )
-
-            gdal_paths = []
-            if resolution is not None or crs is not None:
-                for row in current_bands_df.itertuples():
-                    # Adding uuid to avoid conflicts
-                    warped_vrt_path = f"{self.__get_ds_tmp_path__()}/pre-processing/{row.gdal_path.split('/')[-1].split('.')[0]}-{uuid.uuid4()}-warped.vrt"
-                    options = gdal.WarpOptions(
-                        format="VRT",
-                        xRes=resolution[0],
-                        yRes=resolution[1],
-                        dstSRS=crs,
-                    )
-
-                    gdal.Warp(
-                        warped_vrt_path,
-                        row.gdal_path,
-                        options=options,
-                    )
-                    gdal_paths.append(warped_vrt_path)
-            else:
-                gdal_paths = current_bands_df["gdal_path"].tolist()
-
-            # Create and save the VRT mosaic
-            ds = gdal.BuildVRT(
-                destName=band_mosaic_path,
-                srcDSOrSrcDSTab=gdal_paths,
-                separate=False,
-                bandList=[current_bands_df.iloc[0]["source_idx"]],
-            )
-
-            ds.Close()
-
-            band_mosaics.append(band_mosaic_path)
-            bands_found_per_date.append(band_desc)  # Record successful band processing
-
-        return band_mosaics, bands_found_per_date
-
-    @decorators.log_time
-    @decorators.log_init
-    def __stack_band_mosaics__(self, band_mosaics, date):
-        """
-        Stack individual band mosaic VRTs into a multi-band VRT and clip to spatial bounds.
-
-        Combines the mosaic VRTs using gdalbuildvrt with the -separate option, then clips
-        the result to the dataset's spatial bounds using gdal.Translate.
-
-        Args:
-            band_mosaics (list): List of band mosaic VRT paths to combine.
-            date (datetime): Date used for naming the combined VRT.
-
-        Returns:
-            str: Path to the stacked and clipped multi-band VRT.
-        """
-        date_str = date.strftime("%Y-%m-%d-%H:%M:%S")
-        output_vrt = f"{self.__get_ds_tmp_path__()}/pre-processing/{date_str}.vrt"
-        tmp_vrt = f"{self.__get_ds_tmp_path__()}/pre-processing/{date_str}.tmp.vrt"
-
-        # Stack band mosaics into a temporary multi-band VRT
-        ds = gdal.BuildVRT(
-            destName=tmp_vrt, srcDSOrSrcDSTab=band_mosaics, separate=True
-        )
-        ds.Close()
-
-        # Extract spatial bounds and clip the stacked VRT
-        xmin, ymin, xmax, ymax = self.space_opts["bbox"] # type: ignore
-        gdal.Translate(
-            output_vrt,
-            tmp_vrt,
-            projWin=[xmin, ymax, xmax, ymin],
-            projWinSRS="EPSG:4326",
-        )
-
-
-        return output_vrt
-
     @decorators.log_time
     @decorators.log_init
-    def __combine_timestamped_vrts__(self, output_vrts):
+    def __combine_timestamped_vrts__(self, output_vrts, output_bands=None):
         """
         Combine multiple timestamped VRT files into a single JSON file.
 
@@ -611,6 +747,9 @@ class Dataset:
         Args:
             output_vrts (list): List of VRT file paths to combine. Each path should contain
                                 a timestamp in the format YYYY-MM-DD-HH:MM:SS in its filename.
+            output_bands (list, optional): For every VRT, the list of its bands as dictionaries with
+                                description and color_interp keys. Stored with the VRT so band
+                                metadata does not depend on the raster format.
 
         Returns:
             str: Path to the created JSON file, or None if output_vrts is empty.
@@ -621,19 +760,21 @@ class Dataset:
                 "name": "dataset_name",
                 "source": "source_identifier",
                 "engine": "engine_name",
-                "catalog": "path/to/catalog.csv",
+                "catalog": "path/to/catalog.parquet",
                 "bbox": [xmin, ymin, xmax, ymax],
                 "timebounds": ["start_date", "end_date"],
                 "VRTDatasets": [
                   {
                     "source": "/path/to/2017-01-01-00:00:00.vrt",
                     "time": "2017-01-01-00:00:00",
-                    "has_time_dim": true
+                    "has_time_dim": true,
+                    "bands": [{"description": "red", "color_interp": "Red"}]
                   },
                   {
                     "source": "/path/to/2017-01-02-00:00:00.vrt",
                     "time": "2017-01-02-00:00:00",
-                    "has_time_dim": true
+                    "has_time_dim": true,
+                    "bands": [{"description": "red", "color_interp": "Red"}]
                   }
                 ]
               }
@@ -652,12 +793,12 @@ class Dataset:
                 "bbox": self.space_opts.get("bbox"),
                 "timebounds": [
                     (
-                        self.time_opts.get("start").strftime("%Y-%m-%d-%H:%M:%S") # type: ignore
+                        self.time_opts.get("start").strftime("%Y-%m-%d-%H:%M:%S")  # type: ignore
                         if self.time_opts.get("start")
                         else None
                     ),
                     (
-                        self.time_opts.get("end").strftime("%Y-%m-%d-%H:%M:%S") # type: ignore
+                        self.time_opts.get("end").strftime("%Y-%m-%d-%H:%M:%S")  # type: ignore
                         if self.time_opts.get("end")
                         else None
                     ),
@@ -667,13 +808,15 @@ class Dataset:
         }
 
         # Add VRTDataset entries for each VRT file
-        for vrt in output_vrts:
-            date_str = vrt.split("/")[-1].split(".")[0]
+        for idx, vrt_path in enumerate(output_vrts):
+            date_str = vrt_path.split("/")[-1].split(".")[0]
             vrt_dataset = {
-                "source": vrt,
+                "source": vrt_path,
                 "time": date_str,
                 "has_time_dim": date_str != "1970-01-01-00:00:00",
             }
+            if output_bands is not None:
+                vrt_dataset["bands"] = output_bands[idx]
             dataset_dict["EDKDataset"]["VRTDatasets"].append(vrt_dataset)
 
         # Create JSON file path
@@ -685,68 +828,232 @@ class Dataset:
 
         return json_path
 
-    @decorators.log_time
-    @decorators.log_init
-    def __create_timestamped_vrt__(
-        self, date, band_tiles, bands, resolution, dtype, crs
-    ):
+    def __get_date_hashes__(self, df, params):
         """
-        Create a timestamped VRT file for a specific date from band tiles.
+        Content hash of the inputs of every date's VRT.
 
-        This method processes band tiles for a given date to create a multi-band VRT file.
-        The process involves several steps:
-        1. Extract each band as a single-band VRT
-        2. Create mosaic VRTs for each band
-        3. Stack these mosaics into a multi-band VRT
-        4. Set appropriate band descriptions
+        A date's hash covers its tile-band rows, in order as later tiles are drawn on top, and the
+        mosaic parameters, so it changes whenever the VRT of the date would be built differently.
 
         Args:
-            date (tuple): A tuple containing the datetime object for which to create the VRT.
-                         First element is the datetime object.
-            band_tiles (DataFrame): DataFrame containing band tile information.
-            bands (list): List of band descriptions to include in the VRT.
+            df (pd.DataFrame): Tile-band rows of all dates, as passed to the date tasks.
+            params (dict): Mosaic parameters shared by all dates (bands, resolution, dtype, crs, ...).
 
         Returns:
-            str: Path to the created VRT file.
+            dict: Hash of every date, keyed by the date formatted as in the VRT file names.
+        """
+        params_bytes = json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+        row_hashes = pd.util.hash_pandas_object(
+            df[MOSAIC_HASH_COLUMNS], index=False
+        ).to_numpy()
+
+        hashes = {}
+        for date, idx in df.groupby("date").indices.items():
+            h = hashlib.md5(params_bytes)
+            h.update(row_hashes[idx].tobytes())
+            hashes[date.strftime("%Y-%m-%d-%H:%M:%S")] = h.hexdigest()
+        return hashes
+
+    def __get_changed_dates__(self, date_hashes, manifest):
         """
-        curr_date = date[0]
-        _band_tiles = band_tiles.copy(deep=True).reset_index(drop=True)
+        Compare the hashes of the current inputs with the manifest of the previous mosaic.
 
-        # Create mosaic VRTs for each band by combining single-band VRTs.
-        # Note: GDAL Raster Tile Index (GTI) was considered but not used due to metadata
-        # preservation limitations (e.g., ColorInterp). VRT format provides better metadata support.
-        band_mosaics, bands_found_per_date = self.__create_band_mosaic__(
-            _band_tiles, curr_date, bands, resolution, dtype, crs
-        )
+        Args:
+            date_hashes (dict): Hash of every date, as returned by ``__get_date_hashes__``.
+            manifest (dict): Manifest of the previous mosaic, as returned by ``__read_mosaic_manifest__``.
+
+        Returns:
+            tuple: The dates of the manifest no longer in the catalog, as a list, and the dates to rebuild, whose
+                inputs changed or whose VRT is missing, as a set.
+        """
+        stale_dates = [d for d in manifest if d not in date_hashes]
+        changed_dates = {
+            d
+            for d, h in date_hashes.items()
+            if d not in manifest
+            or manifest[d].get("hash") != h
+            or not os.path.exists(manifest[d].get("source", ""))
+        }
+        return stale_dates, changed_dates
+
+    def __select_bands__(self, df, bands):
+        """Keep the tile-band rows of the requested bands, dating non temporal tiles to the epoch."""
+        # Filter bands based on the user-supplied list.
+        # TODO: May need special handling for non-unique band descriptions in the future
+        df = df[df["description"].isin(bands)].reset_index(drop=True)
+
+        # Handle non-temporal datasets by filling missing dates with Jan 1, 1970
+        epoch_date = pd.Timestamp(datetime(1970, 1, 1, 0, 0, 0), tz="UTC")
+        df["date"] = df["date"].fillna(epoch_date)  # type: ignore
+        return df
+
+    def __get_mosaic_params__(
+        self,
+        bands,
+        resolution,
+        dtype,
+        crs,
+        backend,
+        resampling_method,
+        materialize,
+        grid,
+    ):
+        """Mosaic parameters shared by all dates, hashed with the tiles of every date."""
+        return {
+            "bands": bands,
+            "resolution": resolution,
+            "dtype": dtype,
+            "crs": crs,
+            "backend": backend,
+            "bbox": self.space_opts.get("bbox"),
+            "resampling_method": resampling_method,
+            "materialize": materialize,
+            "grid": grid.to_dict() if grid is not None else None,
+        }
+
+    def __get_output_grid__(self, resolution, crs, grid):
+        """Validate the output grid parameters of a mosaic, returns the (resolution, crs) to warp to, if any."""
+        if (resolution is None) != (crs is None):
+            raise ValueError(
+                "Both 'resolution' and 'crs' parameters must be provided together, or neither should be provided. "
+                "Found only one of them."
+            )
+        if grid is not None:
+            if resolution is not None:
+                raise ValueError(
+                    "Pass either 'grid' or 'resolution' and 'crs', not both."
+                )
+            crs, resolution = grid.crs, grid.get_resolution()
+        return resolution, crs
 
-        # Create multi-band VRT by stacking individual band mosaics
-        output_vrt = self.__stack_band_mosaics__(band_mosaics, curr_date)
+    def __get_output_bands__(self, df, bands):
+        """
+        Bands of every date's VRT, in output order.
 
-        # Apply band descriptions only for bands that were actually mosaicked
-        geo.set_band_descriptions(output_vrt, bands_found_per_date)
+        Args:
+            df (pd.DataFrame): Tile-band rows of the requested bands.
+            bands (list[str]): Ordered list of requested band descriptions.
 
-        return output_vrt
+        Returns:
+            dict: List of {description, color_interp} of every date, keyed by the date formatted as in
+                the VRT file names, in chronological order.
+        """
+        color_interps = (
+            df.groupby("description")["color_interp"].first().dropna().to_dict()
+        )
+        date_strs = df["date"].dt.strftime("%Y-%m-%d-%H:%M:%S")
+        # Formatted dates sort chronologically
+        bands_by_date = df.groupby(date_strs, sort=True)["description"].agg(set)
+        # Bands missing on a date are skipped by the VRT builders, in the same order
+        return {
+            date_str: [
+                {"description": b, "color_interp": color_interps.get(b)}
+                for b in bands
+                if b in present
+            ]
+            for date_str, present in bands_by_date.items()
+        }
+
+    def __get_mosaic_manifest_path__(self):
+        return f"{self.__get_ds_tmp_path__()}/pre-processing/manifest.json"
+
+    def __read_mosaic_manifest__(self):
+        """
+        Read the manifest of the previous mosaic, mapping every date to the hash of its inputs
+        and the path of its VRT. Returns an empty manifest if there is none.
+        """
+        path = self.__get_mosaic_manifest_path__()
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            logger.warning(
+                f"Could not read mosaic manifest {path}, rebuilding all dates"
+            )
+            return {}
+
+    def __write_mosaic_manifest__(self, manifest):
+        path = self.__get_mosaic_manifest_path__()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def __remove_date_outputs__(self, date_str):
+        """Remove the VRT of a date and its intermediate band files."""
+        for path in glob.glob(
+            f"{glob.escape(self.__get_ds_tmp_path__())}/pre-processing/{glob.escape(date_str)}[.-]*"
+        ):
+            os.remove(path)
+
+    def __sync_tiles__(self, df, sync, overwrite):
+        """Download the tiles of a tile-band table, whole or only their window covering the bounding box."""
+        if sync == "clip":
+            return clip.clip_tiles(
+                df,
+                f"{self.__get_ds_tmp_path__()}/clipped",
+                self.space_opts["bbox"],
+                overwrite=overwrite,
+            )
+        return self.engine.sync(df, self.__get_ds_tmp_path__(), overwrite=overwrite)
 
     @decorators.log_time
     @decorators.log_init
     def mosaic(
-        self, bands, sync=False, overwrite=False, resolution=None, dtype=None, crs=None
+        self,
+        bands,
+        sync=False,
+        overwrite=False,
+        resolution=None,
+        dtype=None,
+        crs=None,
+        backend="gdal",
+        resampling_method="nearest",
+        materialize=False,
+        grid=None,
     ):
         """
         Identifies and extracts the required bands from the tile metadata for each unique date. For each band,
         it creates a single-band VRT that is then mosaiced together. These individual band mosaics are finally
         stacked into a multi-band VRT according to the ordered band arrangement provided.
 
+        Mosaics are incremental: the inputs of every date are hashed and recorded in a manifest, so a re-run only
+        rebuilds the dates whose tiles or mosaic parameters changed, keeps the VRTs of the others and drops the
+        dates no longer in the catalog. Appending a day to a long time series only builds that day's VRT.
+
         Args:
             bands (list[string]): Ordered list of band descriptions to output as VRTs.
-            sync (bool, optional): Whether to sync the remote data sources before processing. Default False.
-            overwrite (bool, optional): Whether to overwrite existing synced files. Default False.
+            sync (bool | str, optional): Whether to sync the remote data sources before processing. ``clip`` only
+                downloads the window of every tile covering the bounding box, plus a margin, as a local tiled COG,
+                reading remote COGs with ranged requests. Meant for small areas of interest over large scenes,
+                requires north-up tiles. Default False.
+            overwrite (bool, optional): With ``sync=True``, download again the synced files whose current
+                version can not be checked, files that changed, are missing or were partially synced being
+                downloaded again anyway. With ``sync="clip"``, clip the tiles again. Default False.
             resolution (float, optional): Desired output resolution in meters. If provided, reprojects all data to
                 this resolution. If not provided, the output resolution is determined by the input data.
             dtype (str, optional): Desired output data type. If provided, casts all data to this dtype. If not provided,
                 the output dtype is determined by the input data.
             crs (str, optional): Desired output CRS. If provided, reprojects all data to this CRS. If not provided,
                 the output CRS is determined by the input data.
+            backend (str, optional): How the VRTs are built. ``gdal`` uses ``gdal.BuildVRT`` and ``gdal.Translate``,
+                which open every source. ``xml`` writes the stacked and clipped VRT directly from the catalog
+                metadata, computing source windows analytically, so no source is opened. The ``xml`` backend
+                requires north-up tiles, unless ``resolution`` and ``crs`` are provided. ``gti`` works like ``xml``
+                but every band is a GDAL Raster Tile Index (GTI) dataset over a GeoPackage tile index, so readers only
+                open the sources intersecting a read window, found through a spatial index. Meant for mosaics of tens
+                of thousands of tiles per date and requires GDAL >= 3.9 to read. Defaults to ``gdal``.
+            resampling_method (str, optional): GDAL resampling algorithm used when ``resolution`` and ``crs`` are
+                provided. Tiles are warped once in parallel, whatever the number of bands and dates using them, and
+                warped tiles are kept across runs, keyed by source, source version, crs, resolution and resampling method.
+                Defaults to ``nearest``.
+            materialize (bool, optional): When resampling, write warped tiles as local tiled COGs with multithreaded
+                warping instead of warped VRTs, so reading the mosaic does not reproject on the fly. Default False.
+            grid (TargetGrid, optional): Explicit output grid, replacing ``resolution`` and ``crs``. Tiles are warped
+                onto the grid pixels and every VRT covers exactly the grid extent, so datasets mosaicked on the same grid
+                have identical x and y coordinates and ``combine()`` stacks them without interpolating. Default None.
 
         Example:
             >>> import datetime
@@ -757,9 +1064,25 @@ class Dataset:
             >>> bands = ["red", "green", "blue"]
             >>> ds.mosaic(bands, sync=True, overwrite=True, resolution=(10, -10), dtype="float32", crs="EPSG:4326")
             >>> ds.save()  # Save the output VRTs to a JSON file
+            >>> # Large mosaics can be built without opening any source
+            >>> ds.mosaic(bands, backend="xml")
+            >>> # Co-registered with other datasets mosaicked on the same grid
+            >>> grid = edk.stitching.TargetGrid.from_bbox(bbox, "EPSG:4326", (0.0006, -0.0006))
+            >>> ds.mosaic(bands, sync=True, grid=grid)
         """
-        helpers.delete_dir(f"{self.__get_ds_tmp_path__()}/pre-processing")
-        # Ensuring the pre-processing directory exists
+        if backend not in ("gdal", "xml", "gti"):
+            raise ValueError(
+                f"Unsupported mosaic backend: {backend}. Should be one of gdal, xml, gti"
+            )
+        if sync not in (True, False, "clip"):
+            raise ValueError(
+                f"Unsupported sync mode: {sync}. Should be one of True, False, clip"
+            )
+        resolution, crs = self.__get_output_grid__(resolution, crs, grid)
+        warping = resolution is not None
+
+        # Ensuring the pre-processing directory exists. Its VRTs are kept across runs and only the
+        # dates whose inputs changed are rebuilt, see __get_date_hashes__
         helpers.make_sure_dir_exists(f"{self.__get_ds_tmp_path__()}/pre-processing")
 
         if not sync and (resolution is not None or crs is not None):
@@ -769,50 +1092,341 @@ class Dataset:
                 "Please set sync=True to download the data locally when mosaicing."
             )
         # Retrieve all bands from tiles.
-        tile_bands = self.__get_tile_bands__()
-        df = pd.DataFrame(tile_bands)
-        df["date"] = df.apply(lambda x: x.tile.date, axis=1)
-
-
-
-        # Filter bands based on the user-supplied list.
-        # TODO: May need special handling for non-unique band descriptions in the future
-        df = df[df["description"].isin(bands)]
+        tiles = self.__get_tiles__()
+        # Warped tiles are north-up whatever the source
+        if (
+            backend != "gdal"
+            and not warping
+            and np.any(tiles.geo_transform[:, [2, 4]] != 0)
+        ):
+            raise ValueError(
+                f"The {backend} backend requires north-up tiles, use backend='gdal' for rotated tiles"
+            )
+        if sync == "clip" and np.any(tiles.geo_transform[:, [2, 4]] != 0):
+            raise ValueError(
+                "sync='clip' requires north-up tiles, use sync=True for rotated tiles"
+            )
+        df = tiles.band_table()
 
-        # Handle non-temporal datasets by filling missing dates with Jan 1, 1970
-        epoch_date = datetime(1970, 1, 1, 0, 0, 0)
-        df["date"] = df["date"].fillna(epoch_date) # type: ignore
+        df = self.__select_bands__(df, bands)
 
         if sync:
-            df = self.engine.sync(df, self.__get_ds_tmp_path__(), overwrite=overwrite)
+            df = self.__sync_tiles__(df, sync, overwrite)
+
+        if warping:
+            # Kept outside pre-processing, so warped tiles are reused by later runs
+            df = warp.warp_tiles(
+                df,
+                f"{self.__get_ds_tmp_path__()}/warped",
+                crs,
+                resolution,
+                resampling=resampling_method,
+                materialize=materialize,
+                grid=grid,
+            )
 
-        outputs_by_dates = df.groupby(by=["date"], dropna=False)
-        output_vrts = []
+        # Dates whose inputs did not change since the previous mosaic keep their VRT
+        date_hashes = self.__get_date_hashes__(
+            df,
+            self.__get_mosaic_params__(
+                bands,
+                resolution,
+                dtype,
+                crs,
+                backend,
+                resampling_method,
+                materialize,
+                grid,
+            ),
+        )
+        manifest = self.__read_mosaic_manifest__()
+        stale_dates, changed_dates = self.__get_changed_dates__(date_hashes, manifest)
+        for date_str in stale_dates + sorted(changed_dates):
+            self.__remove_date_outputs__(date_str)
+            manifest.pop(date_str, None)
+        # Written before building, so an interrupted run does not record dates it did not finish
+        self.__write_mosaic_manifest__(manifest)
+        logger.info(
+            f"Rebuilding {len(changed_dates)} of {len(date_hashes)} dates, removed {len(stale_dates)} stale dates"
+        )
+
+        tile_index = None
+        if backend == "gti":
+            # A single index for all dates, written before the date tasks which only read it.
+            # Layer names only depend on the projection, so unchanged dates stay valid when it is rewritten
+            index_path = f"{self.__get_ds_tmp_path__()}/pre-processing/tile_index.gpkg"
+            df["date_str"] = df["date"].dt.strftime("%Y-%m-%d-%H:%M:%S")
+            if changed_dates or stale_dates or not os.path.exists(index_path):
+                tile_index = (index_path, gti.write_tile_index(index_path, df))
+            else:
+                tile_index = (
+                    index_path,
+                    {p: gti.get_layer_name(p) for p in df["projection"].unique()},
+                )
 
-        with concurrent.futures.ProcessPoolExecutor(
-            max_workers=helpers.get_processpool_workers()
-        ) as executor:
+        date_strs = df["date"].dt.strftime("%Y-%m-%d-%H:%M:%S")
+        output_bands = self.__get_output_bands__(df, bands)
+
+        # Tasks carry a spec of plain values and the slim rows of a batch of dates, not the dataset
+        spec = mosaic.create_mosaic_spec(
+            f"{self.__get_ds_tmp_path__()}/pre-processing",
+            self.space_opts["bbox"],
+            bands,
+            resolution,
+            dtype,
+            crs,
+            backend,
+            tile_index,
+            grid,
+        )
+        changed = date_strs.isin(changed_dates).to_numpy()
+        task_tiles = mosaic.get_task_tiles(df[changed])
+        rows_by_date = task_tiles.groupby(date_strs[changed], sort=True).indices
+        n_workers = executors.get_workers("process")
+        batch_size = mosaic.get_batch_size(len(rows_by_date), n_workers)
+        batch_dates = list(rows_by_date)
+
+        with executors.get_executor("process") as executor:
             futures = []
-            # Iterate over each date group to create VRTs.
-            for date, band_tiles in outputs_by_dates:
+            for i in range(0, len(batch_dates), batch_size):
+                rows = np.concatenate(
+                    [rows_by_date[d] for d in batch_dates[i : i + batch_size]]
+                )
                 futures.append(
                     executor.submit(
-                        self.__create_timestamped_vrt__,
-                        date,
-                        band_tiles,
-                        bands,
-                        resolution,
-                        dtype,
-                        crs,
+                        mosaic.create_timestamped_vrts, spec, task_tiles.iloc[rows]
                     )
                 )
 
             # Create a progress bar and iterate through futures
-            for future in tqdm(futures, desc="Creating VRTs", unit="vrt"):
-                result = future.result()
-                output_vrts.append(result)
+            with tqdm(total=len(batch_dates), desc="Creating VRTs", unit="vrt") as pbar:
+                for future in concurrent.futures.as_completed(futures):
+                    results = future.result()
+                    for date_str, vrt_path in results:
+                        manifest[date_str] = {
+                            "hash": date_hashes[date_str],
+                            "source": vrt_path,
+                        }
+                    pbar.update(len(results))
+        self.__write_mosaic_manifest__(manifest)
+
+        output_vrts = [manifest[date_str]["source"] for date_str in output_bands]
 
         self.output_vrts = output_vrts
+        self.output_bands = list(output_bands.values())
+
+    @decorators.log_time
+    @decorators.log_init
+    def run_pipeline(
+        self,
+        bands,
+        band_locator="description",
+        sync=False,
+        overwrite=False,
+        resolution=None,
+        dtype=None,
+        crs=None,
+        backend="gdal",
+        resampling_method="nearest",
+        materialize=False,
+        grid=None,
+        queue_size=8,
+    ):
+        """
+        Discovers, syncs and mosaics the dataset date by date, as a streaming pipeline.
+
+        ``discover()``, ``mosaic(sync=True)`` wait for every date to finish a step before starting the
+        next one. Here, once the source is scanned, every date goes through three stages running
+        concurrently: getting the metadata of its tiles, syncing and warping them, and creating its
+        VRT. A date moves to the next stage as soon as it is done with the current one, so syncing,
+        which is bound by the network, overlaps with creating VRTs, which is bound by GDAL and the CPU.
+        Stages are connected by queues of at most ``queue_size`` dates and report their progress on
+        separate bars.
+
+        The outputs are the same as ``discover()`` followed by ``mosaic()``: the catalog is written
+        at the end, VRTs whose inputs did not change since the previous run are kept, and ``save()``
+        can be called afterwards.
+
+        Args:
+            bands (list[string]): Ordered list of band descriptions to output as VRTs.
+            band_locator (str, optional): Specifies how to locate bands in the dataset, see ``discover()``.
+                Defaults to "description".
+            sync (bool | str, optional): Whether to sync the remote data sources before creating the VRTs, ``clip``
+                to only download the window of every tile covering the bounding box, see ``mosaic()``. Default False.
+            overwrite (bool, optional): With ``sync=True``, download again the synced files whose current
+                version can not be checked, files that changed, are missing or were partially synced being
+                downloaded again anyway. With ``sync="clip"``, clip the tiles again. Default False.
+            resolution (float, optional): Desired output resolution, see ``mosaic()``.
+            dtype (str, optional): Desired output data type, see ``mosaic()``.
+            crs (str, optional): Desired output CRS, see ``mosaic()``.
+            backend (str, optional): ``gdal`` or ``xml``, see ``mosaic()``. The ``gti`` backend needs the
+                tiles of all dates in its index before creating any VRT and is not supported. Defaults to ``gdal``.
+            resampling_method (str, optional): GDAL resampling algorithm, see ``mosaic()``. Defaults to ``nearest``.
+            materialize (bool, optional): Write warped tiles as local COGs, see ``mosaic()``. Default False.
+            grid (TargetGrid, optional): Explicit output grid, see ``mosaic()``. Default None.
+            queue_size (int, optional): Maximum number of dates waiting between two stages. Defaults to 8.
+
+        Raises:
+            ValueError: If the backend is not supported or the output grid parameters are invalid
+            Exception: If no tiles are found, or the first exception raised by a stage
+
+        Example:
+            >>> import datetime
+            >>> import earth_data_kit as edk
+            >>> ds = edk.stitching.Dataset("example_dataset", "s3://your-bucket-name/path/to/data", "s3", "geotiff")
+            >>> ds.set_timebounds(datetime.datetime(2020, 1, 1), datetime.datetime(2020, 12, 31))
+            >>> ds.set_spacebounds((19.3, 39.6, 21.1, 42.7))
+            >>> ds.run_pipeline(["red", "green", "blue"], sync=True)
+            >>> ds.save()
+        """
+        if self.tile_ids is not None:
+            raise Exception(
+                "run_pipeline() can not be run on a view returned by query(). Run it on the parent dataset instead."
+            )
+        if backend not in ("gdal", "xml"):
+            raise ValueError(
+                f"Unsupported pipeline backend: {backend}. Should be one of gdal, xml"
+            )
+        if sync not in (True, False, "clip"):
+            raise ValueError(
+                f"Unsupported sync mode: {sync}. Should be one of True, False, clip"
+            )
+        resolution, crs = self.__get_output_grid__(resolution, crs, grid)
+        warping = resolution is not None
+        if not sync and warping:
+            logger.warning(
+                "When resampling (resolution or crs specified), sync=True is required. "
+                "Please set sync=True to download the data locally when mosaicing."
+            )
+
+        helpers.make_sure_dir_exists(f"{self.__get_ds_tmp_path__()}/pre-processing")
+        fingerprint = self.__get_fingerprint__(band_locator)
+        params = self.__get_mosaic_params__(
+            bands, resolution, dtype, crs, backend, resampling_method, materialize, grid
+        )
+        spec = mosaic.create_mosaic_spec(
+            f"{self.__get_ds_tmp_path__()}/pre-processing",
+            self.space_opts["bbox"],
+            bands,
+            resolution,
+            dtype,
+            crs,
+            backend,
+            grid=grid,
+        )
+
+        # Listing is a single pass over the source, dates are streamed from its results
+        scan_df = self.engine.scan(
+            self.source,
+            self.time_opts,
+            self.space_opts,
+            self.__get_ds_tmp_path__(),
+            band_locator,
+        )
+        scan_df = self.__aggregate_scan__(scan_df)
+        if scan_df.empty:
+            raise Exception("No tiles found for the given time and spatial constraints")
+        scan_dates = pd.to_datetime(
+            pd.Series(scan_df["date"].to_numpy(), dtype=object),
+            utc=True,
+            format="mixed",
+        )
+        date_groups = [
+            rows
+            for _, rows in scan_df.groupby(
+                scan_dates.to_numpy(), sort=True, dropna=False
+            )
+        ]
+
+        lock = threading.Lock()
+        tables = []
+        manifest = self.__read_mosaic_manifest__()
+
+        def get_metadata(scan_rows):
+            tiles = self.format.create_tiles(scan_rows.reset_index(drop=True), band_locator)  # type: ignore
+            if sync == "clip" and np.any(tiles.geo_transform[:, [2, 4]] != 0):
+                raise ValueError(
+                    "sync='clip' requires north-up tiles, use sync=True for rotated tiles"
+                )
+            footprints = tiles.get_wgs84_footprints()
+            mask = geo.intersects_aoi(footprints, self.space_opts["aoi"])
+            if not mask.any():
+                return None
+            tiles = tiles.filter(mask)
+            with lock:
+                tables.append(tiles.to_catalog_table(footprints[mask]))
+            return tiles.band_table()
+
+        def localize(df):
+            df = self.__select_bands__(df, bands)
+            if df.empty:
+                return None
+            if sync:
+                df = self.__sync_tiles__(df, sync, overwrite)
+                if df.empty:
+                    return None
+            if warping:
+                df = warp.warp_tiles(
+                    df,
+                    f"{self.__get_ds_tmp_path__()}/warped",
+                    crs,
+                    resolution,
+                    resampling=resampling_method,
+                    materialize=materialize,
+                    grid=grid,
+                )
+            return df
+
+        def create_vrt(df):
+            ((date_str, date_hash),) = self.__get_date_hashes__(df, params).items()
+            previous = manifest.get(date_str, {})
+            if previous.get("hash") == date_hash and os.path.exists(
+                previous.get("source", "")
+            ):
+                vrt_path = previous["source"]
+            else:
+                with lock:
+                    # An interrupted run must not leave the previous hash on a partially rebuilt date
+                    manifest.pop(date_str, None)
+                    self.__write_mosaic_manifest__(manifest)
+                self.__remove_date_outputs__(date_str)
+                vrt_path = mosaic.create_timestamped_vrt(
+                    spec, mosaic.get_task_tiles(df), date_str
+                )
+            return (
+                date_str,
+                date_hash,
+                vrt_path,
+                self.__get_output_bands__(df, bands)[date_str],
+            )
+
+        # Syncing runs one date at a time, s5cmd already parallelizes the downloads of a date
+        stages = [
+            pipeline.Stage("Getting metadata", get_metadata),
+            pipeline.Stage("Syncing", localize),
+            pipeline.Stage(
+                "Creating VRTs",
+                create_vrt,
+                workers=helpers.get_threadpool_workers() or os.cpu_count(),
+            ),
+        ]
+        results = pipeline.Pipeline(stages, queue_size=queue_size).run(date_groups)
+
+        if not tables:
+            raise Exception("No tiles found for the given time and spatial constraints")
+        self.__write_catalog__(tables, fingerprint)
+
+        results = sorted(results, key=lambda r: r[0])
+        built = {
+            date_str: {"hash": h, "source": path} for date_str, h, path, _ in results
+        }
+        for date_str in manifest:
+            if date_str not in built:
+                self.__remove_date_outputs__(date_str)
+        self.__write_mosaic_manifest__(built)
+
+        self.output_vrts = [path for _, _, path, _ in results]
+        self.output_bands = [date_bands for _, _, _, date_bands in results]
 
     def save(self):
         """
@@ -824,7 +1438,9 @@ class Dataset:
         Returns:
             None
         """
-        json_path = self.__combine_timestamped_vrts__(self.output_vrts)
+        json_path = self.__combine_timestamped_vrts__(
+            self.output_vrts, self.output_bands
+        )
         self.json_path = json_path
 
     @decorators.log_time
@@ -894,7 +1510,6 @@ class Dataset:
                 if isinstance(first_vrt, dict) and "source" in first_vrt:
                     first_vrt_path = first_vrt["source"]
 
-
         ds = gdal.Open(first_vrt_path)
 
         x_block_size, y_block_size = ds.GetRasterBand(1).GetBlockSize()
@@ -925,6 +1540,11 @@ class Dataset:
         Combine a list of DataArrays by interpolating each to the grid of the reference DataArray,
         using the specified interpolation methods for each DataArray.
 
+        Interpolation is done lazily by ``xarray_boosted.regrid``: sparse weights between the grids are
+        computed once and cached on disk, and every output chunk only reads the source window it needs.
+        Methods it does not support are passed to ``xarray.DataArray.interp``. DataArrays already on the grid of
+        the reference, such as datasets mosaicked on the same ``TargetGrid``, are concatenated as is.
+
         The reference DataArray (`ref_da`) and the DataArrays in `das` are typically returned by the `.to_dataarray()` function,
         and are expected to have dimensions: "time", "band", "x", and "y".
 
@@ -937,7 +1557,8 @@ class Dataset:
         method : str or list of str, optional
             Interpolation method(s) to use for each DataArray in das. If a single string is provided,
             it is used for all DataArrays. If a list is provided, it must be the same length as das.
-            Default is "linear" for all.
+            One of "nearest", "linear", "conservative" (area weighted average, for downsampling) or any
+            other method of ``xarray.DataArray.interp``. Default is "linear" for all.
 
         Returns
         -------
@@ -957,7 +1578,17 @@ class Dataset:
             raise TypeError("method must be a string or a list/tuple of strings.")
 
         interped = [
-            da.interp(x=ref_da.x, y=ref_da.y, method=m) for da, m in zip(das, method)
+            (
+                # Mosaicked on the same TargetGrid, only float noise can differ
+                da.assign_coords(x=ref_da.x, y=ref_da.y)
+                if regrid.is_same_grid(da, ref_da)
+                else (
+                    regrid.regrid(da, ref_da, method=m)
+                    if m in regrid.METHODS
+                    else da.interp(x=ref_da.x, y=ref_da.y, method=m)
+                )
+            )
+            for da, m in zip(das, method)
         ]
         all_das = [ref_da] + interped
         out = xr.concat(all_das, dim="band", join="outer")
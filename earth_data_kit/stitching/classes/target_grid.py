@@ -0,0 +1,171 @@
+import math
+import logging
+import numpy as np
+import earth_data_kit.utilities.transform as transform
+
+logger = logging.getLogger(__name__)
+
+# Fraction of a pixel under which bounds are considered on a grid line, absorbs float noise
+SNAP_TOLERANCE = 1e-6
+
+
+class TargetGrid:
+    """
+    An explicit output grid shared by several datasets: a CRS, a resolution, an origin its pixels
+    are aligned on and an extent.
+
+    Passing the same grid to ``Dataset.mosaic`` of several datasets warps their tiles onto it, so
+    their VRTs have identical geotransforms and sizes and the DataArrays read from them have
+    identical x and y coordinates. ``Dataset.combine`` then stacks them without interpolating.
+
+    Example:
+        >>> import earth_data_kit as edk
+        >>> grid = edk.stitching.TargetGrid.from_bbox((19.3, 39.6, 21.1, 42.7), "EPSG:4326", (0.0006, -0.0006))
+        >>> s2.mosaic(["B04", "B03", "B02"], sync=True, grid=grid)
+        >>> era5.mosaic(["temperature_2m"], grid=grid)
+    """
+
+    def __init__(self, crs, resolution, bounds, origin=(0.0, 0.0)):
+        """
+        Args:
+            crs (str): CRS of the grid, as accepted by GDAL, eg: ``EPSG:4326``
+            resolution (tuple): (x_res, y_res) pixel size in CRS units, the sign of y_res is ignored
+            bounds (tuple): (xmin, ymin, xmax, ymax) extent in the grid CRS, snapped outwards to whole pixels
+            origin (tuple, optional): A pixel corner of the grid, pixels are aligned on
+                origin + k * resolution. Defaults to (0, 0), like ``gdalwarp -tap``
+        """
+        self.crs = crs
+        self.x_res = abs(float(resolution[0]))
+        self.y_res = abs(float(resolution[1]))
+        if self.x_res == 0 or self.y_res == 0:
+            raise ValueError(f"Grid resolution should not be 0, found {resolution}")
+        self.origin = (float(origin[0]), float(origin[1]))
+
+        snapped = self.snap_bounds(np.asarray([bounds], dtype=np.float64), clip=False)[
+            0
+        ]
+        if np.isnan(snapped).any():
+            raise ValueError(
+                f"Grid bounds should have a non empty extent, found {bounds}"
+            )
+        self.bounds = tuple(float(v) for v in snapped)
+
+    @classmethod
+    def from_bbox(cls, bbox, crs, resolution, origin=(0.0, 0.0)):
+        """
+        Grid in the given CRS covering an EPSG:4326 bbox, such as the one passed to ``set_spacebounds``.
+
+        Args:
+            bbox (tuple): (xmin, ymin, xmax, ymax) in EPSG:4326
+            crs (str): CRS of the grid
+            resolution (tuple): (x_res, y_res) pixel size in CRS units
+            origin (tuple, optional): A pixel corner of the grid. Defaults to (0, 0)
+
+        Returns:
+            TargetGrid: The grid
+        """
+        bounds = transform.transform_extents([bbox], "EPSG:4326", crs)[0]
+        return cls(crs, resolution, bounds, origin)
+
+    @property
+    def x_size(self):
+        return int(round((self.bounds[2] - self.bounds[0]) / self.x_res))
+
+    @property
+    def y_size(self):
+        return int(round((self.bounds[3] - self.bounds[1]) / self.y_res))
+
+    @property
+    def geo_transform(self):
+        return (self.bounds[0], self.x_res, 0.0, self.bounds[3], 0.0, -self.y_res)
+
+    def get_resolution(self):
+        """Resolution as passed to ``gdal.Warp``, (x_res, -y_res)."""
+        return (self.x_res, -self.y_res)
+
+    def get_coords(self):
+        """Pixel center x and y coordinates of the grid, as read by ``to_dataarray()``."""
+        return {
+            "x": self.bounds[0] + (np.arange(self.x_size) + 0.5) * self.x_res,
+            "y": self.bounds[3] - (np.arange(self.y_size) + 0.5) * self.y_res,
+        }
+
+    def snap_bounds(self, extents, clip=True):
+        """
+        Snap extents in the grid CRS outwards to the grid pixels.
+
+        Args:
+            extents (np.ndarray): Array of shape (N, 4) of (xmin, ymin, xmax, ymax)
+            clip (bool, optional): Clip the snapped extents to the grid bounds. Defaults to True
+
+        Returns:
+            np.ndarray: Array of shape (N, 4) of snapped extents, NaN rows for empty extents
+        """
+        extents = np.asarray(extents, dtype=np.float64).reshape(-1, 4)
+        ox, oy = self.origin
+        snapped = np.stack(
+            [
+                ox
+                + np.floor((extents[:, 0] - ox) / self.x_res + SNAP_TOLERANCE)
+                * self.x_res,
+                oy
+                + np.floor((extents[:, 1] - oy) / self.y_res + SNAP_TOLERANCE)
+                * self.y_res,
+                ox
+                + np.ceil((extents[:, 2] - ox) / self.x_res - SNAP_TOLERANCE)
+                * self.x_res,
+                oy
+                + np.ceil((extents[:, 3] - oy) / self.y_res - SNAP_TOLERANCE)
+                * self.y_res,
+            ],
+            axis=1,
+        )
+        if clip:
+            snapped[:, 0] = np.maximum(snapped[:, 0], self.bounds[0])
+            snapped[:, 1] = np.maximum(snapped[:, 1], self.bounds[1])
+            snapped[:, 2] = np.minimum(snapped[:, 2], self.bounds[2])
+            snapped[:, 3] = np.minimum(snapped[:, 3], self.bounds[3])
+        empty = ~((snapped[:, 2] > snapped[:, 0]) & (snapped[:, 3] > snapped[:, 1]))
+        snapped[empty] = np.nan
+        return snapped
+
+    def get_tile_bounds(self, band_tiles):
+        """
+        Extent of every tile warped onto the grid: its extent transformed to the grid CRS, snapped
+        to the grid pixels and clipped to the grid bounds.
+
+        Args:
+            band_tiles (pd.DataFrame): Tile-band rows with x_min, y_min, x_max, y_max and projection columns
+
+        Returns:
+            np.ndarray: Array of shape (N, 4), NaN rows for tiles outside the grid
+        """
+        extents = band_tiles[["x_min", "y_min", "x_max", "y_max"]].to_numpy(
+            dtype=np.float64
+        )
+        projections = band_tiles["projection"].to_numpy(dtype=object)
+        out = np.full((len(extents), 4), np.nan)
+        for projection in np.unique(projections):
+            mask = projections == projection
+            out[mask] = transform.transform_extents(extents[mask], projection, self.crs)
+        return self.snap_bounds(out)
+
+    def to_dict(self):
+        return {
+            "crs": self.crs,
+            "resolution": [self.x_res, -self.y_res],
+            "origin": list(self.origin),
+            "bounds": list(self.bounds),
+        }
+
+    def __eq__(self, other):
+        return isinstance(other, TargetGrid) and self.to_dict() == other.to_dict()
+
+    def __hash__(self):
+        return hash(str(self.to_dict()))
+
+    def __repr__(self):
+        return (
+            f"TargetGrid(crs={self.crs}, resolution=({self.x_res}, {-self.y_res}), "
+            f"bounds={self.bounds}, size=({self.x_size}, {self.y_size}))"
+        )
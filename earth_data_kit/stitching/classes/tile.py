@@ -117,67 +117,16 @@ class Tile:
         return bbox
 
     def get_wgs_extent(self):
-        # Get the geotransform
-        gt = self.geo_transform
-
-        # Get raster dimensions
-        cols = self.x_size
-        rows = self.y_size
-
-        # Get extent in original projection
-        ext = []
-        xarr = [0, cols]
-        yarr = [0, rows]
-
-        # Get the coordinates of all corners
-        for px in xarr:
-            for py in yarr:
-                x = gt[0] + (px * gt[1]) + (py * gt[2])
-                y = gt[3] + (px * gt[4]) + (py * gt[5])
-                ext.append([x, y])
-
-        # Get source coordinate system
-        src_srs = osr.SpatialReference()
-        src_srs.ImportFromWkt(self.projection)
-        src_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
-
-        # Get target coordinate system (WGS84)
-        tgt_srs = osr.SpatialReference()
-        tgt_srs.ImportFromEPSG(4326)
-        tgt_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
-        # Create transform
-        transform = osr.CoordinateTransformation(src_srs, tgt_srs)
-
-        # Transform all corners to WGS84
-        use_fallback = False
-        wgs84_ext = []
-        for x, y in ext:
-            try:
-                point = transform.TransformPoint(x, y)
-                if any(np.isinf(coord) for coord in point):
-                    raise ValueError(
-                        f"Transformed point has inf values. Will fallback to warp implementation"
-                    )
-                wgs84_ext.append([point[0], point[1]])
-            except Exception as e:
-                logger.warning(e)
-                use_fallback = True
-                break
-
-        if use_fallback:
-            return self.get_wgs84_bbox_via_warp()
-
-        wgs84_ext = np.array(wgs84_ext)
-
-        # Get min/max coordinates
-        bbox = [
-            np.min(wgs84_ext[:, 0]).item(),  # minx
-            np.min(wgs84_ext[:, 1]).item(),  # miny
-            np.max(wgs84_ext[:, 0]).item(),  # maxx
-            np.max(wgs84_ext[:, 1]).item(),  # maxy
-        ]
+        """
+        Return (west, south, east, north) of the tile in EPSG:4326.
 
-        return bbox
+        Computed analytically from the geotransform and projection through the batched
+        footprint engine, see ``utilities.transform.get_wgs84_footprints``.
+        """
+        footprint = utilities.transform.get_wgs84_footprints(
+            [self.geo_transform], [self.x_size], [self.y_size], [self.projection]
+        )[0]
+        return list(footprint.bounds)
 
     def get_res(self):
         return tuple(
@@ -0,0 +1,630 @@
+import json
+import logging
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import shapely
+import earth_data_kit.stitching.catalog as catalog
+import earth_data_kit.utilities.transform as transform
+from earth_data_kit.stitching.classes.tile import Tile
+
+logger = logging.getLogger(__name__)
+
+# Columns holding one Python string per tile
+STRING_COLUMNS = ["engine_path", "gdal_path", "tile_name"]
+
+# Band fields holding one Python string per band
+BAND_STRING_FIELDS = ["description", "dtype", "color_interp"]
+
+# Columns with few distinct values, stored once in a table and referenced by integer codes
+INTERNED_COLUMNS = ["projection", "length_unit", "crs"]
+
+
+def _intern(values):
+    """Returns (codes, table) such that ``table[codes]`` gives back values, None included."""
+    codes, uniques = pd.factorize(
+        pd.Series(values, dtype=object), use_na_sentinel=False
+    )
+    table = np.empty(len(uniques), dtype=object)
+    table[:] = [None if pd.isna(v) else v for v in uniques]
+    return codes.astype(np.int32), table
+
+
+def _to_object_array(values):
+    if isinstance(values, pd.Series):
+        return values.to_numpy(dtype=object)
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = list(values)
+    return arr
+
+
+def _dictionary_array(codes, table):
+    """Arrow dictionary array for interned values, None entries becoming nulls."""
+    is_null = np.array([v is None for v in table], dtype=bool)
+    dictionary = pa.array([("" if v is None else v) for v in table], pa.string())
+    return pa.DictionaryArray.from_arrays(
+        pa.array(codes, pa.int32(), mask=is_null[codes] if len(codes) else None),
+        dictionary,
+    )
+
+
+def _from_dictionary_array(arr):
+    """Inverse of ``_dictionary_array``, nulls are mapped to an extra None entry of the table."""
+    table = np.append(_to_object_array(arr.dictionary.to_pylist()), None)
+    codes = arr.indices.fill_null(len(table) - 1).to_numpy().astype(np.int32)
+    return codes, table
+
+
+class TileTable:
+    """
+    Compact, array backed collection of tiles.
+
+    Tiles are stored column wise: numpy arrays for geotransforms, sizes and dates,
+    interned tables referenced by integer codes for projections, length units and CRSs,
+    and flat band arrays indexed through per tile offsets. Filtering and slicing are
+    array operations, so catalogs with millions of tiles are handled without creating a
+    Python object per tile. Indexing with an integer returns a ``TileView``, which
+    behaves like a ``Tile``, and iterating over the table yields views.
+
+    ``ids`` keeps the row number of every tile in the catalog it was read from, so
+    subsets can always be traced back to catalog rows.
+    """
+
+    def __init__(
+        self,
+        ids,
+        engine_path,
+        gdal_path,
+        tile_name,
+        date,
+        geo_transform,
+        x_size,
+        y_size,
+        interned,
+        band_offsets,
+        bands,
+    ):
+        self.ids = ids
+        self.engine_path = engine_path
+        self.gdal_path = gdal_path
+        self.tile_name = tile_name
+        # datetime64[us] in UTC, NaT for non temporal tiles
+        self.date = date
+        self.geo_transform = geo_transform
+        self.x_size = x_size
+        self.y_size = y_size
+        # {column: (codes, table)} for every column of INTERNED_COLUMNS
+        self.interned = interned
+        self.band_offsets = band_offsets
+        # {source_idx, description, dtype, nodataval, has_nodata, block_x_size, block_y_size, color_interp}
+        # flat arrays, one entry per band
+        self.bands = bands
+
+    @staticmethod
+    def empty():
+        return TileTable.from_df(pd.DataFrame())
+
+    @staticmethod
+    def from_df(df):
+        """
+        Create a TileTable from a DataFrame with one row per tile, columns as in ``Tile.__dict__``.
+
+        Args:
+            df (pd.DataFrame): DataFrame of tiles, as built by the format adapters
+
+        Returns:
+            TileTable: The tiles
+        """
+        n = len(df)
+        if n == 0:
+            df = pd.DataFrame(
+                {
+                    c: pd.Series(dtype=object)
+                    for c in STRING_COLUMNS
+                    + INTERNED_COLUMNS
+                    + ["date", "geo_transform", "bands"]
+                }
+            )
+            df["x_size"] = pd.Series(dtype=np.int64)
+            df["y_size"] = pd.Series(dtype=np.int64)
+
+        dates = pd.to_datetime(
+            pd.Series(df["date"].to_numpy(), dtype=object), utc=True, format="mixed"
+        )
+        geo_transform = np.asarray(
+            [tuple(gt) for gt in df["geo_transform"]], dtype=np.float64
+        ).reshape(n, 6)
+
+        # Bands are the only nested column, they are flattened once here
+        lengths = np.fromiter((len(b) for b in df["bands"]), dtype=np.int64, count=n)
+        flat = [b for tile_bands in df["bands"] for b in tile_bands]
+        nodata = [b.get("nodataval") for b in flat]
+        bands = {
+            "source_idx": np.fromiter(
+                (b["source_idx"] for b in flat), dtype=np.int32, count=len(flat)
+            ),
+            "description": _to_object_array([b["description"] for b in flat]),
+            "dtype": _to_object_array([b["dtype"] for b in flat]),
+            "nodataval": np.array(
+                [np.nan if v is None else v for v in nodata], dtype=np.float64
+            ),
+            "has_nodata": np.array([v is not None for v in nodata], dtype=bool),
+            # Block sizes are 0 when unknown, e.g. for bands cataloged by older versions
+            "block_x_size": np.fromiter(
+                (b.get("block_x_size") or 0 for b in flat),
+                dtype=np.int32,
+                count=len(flat),
+            ),
+            "block_y_size": np.fromiter(
+                (b.get("block_y_size") or 0 for b in flat),
+                dtype=np.int32,
+                count=len(flat),
+            ),
+            "color_interp": _to_object_array([b.get("color_interp") for b in flat]),
+        }
+
+        return TileTable(
+            ids=np.arange(n, dtype=np.int64),
+            engine_path=_to_object_array(df["engine_path"]),
+            gdal_path=_to_object_array(df["gdal_path"]),
+            tile_name=_to_object_array(df["tile_name"]),
+            date=dates.dt.tz_convert(None).to_numpy(dtype="datetime64[us]"),
+            geo_transform=geo_transform,
+            x_size=df["x_size"].to_numpy(dtype=np.int64),
+            y_size=df["y_size"].to_numpy(dtype=np.int64),
+            interned={col: _intern(df[col]) for col in INTERNED_COLUMNS},
+            band_offsets=np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            bands=bands,
+        )
+
+    @staticmethod
+    def from_tiles(tiles):
+        """
+        Create a TileTable from a list of ``Tile`` objects.
+        """
+        return TileTable.from_df(
+            pd.DataFrame(
+                [
+                    {
+                        "engine_path": t.engine_path,
+                        "gdal_path": t.gdal_path,
+                        "date": t.date,
+                        "tile_name": t.tile_name,
+                        "geo_transform": t.geo_transform,
+                        "projection": t.projection,
+                        "bands": t.bands,
+                        "length_unit": t.length_unit,
+                        "x_size": t.x_size,
+                        "y_size": t.y_size,
+                        "crs": t.crs,
+                    }
+                    for t in tiles
+                ]
+            )
+        )
+
+    @staticmethod
+    def from_catalog_table(table):
+        """
+        Create a TileTable from a catalog table, see ``catalog.CATALOG_SCHEMA``.
+
+        Columns are converted array by array, dictionary encoded columns map directly onto
+        the interned tables and the nested bands onto the flat band arrays.
+
+        Args:
+            table (pyarrow.Table): Catalog table, the bbox and geometry columns are not needed
+
+        Returns:
+            TileTable: The tiles, ids being the row numbers of the table
+        """
+        table = table.unify_dictionaries().combine_chunks()
+
+        def column(name):
+            col = table[name]
+            return col.chunk(0) if col.num_chunks else pa.array([], col.type)
+
+        bands = column("bands")
+        flat = pc.list_flatten(bands)
+        lengths = pc.list_value_length(bands).fill_null(0).to_numpy().astype(np.int64)
+        nodataval = flat.field("nodataval")
+
+        def block_size(name):
+            if flat.type.get_field_index(name) < 0:
+                return np.zeros(len(flat), dtype=np.int32)
+            return (
+                flat.field(name)
+                .fill_null(0)
+                .to_numpy(zero_copy_only=False)
+                .astype(np.int32)
+            )
+
+        def optional_strings(name):
+            if flat.type.get_field_index(name) < 0:
+                return np.full(len(flat), None, dtype=object)
+            return flat.field(name).to_numpy(zero_copy_only=False).astype(object)
+
+        return TileTable(
+            ids=np.arange(len(table), dtype=np.int64),
+            engine_path=column("engine_path")
+            .to_numpy(zero_copy_only=False)
+            .astype(object),
+            gdal_path=column("gdal_path").to_numpy(zero_copy_only=False).astype(object),
+            tile_name=column("tile_name").to_numpy(zero_copy_only=False).astype(object),
+            date=column("date").cast(pa.timestamp("us")).to_numpy(zero_copy_only=False),
+            geo_transform=column("geo_transform")
+            .flatten()
+            .to_numpy()
+            .reshape(-1, 6)
+            .copy(),
+            x_size=column("x_size").to_numpy().astype(np.int64),
+            y_size=column("y_size").to_numpy().astype(np.int64),
+            interned={
+                col: _from_dictionary_array(column(col)) for col in INTERNED_COLUMNS
+            },
+            band_offsets=np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            bands={
+                "source_idx": flat.field("source_idx")
+                .to_numpy(zero_copy_only=False)
+                .astype(np.int32),
+                "description": flat.field("description")
+                .to_numpy(zero_copy_only=False)
+                .astype(object),
+                "dtype": flat.field("dtype")
+                .to_numpy(zero_copy_only=False)
+                .astype(object),
+                "nodataval": nodataval.fill_null(np.nan).to_numpy(zero_copy_only=False),
+                "has_nodata": nodataval.is_valid().to_numpy(zero_copy_only=False),
+                "block_x_size": block_size("block_x_size"),
+                "block_y_size": block_size("block_y_size"),
+                "color_interp": optional_strings("color_interp"),
+            },
+        )
+
+    def to_catalog_table(self, footprints):
+        """
+        Convert the tiles and their EPSG:4326 footprints into a typed catalog table.
+
+        Args:
+            footprints (numpy.ndarray): Array of shapely geometries, one per tile
+
+        Returns:
+            pyarrow.Table: Table following ``catalog.CATALOG_SCHEMA`` with GeoParquet metadata attached
+        """
+        bounds = shapely.bounds(footprints).reshape(-1, 4)
+        band_values = pa.StructArray.from_arrays(
+            [
+                pa.array(self.bands["source_idx"], pa.int32()),
+                pa.array(self.bands["description"], pa.string()),
+                pa.array(self.bands["dtype"], pa.string()),
+                pa.array(
+                    self.bands["nodataval"],
+                    pa.float64(),
+                    mask=~self.bands["has_nodata"],
+                ),
+                pa.array(self.bands["block_x_size"], pa.int32()),
+                pa.array(self.bands["block_y_size"], pa.int32()),
+                pa.array(self.bands["color_interp"], pa.string()),
+            ],
+            fields=list(catalog.BAND_TYPE),
+        )
+
+        columns = {
+            "engine_path": pa.array(self.engine_path, pa.string()),
+            "gdal_path": pa.array(self.gdal_path, pa.string()),
+            "date": pa.array(self.date, pa.timestamp("us")).cast(
+                pa.timestamp("us", tz="UTC")
+            ),
+            "tile_name": pa.array(self.tile_name, pa.string()),
+            "geo_transform": pa.FixedSizeListArray.from_arrays(
+                pa.array(self.geo_transform.ravel(), pa.float64()), 6
+            ),
+            "projection": _dictionary_array(*self.interned["projection"]),
+            "bands": pa.ListArray.from_arrays(
+                pa.array(self.band_offsets, pa.int32()), band_values
+            ),
+            "length_unit": _dictionary_array(*self.interned["length_unit"]),
+            "x_size": pa.array(self.x_size, pa.int64()),
+            "y_size": pa.array(self.y_size, pa.int64()),
+            "crs": _dictionary_array(*self.interned["crs"]),
+            "bbox": pa.StructArray.from_arrays(
+                [pa.array(bounds[:, i]) for i in range(4)],
+                fields=list(catalog.BBOX_TYPE),
+            ),
+            "geometry": pa.array(shapely.to_wkb(footprints), pa.binary()),
+        }
+        table = pa.table(columns).cast(catalog.CATALOG_SCHEMA)
+        return table.replace_schema_metadata(
+            {"geo": json.dumps(catalog.geo_metadata(footprints))}
+        )
+
+    def to_df(self):
+        """
+        Convert the tiles to a DataFrame with one row per tile, columns as in ``Tile.__dict__``.
+        """
+        return pd.DataFrame(
+            {
+                "engine_path": self.engine_path,
+                "gdal_path": self.gdal_path,
+                "date": self.get_dates(),
+                "tile_name": self.tile_name,
+                "geo_transform": [tuple(gt) for gt in self.geo_transform.tolist()],
+                "projection": self.get_values("projection"),
+                "bands": [self.get_bands(i) for i in range(len(self))],
+                "length_unit": self.get_values("length_unit"),
+                "x_size": self.x_size,
+                "y_size": self.y_size,
+                "crs": self.get_values("crs"),
+            }
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield TileView(self, i)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += len(self)
+            if not 0 <= key < len(self):
+                raise IndexError("TileTable index out of range")
+            return TileView(self, int(key))
+        if isinstance(key, slice):
+            return self.take(np.arange(len(self))[key])
+        return self.take(key)
+
+    def take(self, indices):
+        """
+        Select tiles by position (or boolean mask), returning a new TileTable.
+
+        Interned tables are shared with the new table, the band arrays are gathered
+        through the offsets without a per tile loop.
+
+        Args:
+            indices (array-like): Positions of the tiles to keep, or a boolean mask
+
+        Returns:
+            TileTable: The selected tiles
+        """
+        idx = np.asarray(indices)
+        if idx.dtype == bool:
+            idx = np.flatnonzero(idx)
+        idx = idx.astype(np.int64)
+
+        starts = self.band_offsets[idx]
+        lengths = self.band_offsets[idx + 1] - starts
+        offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        # Position of every selected band in the flat band arrays
+        band_idx = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+
+        return TileTable(
+            ids=self.ids[idx],
+            engine_path=self.engine_path[idx],
+            gdal_path=self.gdal_path[idx],
+            tile_name=self.tile_name[idx],
+            date=self.date[idx],
+            geo_transform=self.geo_transform[idx],
+            x_size=self.x_size[idx],
+            y_size=self.y_size[idx],
+            interned={
+                col: (codes[idx], table)
+                for col, (codes, table) in self.interned.items()
+            },
+            band_offsets=offsets,
+            bands={k: v[band_idx] for k, v in self.bands.items()},
+        )
+
+    def filter(self, mask):
+        """Keep the tiles for which mask is True."""
+        return self.take(np.asarray(mask, dtype=bool))
+
+    def get_values(self, column):
+        """Per tile values of an interned column (projection, length_unit or crs) as an object array."""
+        codes, table = self.interned[column]
+        return table[codes]
+
+    def get_dates(self):
+        """Tile dates as a tz-aware (UTC) pandas Series, NaT for non temporal tiles."""
+        return pd.Series(self.date).dt.tz_localize("UTC")
+
+    def get_bands(self, i):
+        """Band dictionaries of the tile at position i, in the layout of ``Tile.bands``."""
+        start, end = self.band_offsets[i], self.band_offsets[i + 1]
+        return [
+            {
+                "source_idx": int(self.bands["source_idx"][j]),
+                "description": self.bands["description"][j],
+                "dtype": self.bands["dtype"][j],
+                "nodataval": (
+                    float(self.bands["nodataval"][j])
+                    if self.bands["has_nodata"][j]
+                    else None
+                ),
+                "block_x_size": int(self.bands["block_x_size"][j]),
+                "block_y_size": int(self.bands["block_y_size"][j]),
+                "color_interp": self.bands["color_interp"][j],
+            }
+            for j in range(start, end)
+        ]
+
+    def get_res(self):
+        """Rounded (x_res, y_res) arrays of every tile, see ``Tile.get_res``."""
+        return np.round(self.geo_transform[:, 1], 6), np.round(
+            self.geo_transform[:, 5], 6
+        )
+
+    def get_extents(self):
+        """(N, 4) array of (x_min, y_min, x_max, y_max) of every tile in its own CRS, see ``Tile.get_extent``."""
+        gt = self.geo_transform
+        x_min = gt[:, 0]
+        y_max = gt[:, 3]
+        x_max = x_min + gt[:, 1] * self.x_size
+        y_min = y_max + gt[:, 5] * self.y_size
+        return np.stack([x_min, y_min, x_max, y_max], axis=1)
+
+    def get_wgs84_footprints(self):
+        """
+        EPSG:4326 footprints of every tile, see ``utilities.transform.get_wgs84_footprints``.
+
+        Projections are passed as codes into the interned table, so tiles are grouped by
+        integer comparisons instead of comparing projection strings.
+        """
+        codes, table = self.interned["projection"]
+        return transform.get_wgs84_footprints(
+            self.geo_transform, self.x_size, self.y_size, codes, projection_table=table
+        )
+
+    def band_table(self):
+        """
+        Flat tile-band table, with one row per band of every tile.
+
+        Tile level attributes are broadcast to their bands through the offsets.
+
+        Returns:
+            pd.DataFrame: DataFrame with columns tile_id, date, engine_path, gdal_path, source_idx,
+                description, dtype, nodataval, block_x_size, block_y_size, color_interp, x_res, y_res, crs,
+                projection, x_min, y_min, x_max, y_max (native CRS), x_size and y_size
+        """
+        lengths = np.diff(self.band_offsets)
+        parent = np.repeat(np.arange(len(self)), lengths)
+        x_res, y_res = self.get_res()
+        x_min, y_min, x_max, y_max = self.get_extents().T
+
+        df = pd.DataFrame(
+            {
+                "tile_id": self.ids[parent],
+                "date": pd.Series(self.date[parent]).dt.tz_localize("UTC"),
+                "engine_path": self.engine_path[parent],
+                "gdal_path": self.gdal_path[parent],
+                "source_idx": self.bands["source_idx"],
+                "description": self.bands["description"],
+                "dtype": self.bands["dtype"],
+                "nodataval": np.where(
+                    self.bands["has_nodata"], self.bands["nodataval"], np.nan
+                ),
+                "block_x_size": self.bands["block_x_size"],
+                "block_y_size": self.bands["block_y_size"],
+                "color_interp": self.bands["color_interp"],
+                "x_res": x_res[parent],
+                "y_res": y_res[parent],
+                "crs": self.get_values("crs")[parent],
+                "projection": self.get_values("projection")[parent],
+                "x_min": x_min[parent],
+                "y_min": y_min[parent],
+                "x_max": x_max[parent],
+                "y_max": y_max[parent],
+                "x_size": self.x_size[parent],
+                "y_size": self.y_size[parent],
+            }
+        )
+        return df
+
+    def get_value(self, i, name):
+        """Value of attribute name of the tile at position i, as it would be stored on a ``Tile``."""
+        if name in STRING_COLUMNS:
+            return getattr(self, name)[i]
+        if name in INTERNED_COLUMNS:
+            codes, table = self.interned[name]
+            return table[codes[i]]
+        if name == "date":
+            date = self.date[i]
+            return None if np.isnat(date) else pd.Timestamp(date, tz="UTC")
+        if name == "geo_transform":
+            return tuple(self.geo_transform[i].tolist())
+        if name in ("x_size", "y_size"):
+            return int(getattr(self, name)[i])
+        if name == "bands":
+            return self.get_bands(i)
+        raise AttributeError(name)
+
+    def set_value(self, i, name, value):
+        """Set attribute name of the tile at position i. Bands can not be set."""
+        if name in STRING_COLUMNS:
+            getattr(self, name)[i] = value
+        elif name in INTERNED_COLUMNS:
+            codes, table = self.interned[name]
+            matches = np.flatnonzero([v == value for v in table])
+            if len(matches) == 0:
+                table = np.append(table, None)
+                table[-1] = value
+                matches = [len(table) - 1]
+            # Codes may be shared with the table this one was taken from, copy before writing
+            codes = codes.copy()
+            codes[i] = matches[0]
+            self.interned[name] = (codes, table)
+        elif name == "date":
+            ts = pd.Timestamp(value) if value is not None else pd.NaT
+            if ts is not pd.NaT and ts.tzinfo is not None:
+                ts = ts.tz_convert("UTC").tz_localize(None)
+            self.date[i] = np.datetime64(ts, "us")
+        elif name == "geo_transform":
+            self.geo_transform[i] = value
+        elif name in ("x_size", "y_size"):
+            getattr(self, name)[i] = value
+        else:
+            raise AttributeError(f"Attribute {name} of a TileView can not be set")
+
+    def __getstate__(self):
+        # Object arrays would pickle string by string, arrow arrays pickle as a few buffers
+        state = dict(self.__dict__)
+        for col in STRING_COLUMNS:
+            state[col] = pa.array(state[col], pa.string())
+        state["interned"] = {
+            col: (codes, pa.array(table, pa.string()))
+            for col, (codes, table) in self.interned.items()
+        }
+        state["bands"] = dict(self.bands)
+        for key in BAND_STRING_FIELDS:
+            state["bands"][key] = pa.array(self.bands[key], pa.string())
+        return state
+
+    def __setstate__(self, state):
+        for col in STRING_COLUMNS:
+            state[col] = state[col].to_numpy(zero_copy_only=False).astype(object)
+        state["interned"] = {
+            col: (codes, _to_object_array(table.to_pylist()))
+            for col, (codes, table) in state["interned"].items()
+        }
+        for key in BAND_STRING_FIELDS:
+            state["bands"][key] = (
+                state["bands"][key].to_numpy(zero_copy_only=False).astype(object)
+            )
+        self.__dict__.update(state)
+
+
+def _column_property(name):
+    return property(
+        lambda self: self._table.get_value(self._idx, name),
+        lambda self, value: self._table.set_value(self._idx, name, value),
+    )
+
+
+class TileView(Tile):
+    """
+    A ``Tile`` backed by one row of a ``TileTable``.
+
+    Attributes are read from (and written to) the table arrays, so views are cheap to
+    create and all ``Tile`` methods work on them.
+    """
+
+    engine_path = _column_property("engine_path")
+    gdal_path = _column_property("gdal_path")
+    date = _column_property("date")
+    tile_name = _column_property("tile_name")
+    geo_transform = _column_property("geo_transform")
+    projection = _column_property("projection")
+    bands = _column_property("bands")
+    length_unit = _column_property("length_unit")
+    x_size = _column_property("x_size")
+    y_size = _column_property("y_size")
+    crs = _column_property("crs")
+
+    def __init__(self, table, idx) -> None:
+        self._table = table
+        self._idx = idx
+
+    def __repr__(self):
+        return f"TileView({self.gdal_path!r}, {self.date})"
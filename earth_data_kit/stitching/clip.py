@@ -0,0 +1,168 @@
+import os
+import json
+import uuid
+import hashlib
+import logging
+import concurrent.futures
+import numpy as np
+from osgeo import gdal
+from tqdm import tqdm
+import earth_data_kit.utilities.helpers as helpers
+import earth_data_kit.utilities.geo as geo
+import earth_data_kit.utilities.transform as transform
+import earth_data_kit.stitching.warp as warp
+import earth_data_kit.stitching.executors as executors
+
+gdal.UseExceptions()
+
+logger = logging.getLogger(__name__)
+
+# Pixels kept around the bounding box, so resampling near its edges has the neighbours it needs
+DEFAULT_MARGIN = 8
+
+
+def get_windows(df, bbox, margin=DEFAULT_MARGIN):
+    """
+    Pixel windows of the tiles covering a bounding box, computed from the catalog metadata.
+
+    Args:
+        df (pd.DataFrame): Tile-band rows of north-up tiles, see ``TileTable.band_table``
+        bbox (tuple): (xmin, ymin, xmax, ymax) in EPSG:4326
+        margin (int, optional): Pixels added on every side of the window. Defaults to 8
+
+    Returns:
+        numpy.ndarray: (N, 4) array of (x_off, y_off, x_size, y_size) of every row, with a zero size
+            where the tile does not cover the bounding box
+    """
+    x_min, y_max = df["x_min"].to_numpy(np.float64), df["y_max"].to_numpy(np.float64)
+    x_size, y_size = df["x_size"].to_numpy(np.int64), df["y_size"].to_numpy(np.int64)
+    # Exact pixel sizes, the x_res and y_res columns are rounded
+    x_res = (df["x_max"].to_numpy(np.float64) - x_min) / x_size
+    y_res = (y_max - df["y_min"].to_numpy(np.float64)) / y_size
+
+    aoi = np.empty((len(df), 4), dtype=np.float64)
+    projections = df["projection"].to_numpy()
+    for projection in np.unique(projections):
+        aoi[projections == projection] = transform.transform_extents(
+            [bbox], "EPSG:4326", projection
+        )[0]
+
+    with np.errstate(invalid="ignore"):
+        col_start = np.floor((aoi[:, 0] - x_min) / x_res) - margin
+        col_end = np.ceil((aoi[:, 2] - x_min) / x_res) + margin
+        row_start = np.floor((y_max - aoi[:, 3]) / y_res) - margin
+        row_end = np.ceil((y_max - aoi[:, 1]) / y_res) + margin
+
+    # Tiles the bounding box could not be transformed to are kept whole
+    failed = np.isnan(aoi).any(axis=1)
+    col_start = np.where(failed, 0, np.clip(col_start, 0, x_size)).astype(np.int64)
+    col_end = np.where(failed, x_size, np.clip(col_end, 0, x_size)).astype(np.int64)
+    row_start = np.where(failed, 0, np.clip(row_start, 0, y_size)).astype(np.int64)
+    row_end = np.where(failed, y_size, np.clip(row_end, 0, y_size)).astype(np.int64)
+
+    return np.stack(
+        [
+            col_start,
+            row_start,
+            np.maximum(col_end - col_start, 0),
+            np.maximum(row_end - row_start, 0),
+        ],
+        axis=1,
+    )
+
+
+def get_clip_key(gdal_path, version, window):
+    """
+    Key of a clipped tile, depending on the source, its version and its window only, so later runs
+    reuse it until the source changes, see ``geo.get_source_version``.
+    """
+    return hashlib.md5(
+        json.dumps([gdal_path, version, [int(w) for w in window]]).encode("utf-8")
+    ).hexdigest()
+
+
+def clip_tile(gdal_path, output_path, window, overwrite=False):
+    """
+    Write a window of a tile as a local tiled COG, reusing a previous output if present.
+
+    Only the blocks of the source intersecting the window are read, with ranged reads for remote
+    COGs, and the output keeps the georeferencing of the window.
+
+    Args:
+        gdal_path (str): Source path, eg: ``/vsis3/bucket/key.tif``
+        output_path (str): Path of the clipped COG
+        window (tuple): (x_off, y_off, x_size, y_size) in pixels of the source
+        overwrite (bool, optional): Clip again even if the output exists. Defaults to False
+
+    Returns:
+        dict: Path, geo_transform, size and block size of the clipped tile
+    """
+    if overwrite or not os.path.exists(output_path):
+        # Written next to the final path and moved in place, so a reused output is always complete
+        tmp_path = f"{os.path.splitext(output_path)[0]}.{uuid.uuid4()}.tmp.tif"
+        options = gdal.TranslateOptions(
+            format="COG",
+            srcWin=[int(w) for w in window],
+            creationOptions=[
+                "BLOCKSIZE=512",
+                "COMPRESS=DEFLATE",
+                "NUM_THREADS=ALL_CPUS",
+            ],
+        )
+        ds = gdal.Translate(tmp_path, gdal_path, options=options)
+        ds.Close()
+        os.replace(tmp_path, output_path)
+
+    return warp.get_output(output_path)
+
+
+def clip_tiles(df, clip_dir, bbox, margin=DEFAULT_MARGIN, overwrite=False):
+    """
+    Download the windows of the tiles covering a bounding box and point the table to the local copies.
+
+    Replaces downloading whole scenes when the area of interest only covers a part of them. Every
+    distinct source is clipped once, whatever the number of its bands and dates, and its output is
+    keyed by (source, source version, window), so later runs reuse it until the source changes.
+
+    Args:
+        df (pd.DataFrame): Tile-band rows of north-up tiles, see ``TileTable.band_table``
+        clip_dir (str): Directory of the clipped tiles, kept across runs
+        bbox (tuple): (xmin, ymin, xmax, ymax) in EPSG:4326
+        margin (int, optional): Pixels kept around the bounding box. Defaults to 8
+        overwrite (bool, optional): Clip tiles again even if they were clipped before. Defaults to False
+
+    Returns:
+        pd.DataFrame: The rows of the tiles covering the bounding box, with gdal_path, extent, size and
+            block size columns describing the clipped tiles
+    """
+    helpers.make_sure_dir_exists(clip_dir)
+
+    windows = get_windows(df, bbox, margin)
+    inside = (windows[:, 2] > 0) & (windows[:, 3] > 0)
+    df, windows = df[inside], windows[inside]
+
+    clipped = {}
+    with executors.get_executor("thread") as executor:
+        unique_paths = df["gdal_path"].unique()
+        versions = dict(
+            zip(unique_paths, executor.map(geo.get_source_version, unique_paths))
+        )
+        keys = [
+            get_clip_key(p, versions[p], w) for p, w in zip(df["gdal_path"], windows)
+        ]
+        sources = dict(zip(keys, zip(df["gdal_path"], map(tuple, windows))))
+        futures = {
+            executor.submit(
+                clip_tile, source, f"{clip_dir}/{key}.tif", window, overwrite
+            ): key
+            for key, (source, window) in sources.items()
+        }
+        for future in tqdm(
+            concurrent.futures.as_completed(futures),
+            total=len(futures),
+            desc="Clipping tiles",
+            unit="tile",
+        ):
+            clipped[futures[future]] = future.result()
+
+    return warp.set_outputs(df, [clipped[key] for key in keys])
@@ -2,19 +2,22 @@ import concurrent.futures
 import logging
 from earth_data_kit.utilities import geo
 from earth_data_kit.utilities import helpers
+import earth_data_kit.stitching.executors as executors
 from tqdm import tqdm
 import pandas as pd
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Origin of the temporal bins of incremental discovers, so bins do not move with the start of the time bounds
+BIN_ORIGIN = pd.Timestamp("1970-01-01", tz="UTC")
+
 
 def get_tiles_metadata(gdal_paths, band_locator):
     # Concurrently fetch metadata and construct Tile objects
     tiles_md = []
 
-    with concurrent.futures.ThreadPoolExecutor(
-        max_workers=helpers.get_threadpool_workers()
-    ) as executor:
+    with executors.get_executor("thread") as executor:
         # Submit all tasks and store futures
         futures = [
             executor.submit(geo.get_metadata, gdal_path, band_locator)
@@ -34,21 +37,83 @@ def get_tiles_metadata(gdal_paths, band_locator):
     return tiles_md
 
 
-def aggregate_temporally(df, start, end, resolution):
-    # Create date range from start to end with specified resolution, ensuring UTC timezone
-    date_range = pd.date_range(start=start, end=end, freq=f"{resolution}", tz="UTC")
-    # Create a new column to store the aggregated dates
-    df["aggregated_date"] = None
+def get_bin_start(ts, offset, origin=BIN_ORIGIN):
+    """
+    Start of the time bin containing a timestamp, bins being anchored at an origin.
+
+    Fixed frequencies such as ``1D`` or ``3h`` are floored relative to the origin. Anchored
+    frequencies such as ``MS`` or ``W-MON`` start on the last anchor before the day of the timestamp,
+    multiples such as ``2MS`` counting anchors from the last one on or before the origin.
+
+    Args:
+        ts (pd.Timestamp): UTC timestamp
+        offset (pd.DateOffset): Frequency of the bins
+        origin (pd.Timestamp, optional): UTC timestamp the bins are anchored at. Defaults to 1970-01-01 UTC
+
+    Returns:
+        pd.Timestamp: Start of the bin containing ts, in UTC
+    """
+    try:
+        step = pd.Timedelta(offset.nanos, "ns")
+    except ValueError:
+        step = None
+    if step is not None:
+        return origin + ((ts - origin) // step) * step
+
+    base = offset.base
+    anchor = base.rollback(ts.normalize())
+    if offset.n == 1:
+        return anchor
+    steps = len(pd.date_range(base.rollback(origin.normalize()), anchor, freq=base)) - 1
+    return anchor - base * (steps % offset.n)
+
+
+def aggregate_temporally(df, start, end, resolution, origin=None):
+    """
+    Snap the dates of the rows to the start of their time bin.
+
+    Bins span one step of the resolution and are anchored at start by default, see
+    ``get_bin_start``. Incremental discovers anchor them at a fixed origin instead, ``BIN_ORIGIN``,
+    so runs over moving time bounds assign a date to the same bin as previous runs. The first bin
+    is the one containing start and the last one the one containing end, so rows between start and
+    the next anchor of anchored frequencies are kept. Rows are assigned to their bin with a single
+    binary search over the bin starts, and rows before start or after the last bin are dropped.
+
+    Args:
+        df (pd.DataFrame): Rows with a ``date`` column, naive dates are read as UTC
+        start (datetime): Start of the period
+        end (datetime): End of the period
+        resolution (str): Pandas frequency of the bins, eg: ``1D``, ``3h``, ``MS``
+        origin (pd.Timestamp, optional): UTC timestamp the bins are anchored at. Defaults to start
+
+    Returns:
+        pd.DataFrame: The rows within the bins, with their date replaced by the start of their bin
+    """
+    offset = pd.tseries.frequencies.to_offset(resolution)
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    start = start.tz_localize("UTC") if start.tz is None else start.tz_convert("UTC")
+    end = end.tz_localize("UTC") if end.tz is None else end.tz_convert("UTC")
+    bin_start = get_bin_start(start, offset, start if origin is None else origin)
+    bin_starts = pd.date_range(start=bin_start, end=end, freq=offset)
+    if len(bin_starts) == 0:
+        return df.iloc[0:0].copy()
 
-    # Iterate through each date in the range
-    for date in date_range:
-        # Find all rows where the date falls within this interval
-        mask = (df["date"] >= date) & (df["date"] < date + pd.Timedelta(resolution))
-        # Update the aggregated_date for matching rows
-        df.loc[mask, "aggregated_date"] = date
+    # Compared as naive UTC datetime64[ns], NaT sorting after every bin end
+    edges = bin_starts.append(pd.DatetimeIndex([bin_starts[-1] + offset]))
+    edges = edges.tz_localize(None).to_numpy(dtype="datetime64[ns]")
+    dates = (
+        pd.to_datetime(df["date"], utc=True, format="ISO8601")
+        .dt.tz_localize(None)
+        .to_numpy(dtype="datetime64[ns]")
+    )
 
-    # Replace the original date column with aggregated dates
-    df["date"] = df["aggregated_date"]
-    df = df.drop("aggregated_date", axis=1)
+    idx = np.searchsorted(edges, dates, side="right") - 1
+    in_range = (
+        (idx >= 0)
+        & (idx < len(bin_starts))
+        & (dates >= start.tz_localize(None).to_datetime64())
+    )
 
+    df = df[in_range].copy()
+    df["date"] = bin_starts[idx[in_range]]
     return df
@@ -0,0 +1,74 @@
+import os
+import sqlite3
+import contextlib
+
+
+@contextlib.contextmanager
+def connect(path, foreign_keys=False):
+    """
+    SQLite connection committing on success and closed on exit.
+
+    Databases are in WAL mode, so readers do not block the writer, and wait up to 30 seconds for
+    locks held by other processes.
+
+    Args:
+        path (str): Path of the database
+        foreign_keys (bool, optional): Enforce foreign keys, eg: ``ON DELETE CASCADE``. Defaults to False
+    """
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        if foreign_keys:
+            conn.execute("PRAGMA foreign_keys=ON")
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def create_lookup(conn, name, column, values):
+    """
+    Temporary table of distinct values to join with, instead of ``IN`` clauses over thousands of values.
+
+    Args:
+        conn (sqlite3.Connection): Connection the table lives in
+        name (str): Name of the table
+        column (str): Name of its column
+        values (list[str]): Values of the table
+    """
+    conn.execute(f"CREATE TEMP TABLE {name} ({column} TEXT PRIMARY KEY)")
+    conn.executemany(f"INSERT OR IGNORE INTO {name} VALUES (?)", [(v,) for v in values])
+
+
+class SharedCache:
+    """
+    Cache shared by all datasets of the process: the one set explicitly, otherwise one created on first use.
+
+    Creating it can be disabled with an environment variable set to NO, FALSE or 0.
+    """
+
+    def __init__(self, factory, env_var):
+        """
+        Args:
+            factory (callable): Creates the cache, configured from the environment
+            env_var (str): Environment variable enabling the cache, enabled if unset
+        """
+        self.factory = factory
+        self.env_var = env_var
+        self.cache = None
+
+    def set(self, cache):
+        """
+        Args:
+            cache: The cache, or None to go back to the one created from the environment
+        """
+        self.cache = cache
+
+    def get(self):
+        """The cache, None if it was not set and is disabled."""
+        if self.cache is not None:
+            return self.cache
+        if os.getenv(self.env_var, "YES").upper() in ["NO", "FALSE", "0"]:
+            return None
+        self.cache = self.factory()
+        return self.cache
@@ -85,11 +85,7 @@ class EarthEngine:
 
     def sync(self, df, tmp_base_dir, overwrite=False):
         # Iterate over the dataframe to get GDAL paths that need syncing
-        gdal_paths = []
-        for band_tile in df.itertuples():
-            gdal_paths.append(band_tile.tile.gdal_path)
-
-        gdal_paths = list(set(gdal_paths))
+        gdal_paths = df["gdal_path"].unique().tolist()
         helpers.make_sure_dir_exists(f"{tmp_base_dir}/raw-data")
         with concurrent.futures.ThreadPoolExecutor(
             max_workers=helpers.get_threadpool_workers()
@@ -110,10 +106,10 @@ class EarthEngine:
                 future.result()
 
         # Update gdal_path in dataframe with local paths
-        for band_tile in df.itertuples():
-            output_path = (
-                f"{tmp_base_dir}/raw-data/{band_tile.tile.gdal_path.split('/')[-1]}.tif"
-            )
-            df.at[band_tile.Index, "tile"].gdal_path = output_path
+        df["gdal_path"] = (
+            f"{tmp_base_dir}/raw-data/"
+            + df["gdal_path"].str.split("/").str[-1]
+            + ".tif"
+        )
 
         return df
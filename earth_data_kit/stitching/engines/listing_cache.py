@@ -0,0 +1,281 @@
+import os
+import time
+import logging
+import pandas as pd
+import earth_data_kit.utilities.helpers as helpers
+import earth_data_kit.stitching.engines.s3_listing as s3_listing
+import earth_data_kit.stitching.engines.db as db
+
+logger = logging.getLogger(__name__)
+
+# Seconds a listing stays valid, unless its period is old enough to be immutable
+DEFAULT_TTL = 24 * 3600
+# Listings of periods over for more than this many days when listed never expire, archives do not change
+DEFAULT_IMMUTABLE_AFTER_DAYS = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    search_path TEXT PRIMARY KEY,
+    prefix TEXT NOT NULL,
+    listed_at REAL NOT NULL,
+    immutable INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS listings_prefix ON listings (prefix);
+CREATE TABLE IF NOT EXISTS objects (
+    search_path TEXT NOT NULL REFERENCES listings (search_path) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    size INTEGER,
+    etag TEXT,
+    last_modified TEXT
+);
+CREATE INDEX IF NOT EXISTS objects_search_path ON objects (search_path);
+CREATE INDEX IF NOT EXISTS objects_key ON objects (key);
+"""
+
+
+class ListingCache:
+    """
+    On-disk cache of S3 listings, so repeated scans of the same periods do not list them again.
+
+    Every search path, a prefix and a glob pattern such as
+    ``s3://modis-pds/MCD43A4.006/19/04/2017001/*_B0?.TIF``, is stored with the key, size, ETag
+    and last modified date of its objects in a SQLite database.
+
+    A listing expires after a TTL, which can be set per prefix, the longest matching prefix
+    winning. A listing made when its period had ended more than ``immutable_after_days`` days before
+    never expires, so scans of historical periods only list the recent ones.
+
+    Example:
+        >>> import earth_data_kit as edk
+        >>> cache = edk.stitching.ListingCache(ttl=3600, prefix_ttls={"s3://noaa-goes16/": 300})
+        >>> edk.stitching.set_listing_cache(cache)
+        >>> # Reprocessed data, forget what was listed under a prefix
+        >>> cache.invalidate("s3://modis-pds/MCD43A4.006/")
+    """
+
+    def __init__(
+        self,
+        path=None,
+        ttl=DEFAULT_TTL,
+        immutable_after_days=DEFAULT_IMMUTABLE_AFTER_DAYS,
+        prefix_ttls=None,
+    ):
+        """
+        Args:
+            path (str, optional): Path of the SQLite database. Defaults to ``s3-listing-cache.sqlite``
+                in the EDK tmp directory, shared by all datasets
+            ttl (float, optional): Seconds a listing stays valid. Defaults to one day
+            immutable_after_days (float, optional): Listings of periods over for more than this many days
+                never expire. None to always apply the TTL. Defaults to 30
+            prefix_ttls (dict, optional): TTL in seconds of the search paths under a prefix, overriding ``ttl``
+        """
+        self.path = path or f"{helpers.get_tmp_dir()}/s3-listing-cache.sqlite"
+        self.ttl = ttl
+        self.immutable_after_days = immutable_after_days
+        self.prefix_ttls = dict(prefix_ttls or {})
+        with db.connect(self.path, foreign_keys=True) as conn:
+            conn.executescript(SCHEMA)
+
+    def get_ttl(self, search_path):
+        """TTL of a search path, from the longest matching prefix of ``prefix_ttls``."""
+        prefixes = [p for p in self.prefix_ttls if search_path.startswith(p)]
+        if not prefixes:
+            return self.ttl
+        return self.prefix_ttls[max(prefixes, key=len)]
+
+    def is_immutable(self, end, listed_at):
+        """Whether the period ending at ``end`` was over for long enough to be final when listed."""
+        if self.immutable_after_days is None or end is None or pd.isna(end):
+            return False
+        end = pd.Timestamp(end)
+        if end.tzinfo is None:
+            end = end.tz_localize("UTC")
+        return listed_at - end.timestamp() > self.immutable_after_days * 86400
+
+    def is_valid(self, search_path, listed_at, immutable, now):
+        """Whether a listing made at ``listed_at`` can still be used at ``now``."""
+        return bool(immutable) or now - listed_at < self.get_ttl(search_path)
+
+    def get(self, search_paths):
+        """
+        Objects of the search paths with a valid listing.
+
+        Args:
+            search_paths (list[str]): Search paths to look up
+
+        Returns:
+            dict: Objects of every valid search path, keyed by its index in ``search_paths``. Objects are
+                dictionaries with the key, size, etag and last_modified of the object
+        """
+        now = time.time()
+        indices = {}
+        for idx, search_path in enumerate(search_paths):
+            indices.setdefault(search_path, []).append(idx)
+
+        valid = {}
+        with db.connect(self.path, foreign_keys=True) as conn:
+            db.create_lookup(conn, "lookup", "search_path", indices)
+            listings = conn.execute(
+                "SELECT l.search_path, l.listed_at, l.immutable FROM listings l JOIN lookup USING (search_path)"
+            ).fetchall()
+            for search_path, listed_at, immutable in listings:
+                if self.is_valid(search_path, listed_at, immutable, now):
+                    valid[search_path] = []
+
+            objects = conn.execute(
+                "SELECT o.search_path, o.key, o.size, o.etag, o.last_modified FROM objects o JOIN lookup USING (search_path)"
+            ).fetchall()
+            for search_path, key, size, etag, last_modified in objects:
+                if search_path in valid:
+                    valid[search_path].append(
+                        {
+                            "key": key,
+                            "size": size,
+                            "etag": etag,
+                            "last_modified": last_modified,
+                        }
+                    )
+
+        return {
+            idx: valid[p] for p, idxs in indices.items() if p in valid for idx in idxs
+        }
+
+    def get_objects(self, keys):
+        """
+        Size and ETag of objects, from the most recent valid listing they appear in.
+
+        Expired listings are ignored, an object may have changed since, so objects only found in
+        them are left out, as objects never listed.
+
+        Args:
+            keys (list[str]): ``s3://`` keys of the objects
+
+        Returns:
+            dict: Key, size, etag and last_modified of the listed objects, keyed by their key
+        """
+        now = time.time()
+        objects = {}
+        with db.connect(self.path, foreign_keys=True) as conn:
+            db.create_lookup(conn, "key_lookup", "key", keys)
+            rows = conn.execute(
+                "SELECT o.key, o.size, o.etag, o.last_modified, l.search_path, l.listed_at, l.immutable "
+                "FROM objects o JOIN key_lookup USING (key) JOIN listings l USING (search_path) ORDER BY l.listed_at"
+            ).fetchall()
+        for key, size, etag, last_modified, search_path, listed_at, immutable in rows:
+            if not self.is_valid(search_path, listed_at, immutable, now):
+                continue
+            objects[key] = {
+                "key": key,
+                "size": size,
+                "etag": etag,
+                "last_modified": last_modified,
+            }
+        return objects
+
+    def put(self, listings):
+        """
+        Store complete listings, replacing the previous ones.
+
+        Args:
+            listings (list[tuple]): (search path, exclusive end of its period or None, objects) of every listing
+        """
+        now = time.time()
+        with db.connect(self.path, foreign_keys=True) as conn:
+            for search_path, end, objects in listings:
+                conn.execute(
+                    "DELETE FROM listings WHERE search_path = ?", (search_path,)
+                )
+                conn.execute(
+                    "INSERT INTO listings VALUES (?, ?, ?, ?)",
+                    (
+                        search_path,
+                        get_prefix(search_path),
+                        now,
+                        int(self.is_immutable(end, now)),
+                    ),
+                )
+                conn.executemany(
+                    "INSERT INTO objects VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (
+                            search_path,
+                            o["key"],
+                            o.get("size"),
+                            o.get("etag"),
+                            o.get("last_modified"),
+                        )
+                        for o in objects
+                    ],
+                )
+
+    def invalidate(self, prefix=None):
+        """
+        Forget the listings of the search paths under a prefix, so the next scans list them again.
+
+        Args:
+            prefix (str, optional): ``s3://bucket/prefix`` to invalidate. Defaults to None, invalidating everything
+
+        Returns:
+            int: Number of listings removed
+        """
+        with db.connect(self.path, foreign_keys=True) as conn:
+            if prefix is None:
+                removed = conn.execute("DELETE FROM listings").rowcount
+            else:
+                # Escaping LIKE wildcards, S3 keys often contain "_"
+                pattern = (
+                    prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                    + "%"
+                )
+                removed = conn.execute(
+                    "DELETE FROM listings WHERE search_path LIKE ? ESCAPE '\\'",
+                    (pattern,),
+                ).rowcount
+        logger.info(
+            f"Invalidated {removed} S3 listings under {prefix or 'all prefixes'}"
+        )
+        return removed
+
+
+def get_prefix(search_path):
+    """Literal part of a search path, before its first wildcard."""
+    positions = [
+        search_path.find(c) for c in s3_listing.WILDCARD_CHARS if c in search_path
+    ]
+    return search_path[: min(positions)] if positions else search_path
+
+
+def create_listing_cache():
+    """Listing cache configured by the ``EDK_S3_LISTING_CACHE_TTL`` and ``EDK_S3_IMMUTABLE_AFTER_DAYS`` environment variables."""
+    immutable_after_days = os.getenv("EDK_S3_IMMUTABLE_AFTER_DAYS")
+    return ListingCache(
+        ttl=float(os.getenv("EDK_S3_LISTING_CACHE_TTL", DEFAULT_TTL)),
+        immutable_after_days=(
+            float(immutable_after_days)
+            if immutable_after_days
+            else DEFAULT_IMMUTABLE_AFTER_DAYS
+        ),
+    )
+
+
+# Cache set by set_listing_cache(), otherwise created from the environment
+_cache = db.SharedCache(create_listing_cache, "EDK_S3_LISTING_CACHE")
+
+
+def set_listing_cache(cache):
+    """
+    Cache used by ``S3.scan``.
+
+    Args:
+        cache (ListingCache): The cache, or None to go back to the default one
+    """
+    _cache.set(cache)
+
+
+def get_listing_cache():
+    """
+    Cache used by ``S3.scan``: the one set by ``set_listing_cache()``, otherwise one configured by the
+    ``EDK_S3_LISTING_CACHE`` (YES/NO), ``EDK_S3_LISTING_CACHE_TTL`` (seconds) and
+    ``EDK_S3_IMMUTABLE_AFTER_DAYS`` environment variables. None if the cache is disabled.
+    """
+    return _cache.get()
@@ -0,0 +1,326 @@
+import re
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# strftime directives with optional flags, eg: %Y, %-m, %_d, %:z. '%%' is a literal percent
+TOKEN_RE = re.compile(r"%(?:%|[:]?[-_0^#]?[A-Za-z])")
+# Spatial variables, filled from the grid dataframe, eg: {h}
+VARIABLE_RE = re.compile(r"{[^}]*}")
+WILDCARD_CHARS = "*?"
+
+# Time units a search path can be expanded at, from the finest, with the directives implying them
+UNITS = {
+    "minute": {"%M", "%S", "%f", "%X", "%c"},
+    "hour": {"%H", "%I", "%p"},
+    "day": {"%d", "%e", "%j", "%a", "%A", "%w", "%U", "%W", "%V", "%u", "%x"},
+    "month": {"%m", "%b", "%B"},
+    "year": {"%Y", "%y", "%G"},
+}
+FREQUENCIES = {"minute": "min", "hour": "h", "day": "D", "month": "MS", "year": "YS"}
+
+# Regex of the directives matched in keys: (group name, pattern), keyed by directive with its flag
+DIRECTIVE_PATTERNS = {
+    "%Y": ("year", r"\d{4}"),
+    "%G": ("year", r"\d{4}"),
+    "%y": ("year_2", r"\d{2}"),
+    "%m": ("month", r"\d{2}"),
+    "%-m": ("month", r"\d{1,2}"),
+    "%b": ("month_name", r"[A-Za-z]{3}"),
+    "%B": ("month_name", r"[A-Za-z]+"),
+    "%d": ("day", r"\d{2}"),
+    "%-d": ("day", r"\d{1,2}"),
+    "%j": ("day_of_year", r"\d{3}"),
+    "%-j": ("day_of_year", r"\d{1,3}"),
+    "%H": ("hour", r"\d{2}"),
+    "%-H": ("hour", r"\d{1,2}"),
+    "%M": ("minute", r"\d{2}"),
+    "%-M": ("minute", r"\d{1,2}"),
+    "%S": ("second", r"\d{2}"),
+    "%-S": ("second", r"\d{1,2}"),
+}
+MONTH_ABBREVIATIONS = {
+    name: i + 1
+    for i, name in enumerate(
+        [
+            "jan",
+            "feb",
+            "mar",
+            "apr",
+            "may",
+            "jun",
+            "jul",
+            "aug",
+            "sep",
+            "oct",
+            "nov",
+            "dec",
+        ]
+    )
+}
+
+
+def normalize_token(token):
+    """Directive letter without its flags, eg: '%-d' -> '%d', '%:z' -> '%z'."""
+    return "%" + token[-1]
+
+
+def smallest_unit(template):
+    """
+    Finest time unit implied by the directives of a template.
+
+    Args:
+        template (str): Path template with strftime directives
+
+    Returns:
+        str: ``minute``, ``hour``, ``day``, ``month`` or ``year``, None if the template has no time directive
+    """
+    tokens = {normalize_token(t) for t in TOKEN_RE.findall(template) if t != "%%"}
+    for unit, unit_tokens in UNITS.items():
+        if tokens & unit_tokens:
+            return unit
+    return None
+
+
+def align_start(ts, unit):
+    """Start of the unit containing ``ts``."""
+    if unit == "month":
+        return ts.normalize().replace(day=1)
+    if unit == "year":
+        return ts.normalize().replace(month=1, day=1)
+    return ts.floor(FREQUENCIES[unit])
+
+
+def align_end(ts, unit):
+    """
+    Align the end timestamp up to the next boundary of the unit, unless already on one.
+    Example: 2023-06-01 12:34:56 with unit='hour' -> 2023-06-01 13:00:00
+    """
+    start = align_start(ts, unit)
+    if start == ts:
+        return ts
+    return start + pd.tseries.frequencies.to_offset(FREQUENCIES[unit])
+
+
+def split_template(template):
+    """
+    Split a template at its first wildcard.
+
+    Returns:
+        tuple: (listable prefix, remainder). Directives of the prefix select what is listed, directives
+            of the remainder are only matched in keys, see ``template_to_regex``
+    """
+    positions = [template.find(c) for c in WILDCARD_CHARS if c in template]
+    if not positions:
+        return template, ""
+    return template[: min(positions)], template[min(positions) :]
+
+
+def template_to_regex(template):
+    """
+    Compile a path template into a regex matching its keys.
+
+    Time directives become named groups, a directive repeated with the same flags must match the
+    same value, eg: the year of ``%Y/%j/*_s%Y%j*.nc``. ``*`` matches any characters, including
+    "/" like s5cmd, ``?`` a single character and spatial variables a single path part.
+
+    Args:
+        template (str): Path template, eg: ``s3://noaa-goes16/ABI-L1b-RadC/%Y/%j/%H/*_s%Y%j%H%M*.nc``
+
+    Returns:
+        re.Pattern: Anchored regex, with named groups among year, year_2, month, month_name, day,
+            day_of_year, hour, minute and second
+    """
+    parts = []
+    seen = {}
+    pos = 0
+    tokens = re.compile(
+        rf"{TOKEN_RE.pattern}|{VARIABLE_RE.pattern}|[{re.escape(WILDCARD_CHARS)}]"
+    )
+    for m in tokens.finditer(template):
+        parts.append(re.escape(template[pos : m.start()]))
+        pos = m.end()
+        token = m.group(0)
+        if token == "*":
+            parts.append(".*")
+        elif token == "?":
+            parts.append(".")
+        elif token == "%%":
+            parts.append("%")
+        elif token.startswith("{"):
+            parts.append("[^/]+")
+        else:
+            # Keeping only the '-' flag, which changes the width of the value
+            key = "%-" + token[-1] if "-" in token else normalize_token(token)
+            if key not in DIRECTIVE_PATTERNS:
+                logger.debug(
+                    f"Directive {token} is not parsed from keys, matching any characters"
+                )
+                parts.append(".*?")
+                continue
+            name, pattern = DIRECTIVE_PATTERNS[key]
+            if name not in seen:
+                seen[name] = key
+                parts.append(f"(?P<{name}>{pattern})")
+            elif seen[name] == key:
+                parts.append(f"(?P={name})")
+            else:
+                parts.append(f"(?:{pattern})")
+    parts.append(re.escape(template[pos:]))
+    return re.compile(r"(?s)\A" + "".join(parts) + r"\Z")
+
+
+def plan_search_paths(template, start, end):
+    """
+    Smallest set of distinct search paths listing the keys of a template over a period.
+
+    Only the directives before the first wildcard can narrow down a listing, so the template is
+    expanded at the finest unit of those directives, not of the whole template. Directives after
+    the wildcard are replaced by wildcards, keys are matched against the full template with
+    ``template_to_regex`` once listed. A GOES template like ``%Y/%j/%H/*_s%Y%j%H%M*.nc`` over a month
+    gives ~720 hourly search paths instead of ~43k minute ones.
+
+    Args:
+        template (str): Path template with strftime directives, wildcards and spatial variables
+        start (datetime): Start of the period
+        end (datetime): End of the period
+
+    Returns:
+        pd.DataFrame: date and end (start and exclusive end of the period of the search path, None
+            without time directives) and search_path columns, one row per distinct search path
+    """
+    prefix, remainder = split_template(template)
+    # '%%' stays a literal percent once formatted, other directives become wildcards
+    remainder = TOKEN_RE.sub(lambda m: "%" if m.group(0) == "%%" else "*", remainder)
+    remainder = re.sub(r"\*+", "*", remainder)
+
+    unit = smallest_unit(prefix)
+    if unit is None:
+        return pd.DataFrame(
+            {
+                "date": [None],
+                "end": [None],
+                "search_path": [pd.Timestamp(start).strftime(prefix) + remainder],
+            }
+        )
+
+    dates = pd.date_range(
+        start=align_start(pd.to_datetime(start), unit),
+        end=align_end(pd.to_datetime(end), unit),
+        freq=FREQUENCIES[unit],
+        inclusive="left",
+    )
+    df = pd.DataFrame(
+        {
+            "date": dates,
+            "end": dates + pd.tseries.frequencies.to_offset(FREQUENCIES[unit]),
+        }
+    )
+    df["search_path"] = df["date"].dt.strftime(prefix) + remainder
+    # A search path repeated over several periods covers all of them
+    df = (
+        df.groupby("search_path", sort=False)
+        .agg(date=("date", "min"), end=("end", "max"))
+        .reset_index()[["date", "end", "search_path"]]
+    )
+    logger.info(f"Planned {len(df)} search paths at the {unit} level")
+    return df
+
+
+def extract_dates(keys, template, regex=None):
+    """
+    Dates of keys, parsed with the regex of their template.
+
+    The template is compiled once and applied to all keys with a vectorized extraction, datetimes are
+    then built column wise. Missing components default to 1970-01-01 00:00:00, ``%j`` counts days from
+    the start of the year.
+
+    Args:
+        keys (list[str] | pd.Series): Keys, eg: ``s3://noaa-goes16/ABI-L1b-RadC/2023/001/00/OR_..._s20230010001174_...nc``
+        template (str): Path template of the keys
+        regex (re.Pattern, optional): Compiled template, see ``template_to_regex``. Defaults to compiling ``template``
+
+    Returns:
+        pd.Series: Naive datetimes aligned with the keys, NaT for keys not matching the template or with
+            an invalid date
+    """
+    keys = pd.Series(keys, dtype=object)
+    regex = regex or template_to_regex(template)
+    dates = pd.Series(pd.NaT, index=keys.index, dtype="datetime64[ns]")
+    if keys.empty:
+        return dates
+
+    # Flags are inline in the pattern, pandas compiles it again
+    if regex.groups == 0:
+        # Template without parsed directives, keys matching it get the default date
+        dates[keys.str.match(regex.pattern)] = pd.Timestamp(1970, 1, 1)
+        return dates
+
+    parts = keys.str.extract(regex.pattern)
+    parts = parts[parts.iloc[:, 0].notna()]
+
+    def component(name, default):
+        if name in parts:
+            return pd.to_numeric(parts[name])
+        return pd.Series(default, index=parts.index)
+
+    year = component("year", 1970)
+    if "year" not in parts and "year_2" in parts:
+        # Same pivot as strptime, 69-99 are in the 1900s
+        year = component("year_2", 0)
+        year = year + np.where(year < 69, 2000, 1900)
+    month = component("month", 1)
+    if "month" not in parts and "month_name" in parts:
+        month = parts["month_name"].str[:3].str.lower().map(MONTH_ABBREVIATIONS)
+
+    components = pd.DataFrame(
+        {
+            "year": year,
+            "month": month,
+            "day": component("day", 1),
+            "hour": component("hour", 0),
+            "minute": component("minute", 0),
+            "second": component("second", 0),
+        }
+    )
+    if "day_of_year" in parts:
+        components["month"], components["day"] = 1, 1
+        parsed = pd.to_datetime(components, errors="coerce") + pd.to_timedelta(
+            component("day_of_year", 1) - 1, unit="D"
+        )
+    else:
+        parsed = pd.to_datetime(components, errors="coerce")
+
+    dates[parsed.index] = parsed
+    return dates
+
+
+def in_period(dates, template, start, end):
+    """
+    Whether dates parsed from keys fall in a period.
+
+    The start is aligned down to the finest unit of the template, so a daily key stays in a period
+    starting during its day. The end is exclusive, like the search paths of ``plan_search_paths``.
+
+    Args:
+        dates (pd.Series): Naive UTC dates, see ``extract_dates``
+        template (str): Path template of the keys
+        start (datetime): Start of the period
+        end (datetime): End of the period
+
+    Returns:
+        pd.Series: Boolean mask aligned with ``dates``
+    """
+    unit = smallest_unit(template)
+    if unit is None:
+        return pd.Series(True, index=dates.index)
+
+    def to_naive_utc(ts):
+        ts = pd.Timestamp(ts)
+        return ts.tz_convert("UTC").tz_localize(None) if ts.tzinfo is not None else ts
+
+    return (dates >= align_start(to_naive_utc(start), unit)) & (
+        dates < to_naive_utc(end)
+    )
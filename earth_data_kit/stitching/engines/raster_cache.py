@@ -0,0 +1,246 @@
+import os
+import time
+import uuid
+import fcntl
+import shutil
+import hashlib
+import logging
+import contextlib
+import earth_data_kit.utilities.helpers as helpers
+import earth_data_kit.stitching.engines.db as db
+
+logger = logging.getLogger(__name__)
+
+# Bytes kept in the cache before the least recently used objects are evicted
+DEFAULT_MAX_BYTES = 100 * 1024**3
+# ioctl cloning a file on copy-on-write filesystems, eg: btrfs, XFS
+FICLONE = 0x40049409
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    digest TEXT PRIMARY KEY,
+    uri TEXT NOT NULL,
+    etag TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    added_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS objects_last_used ON objects (last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def get_digest(uri, etag):
+    """Content address of an object, the same URI and ETag always holding the same bytes."""
+    return hashlib.sha256(f"{uri}\n{etag}".encode("utf-8")).hexdigest()
+
+
+def link_or_copy(src, dst):
+    """
+    Materialize a file at another path without copying it when possible.
+
+    Tries a hard link, then a reflink, and copies the file as a last resort, eg: across filesystems.
+    ``dst`` is replaced atomically.
+    """
+    helpers.make_sure_dir_exists(os.path.dirname(dst))
+    tmp_path = f"{dst}.{uuid.uuid4()}.tmp"
+    try:
+        os.link(src, tmp_path)
+    except OSError:
+        try:
+            with open(src, "rb") as s, open(tmp_path, "wb") as d:
+                fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        except OSError:
+            shutil.copyfile(src, tmp_path)
+    os.replace(tmp_path, dst)
+
+
+class RasterCache:
+    """
+    Content addressed cache of synced objects, shared by all datasets.
+
+    Objects are stored once under ``sha256(uri + etag)`` and linked into the workspace of every
+    dataset syncing them, with hard links, reflinks or copies as a fallback, so datasets syncing the
+    same objects, or a dataset recreated under another name or after ``clean=True``, do not download
+    them again. A new ETag is a new address, changed objects are never served stale.
+
+    The cache is capped in bytes, the least recently used objects being evicted first. Processes
+    sharing the cache hold a file lock while adding, linking or evicting objects.
+
+    Example:
+        >>> import earth_data_kit as edk
+        >>> cache = edk.stitching.RasterCache(max_bytes=500 * 1024**3)
+        >>> edk.stitching.set_raster_cache(cache)
+        >>> cache.stats()
+        {'objects': 1520, 'size_bytes': 171798691840, 'max_bytes': 536870912000, 'hits': 3040, 'misses': 1520, 'bytes_saved': 343597383680, 'evictions': 0}
+    """
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            path (str, optional): Directory of the cache. Defaults to ``raster-cache`` in the EDK tmp directory
+            max_bytes (int, optional): Size of the cache in bytes before evicting objects. Defaults to 100 GiB
+        """
+        self.path = path or f"{helpers.get_tmp_dir()}/raster-cache"
+        self.db_path = f"{self.path}/index.sqlite"
+        self.max_bytes = max_bytes
+        helpers.make_sure_dir_exists(f"{self.path}/objects")
+        with self.__lock__(), db.connect(self.db_path) as conn:
+            conn.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def __lock__(self, shared=False):
+        """File lock of the cache, shared while linking objects out, exclusive while adding or evicting them."""
+        with open(f"{self.path}/.lock", "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def __object_path__(self, digest):
+        return f"{self.path}/objects/{digest[:2]}/{digest}"
+
+    def __count__(self, conn, **counters):
+        conn.executemany(
+            "INSERT INTO counters VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+            list(counters.items()),
+        )
+
+    def get(self, uri, etag, local_path):
+        """
+        Materialize a cached object at a local path.
+
+        Args:
+            uri (str): ``s3://`` key of the object
+            etag (str): Current ETag of the object, checked against S3, eg: by an unexpired listing or a
+                ``HeadObject`` request. An outdated ETag would link the bytes of the previous version
+            local_path (str): Path to materialize the object at
+
+        Returns:
+            bool: True if the object was cached and is now at local_path, False otherwise
+        """
+        digest = get_digest(uri, etag)
+        with self.__lock__(shared=True):
+            with db.connect(self.db_path) as conn:
+                row = conn.execute(
+                    "SELECT size FROM objects WHERE digest = ?", (digest,)
+                ).fetchone()
+            hit = row is not None and os.path.exists(self.__object_path__(digest))
+            if hit:
+                link_or_copy(self.__object_path__(digest), local_path)
+
+        with db.connect(self.db_path) as conn:
+            if hit:
+                conn.execute(
+                    "UPDATE objects SET last_used = ? WHERE digest = ?",
+                    (time.time(), digest),
+                )
+                self.__count__(conn, hits=1, bytes_saved=row[0])
+            else:
+                self.__count__(conn, misses=1)
+        return hit
+
+    def put(self, uri, etag, local_path):
+        """
+        Add a synced object to the cache, linking its local file in, then evict objects over the size cap.
+
+        Args:
+            uri (str): ``s3://`` key of the object
+            etag (str): ETag the object was downloaded with
+            local_path (str): Path of the downloaded object
+        """
+        digest = get_digest(uri, etag)
+        size = os.path.getsize(local_path)
+        now = time.time()
+        with self.__lock__():
+            link_or_copy(local_path, self.__object_path__(digest))
+            with db.connect(self.db_path) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?)",
+                    (digest, uri, etag, size, now, now),
+                )
+            self.__evict__()
+
+    def __evict__(self):
+        """Remove the least recently used objects until the cache fits in max_bytes. Called holding the lock."""
+        if self.max_bytes is None:
+            return
+        with db.connect(self.db_path) as conn:
+            (total,) = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM objects"
+            ).fetchone()
+            evicted = []
+            for digest, size in conn.execute(
+                "SELECT digest, size FROM objects ORDER BY last_used"
+            ):
+                if total <= self.max_bytes:
+                    break
+                evicted.append(digest)
+                total -= size
+            conn.executemany(
+                "DELETE FROM objects WHERE digest = ?", [(d,) for d in evicted]
+            )
+            self.__count__(conn, evictions=len(evicted))
+        # Workspaces linking an evicted object keep their copy
+        for digest in evicted:
+            helpers.remove_file_if_exists(self.__object_path__(digest))
+        if evicted:
+            logger.info(f"Evicted {len(evicted)} objects from the raster cache")
+
+    def stats(self):
+        """
+        Usage of the cache.
+
+        Returns:
+            dict: Number of objects, their size in bytes, the size cap, hits, misses, bytes not
+                downloaded thanks to the cache and evictions
+        """
+        with db.connect(self.db_path) as conn:
+            objects, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM objects"
+            ).fetchone()
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        return {
+            "objects": objects,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+            "bytes_saved": counters.get("bytes_saved", 0),
+            "evictions": counters.get("evictions", 0),
+        }
+
+
+def create_raster_cache():
+    """Raster cache configured by the ``EDK_RASTER_CACHE_DIR`` and ``EDK_RASTER_CACHE_MAX_BYTES`` environment variables."""
+    return RasterCache(
+        path=os.getenv("EDK_RASTER_CACHE_DIR"),
+        max_bytes=int(os.getenv("EDK_RASTER_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+    )
+
+
+# Cache set by set_raster_cache(), otherwise created from the environment
+_cache = db.SharedCache(create_raster_cache, "EDK_RASTER_CACHE")
+
+
+def set_raster_cache(cache):
+    """
+    Cache used by ``S3.sync``.
+
+    Args:
+        cache (RasterCache): The cache, or None to go back to the default one
+    """
+    _cache.set(cache)
+
+
+def get_raster_cache():
+    """
+    Cache used by ``S3.sync``: the one set by ``set_raster_cache()``, otherwise one configured by the
+    ``EDK_RASTER_CACHE`` (YES/NO), ``EDK_RASTER_CACHE_DIR`` and ``EDK_RASTER_CACHE_MAX_BYTES``
+    environment variables. None if the cache is disabled.
+    """
+    return _cache.get()
@@ -1,13 +1,16 @@
 import os
-import datetime
-from urllib.parse import urlparse
-from osgeo import gdal
+import json
+import subprocess
 import pandas as pd
 import logging
 import earth_data_kit.utilities.helpers as helpers
-import re
+import earth_data_kit.stitching.engines.s3_listing as s3_listing
+import earth_data_kit.stitching.engines.listing_cache as listing_cache
+import earth_data_kit.stitching.engines.planner as planner
+import earth_data_kit.stitching.engines.sync_manifest as sync_manifest
+import earth_data_kit.stitching.engines.raster_cache as raster_cache
 import shapely
-import copy
+import numpy as np
 import earth_data_kit as edk
 
 logger = logging.getLogger(__name__)
@@ -35,6 +38,7 @@ class S3:
             self.profile_flag = f"--profile {profile_env}"
         else:
             self.profile_flag = ""
+        self.profile = profile_env or None
 
     def _expand_time(self, df, source, time_opts):
         if isinstance(source, list):
@@ -51,174 +55,65 @@ class S3:
             )
             return df
 
-        start = time_opts["start"]
-        end = time_opts["end"]
-
-        def _extract_tokens(template: str):
-            """Return normalized tokens like '%Y', '%m', '%d', '%H', '%M', ..."""
-            # Match %-directives with optional padding/flags:
-            #  - Flags: -, _, 0, ^, # (common across platforms), and optional ':' (for %:z)
-            #  - Directive letter: [A-Za-z]
-            #  - '%%' is a literal percent, we'll skip it later
-            _TOKEN_RE = re.compile(r"%(?:%|[:]?[-_0^#]?[A-Za-z])")
-            tokens = []
-            for m in _TOKEN_RE.finditer(template):
-                t = m.group(0)
-                if t == "%%":
-                    continue  # literal '%'
-                # Normalize: strip optional leading ':' and flag chars, keep the letter.
-                # Examples: '%-d' -> '%d', '%_m' -> '%m', '%#H' -> '%H', '%:z' -> '%z'
-                letter = t[-1]
-                tokens.append("%" + letter)
-            return tokens
-
-        def smallest_unit(template: str) -> str:
-            """
-            Return the smallest granularity implied by the template,
-            capped at: 'minute' > 'hour' > 'day' > 'year'.
-            """
-            tset = set(_extract_tokens(template))
-            if not tset:
-                raise ValueError("No recognized strftime directives in template.")
-
-            # Tokens that imply at least MINUTE (we cap seconds/micros/time to minute)
-            minute_like = {
-                "%M",
-                "%S",
-                "%f",
-                "%X",
-                "%c",
-            }  # %c usually includes time; cap to minute
-            # Tokens that imply HOUR (12/24h)
-            hour_like = {"%H", "%I", "%p"}
-            # Tokens that imply at least DAY (weekday/day/month/week-of-year/date/ISO-weekday)
-            day_like = {
-                "%d",
-                "%e",
-                "%j",
-                "%a",
-                "%A",
-                "%w",
-                "%m",
-                "%b",
-                "%B",
-                "%U",
-                "%W",
-                "%V",
-                "%u",
-                "%x",  # locale date
-            }
-            # Tokens that are YEAR-level only
-            year_like = {"%Y", "%y", "%G"}  # include ISO year
-
-            # Timezone tokens (do not affect stepping granularity)
-            tz_like = {"%z", "%Z"}  # (%:z normalizes to %z above)
-
-            # If any minute-or-finer token appears, choose 'minute'
-            if tset & minute_like:
-                return "minute"
-            # Else if any hour token appears, choose 'hour'
-            if tset & hour_like:
-                return "hour"
-            # Else if any day-ish token appears, choose 'day'
-            if tset & day_like:
-                return "day"
-            # Else if only year-ish tokens appear, choose 'year'
-            if (tset - tz_like) <= year_like and (tset - tz_like):
-                return "year"
-
-            # Fallbacks:
-            if tset & year_like:
-                return "year"
-            raise ValueError(
-                "Template has directives, but none that imply granularity up to minute/year."
-            )
-
-        # --- expansion with pandas date_range ---
-        def _align_start(ts: pd.Timestamp, unit: str) -> pd.Timestamp:
-            if unit == "minute":
-                return ts.floor("min")
-            if unit == "hour":
-                return ts.floor("h")
-            if unit == "day":
-                return ts.floor("D")
-            # year: align to Jan 1 00:00:00 (start-of-year)
-            return pd.Timestamp(year=ts.year, month=1, day=1, tz=ts.tz).floor("D")  # type: ignore
-
-        def _align_end(ts: pd.Timestamp, unit: str) -> pd.Timestamp:
-            """
-            Align the end timestamp up to the next boundary of the unit.
-            Example:
-            2023-06-01 12:34:56 with unit='hour' → 2023-06-01 13:00:00
-            """
-            if unit == "minute":
-                return ts.ceil("min")
-            if unit == "hour":
-                return ts.ceil("h")
-            if unit == "day":
-                return ts.ceil("D")
-            if unit == "year":
-                return ts.ceil("Y")
-            raise ValueError(f"Unsupported unit: {unit}")
-
-        def _freq_for(unit: str) -> str:
-            # YS = Year-Start (Jan 1). T = minute
-            return {"minute": "min", "hour": "h", "day": "D", "year": "YS"}[unit]
-
-        s = pd.to_datetime(start)
-        e = pd.to_datetime(end)
-
-        unit = smallest_unit(source)
-        s = _align_start(s, unit)
-        e = _align_end(e, unit)
-
-        rng = pd.date_range(
-            start=s, end=e, freq=_freq_for(unit), inclusive="left"
-        )  # inclusive on left; includes end if aligned
-
-        df["date"] = rng
-        df["search_path"] = df["date"].dt.strftime(source)
-        return df
+        # One search path per distinct listable prefix, keys are matched against the full template in scan
+        return planner.plan_search_paths(source, time_opts["start"], time_opts["end"])
 
     def _expand_space(self, df, source, space_opts):
         if isinstance(source, list):
             # If source is a list, we don't need to expand space as user has provided direct path to multiple files
             return df
-        matches = re.findall(r"({.[^}]*})", source)
-        space_vars = []
-        for m in matches:
-            space_vars.append(m.replace("{", "").replace("}", ""))
+        space_vars = [m[1:-1] for m in planner.VARIABLE_RE.findall(source)]
 
         if len(space_vars) == 0:
             # No space variables found, return df unchanged
             return df
 
-        if len(space_vars) > 0 and "grid_dataframe" not in space_opts:
+        grid_df = space_opts.get("grid_dataframe")
+        if grid_df is None:
             raise Exception("Spatial variables found but no grid_dataframe provided")
 
-        grid_df = space_opts["grid_dataframe"]
-
         for var in space_vars:
             if var not in grid_df.columns:
                 raise Exception(f"Spatial variable {var} not found in grid_dataframe")
 
-        bbox = shapely.geometry.box(*space_opts["bbox"], ccw=True)  # type: ignore
-
-        grid_df = grid_df[grid_df.intersects(bbox)]
-
-        new_patterns = []
-        for path in df.itertuples():
-            for _, grid in grid_df.iterrows():
-                tmp_p = copy.copy(path.search_path)
-                for var in space_vars:
-                    tmp_p = tmp_p.replace("{" + var + "}", grid[var])
-                new_patterns.append([path.date, tmp_p])
+        # Grid cells intersecting the area of interest, through a spatial index over the grid
+        aoi = space_opts.get("aoi")
+        if aoi is None:
+            aoi = shapely.geometry.box(*space_opts["bbox"], ccw=True)  # type: ignore
+        tree = shapely.STRtree(grid_df.geometry.values)
+        cells = grid_df.iloc[np.sort(tree.query(aoi, predicate="intersects"))]
+
+        if df.empty:
+            # Spatial only template, without time expansion
+            df = pd.DataFrame({"date": [None], "end": [None], "search_path": [source]})
+
+        # Cross join of the time patterns and the grid cells, every pattern being split around its
+        # variables so the substitution is a few array concatenations
+        parts = df["search_path"].str.split(
+            planner.VARIABLE_RE.pattern, regex=True, expand=True
+        )
+        n_cells = len(cells)
+        search_paths = np.repeat(parts[0].to_numpy(dtype=object), n_cells)
+        for i, var in enumerate(space_vars):
+            values = cells[var].astype(str).to_numpy(dtype=object)
+            search_paths = (
+                search_paths
+                + np.tile(values, len(df))
+                + np.repeat(parts[i + 1].to_numpy(dtype=object), n_cells)
+            )
 
         new_patterns_df = pd.DataFrame(
-            new_patterns, columns=pd.Index(["date", "search_path"])
+            {
+                **{
+                    c: np.repeat(df[c].to_numpy(), n_cells)
+                    for c in df.columns
+                    if c != "search_path"
+                },
+                "search_path": search_paths,
+            }
         )
 
-        return new_patterns_df
+        return new_patterns_df.drop_duplicates("search_path").reset_index(drop=True)
 
     def get_patterns(self, source, time_opts, space_opts):
         patterns_df = pd.DataFrame()
@@ -239,135 +134,254 @@ class S3:
 
         return patterns_df
 
-    # TODO: Use s5cmd run commands.txt as its much faster than ThreadPoolExecutor.
-    # TODO: Also add functionality to do search based on year but
-    # date creation based on the full wildcard pattern supplied by the user. We might have to filter the paths later
     def scan(self, source, time_opts, space_opts, tmp_base_dir, band_locator):
         patterns_df = self.get_patterns(source, time_opts, space_opts)
-        if "date" not in patterns_df.columns:
-            patterns_df["date"] = None
+        for column in ["date", "end"]:
+            if column not in patterns_df.columns:
+                patterns_df[column] = None
+
+        lister = s3_listing.get_lister_name()
+        logger.info(f"Listing {len(patterns_df)} search paths with the {lister} lister")
+        if lister == "native":
+            pages = self.__list_native__(
+                patterns_df["search_path"].tolist(), patterns_df["end"].tolist()
+            )
+        else:
+            pages = [self.__list_s5cmd__(patterns_df["search_path"], tmp_base_dir)]
+
+        # Rows are built page by page, while the native lister keeps listing in its own thread
+        dfs = [
+            self.__get_rows__(keys, source, time_opts)
+            for keys in pages
+            if len(keys) > 0
+        ]
+        if not dfs:
+            return self.__get_rows__([], source, time_opts)
+        df = pd.concat(dfs, ignore_index=True)
+        logger.info(f"{len(df)} listed keys match {source}")
+        return df
 
-        s = "ls " + patterns_df["search_path"]
+    def __get_rows__(self, keys, source, time_opts):
+        """Catalog rows of listed keys, keys not matching the source or outside the time bounds being dropped."""
+        keys = pd.Series(keys, dtype=object)
+        if isinstance(source, list):
+            dates = pd.Series(
+                pd.Timestamp(1970, 1, 1), index=keys.index, dtype="datetime64[ns]"
+            )
+        else:
+            # Search paths are coarser than the template, eg: hourly prefixes of minute level keys,
+            # keys not matching the full template get no date and are dropped
+            dates = planner.extract_dates(keys, source)
+            keep = dates.notna()
+            if (
+                time_opts
+                and time_opts.get("start") is not None
+                and time_opts.get("end") is not None
+            ):
+                keep &= planner.in_period(
+                    dates, source, time_opts["start"], time_opts["end"]
+                )
+            keys, dates = keys[keep], dates[keep]
+
+        return pd.DataFrame(
+            {
+                "engine_path": keys,
+                "gdal_path": keys.str.replace("s3://", "/vsis3/", regex=False),
+                "tile_name": keys.str.split("/").str[-1],
+                "date": dates.dt.tz_localize("UTC"),
+            }
+        ).reset_index(drop=True)
+
+    def __list_native__(self, search_paths, ends):
+        """
+        Pages of keys matching the search paths, listed in process, see ``s3_listing.S3Lister``.
+
+        Search paths with a valid listing in the listing cache are not listed again, the others
+        are stored in the cache once listed, see ``listing_cache.ListingCache``.
+        """
+        cache = listing_cache.get_listing_cache()
+        to_list = list(range(len(search_paths)))
+        if cache is not None:
+            cached = cache.get(search_paths)
+            logger.info(
+                f"{len(cached)} of {len(search_paths)} search paths found in the listing cache"
+            )
+            for objects in cached.values():
+                yield [obj["key"] for obj in objects]
+            to_list = [idx for idx in to_list if idx not in cached]
+
+        lister = s3_listing.S3Lister(
+            no_sign_request=bool(self.no_sign_flag),
+            request_payer=bool(self.request_payer_flag),
+            profile=self.profile,
+        )
+        listed = {idx: [] for idx in to_list}
+        for i, objects in lister.iter_objects([search_paths[idx] for idx in to_list]):
+            listed[to_list[i]].extend(objects)
+            yield [obj["key"] for obj in objects]
+
+        # Only complete listings are cached, an error above leaves the cache untouched
+        if cache is not None and listed:
+            cache.put(
+                [
+                    (search_paths[idx], ends[idx], objects)
+                    for idx, objects in listed.items()
+                ]
+            )
+
+    def __list_s5cmd__(self, search_paths, tmp_base_dir):
+        """Keys matching the search paths, listed by running ``s5cmd ls`` for every path."""
+        s = "ls " + search_paths
         s.to_csv(f"{tmp_base_dir}/commands.txt", index=False, header=False)
 
         # Running s5cmd and outputting everything to output.json
-        os.system(
-            f"{edk.S5CMD_PATH} {self.no_sign_flag} {self.request_payer_flag} {self.profile_flag} --json run {tmp_base_dir}/commands.txt > {tmp_base_dir}/output.json"
+        result = subprocess.run(
+            f"{edk.S5CMD_PATH} {self.no_sign_flag} {self.request_payer_flag} {self.profile_flag} --json run {tmp_base_dir}/commands.txt > {tmp_base_dir}/output.json",
+            shell=True,
+            stderr=subprocess.PIPE,
+            text=True,
         )
+        # Paths matching nothing are expected when expanding dates, other errors are reported
+        errors = []
+        for line in result.stderr.splitlines():
+            try:
+                error = json.loads(line).get("error", line)
+            except ValueError:
+                error = line
+            if "no object found" not in error:
+                errors.append(error)
+        for error in errors:
+            logger.error(f"s5cmd ls failed: {error}")
 
         # Reading output.json
+        if os.path.getsize(f"{tmp_base_dir}/output.json") == 0:
+            if errors:
+                raise Exception(f"Listing S3 failed: {errors[0]}")
+            return []
         df = pd.read_json(f"{tmp_base_dir}/output.json", lines=True)
-
-        files = []
-        for row in df.itertuples():
-            file = []
-            k = row.key  # type: ignore
-            file.append(k)
-            file.append(k.replace("s3://", "/vsis3/"))
-            file.append(k.split("/")[-1])
-            if isinstance(source, list):
-                dt = datetime.datetime(1970, 1, 1, 0, 0, 0)
-            else:
-                dt = extract_date_components(k, source)
-            file.append(dt)
-            files.append(file)
-
-        df = pd.DataFrame(
-            files, columns=pd.Index(["engine_path", "gdal_path", "tile_name", "date"])
-        )
-
-        if isinstance(df["date"], pd.Series):
-            df["date"] = pd.to_datetime(df["date"])
-        
-        df["date"] = df["date"].dt.tz_localize("UTC")
-
-        return df
+        return df["key"].tolist()
 
     def sync(self, df, tmp_base_dir, overwrite=False):
-        # Iterate over the dataframe to get GDAL paths that need syncing
-        # TODO: Use engine_path to download from S3 instead of gdal_path.
-        cmds = []
-        for band_tile in df.itertuples():
-            try:
-                logger.debug(f"Trying to open local file {band_tile.tile.gdal_path}")
-                gdal.Open(
-                    f"{tmp_base_dir}/raw-data/{band_tile.tile.gdal_path.replace('/vsis3/', '')}"
+        """
+        Download the tiles to ``{tmp_base_dir}/raw-data`` and point their gdal_path to the local copies.
+
+        Synced objects are recorded in a manifest with their ETag and size, see
+        ``sync_manifest.SyncManifest``. Objects are downloaded only if they were never fully synced,
+        their local copy is missing or truncated, or they changed since, their current ETag and size
+        being looked up in the unexpired listings of the listing cache, or with a ``HeadObject``
+        request for other objects, eg: listed with s5cmd, listed by an expired listing or with the
+        listing cache disabled. Without aiobotocore, these objects can not be checked for changes,
+        they are assumed unchanged unless overwrite is True, and are not served from the raster cache.
+
+        Objects to download are first looked up in the raster cache by key and ETag, and linked from
+        it when found, see ``raster_cache.RasterCache``. Downloaded objects are added to it.
+
+        Args:
+            df (pd.DataFrame): Tiles, with their ``s3://`` engine_path
+            tmp_base_dir (str): Directory of the dataset
+            overwrite (bool, optional): Download synced objects whose current version is unknown again.
+                Defaults to False
+
+        Returns:
+            pd.DataFrame: The tiles, with gdal_path pointing to the local copies
+        """
+        raw_dir = f"{tmp_base_dir}/raw-data"
+        helpers.make_sure_dir_exists(raw_dir)
+        manifest = sync_manifest.SyncManifest(f"{tmp_base_dir}/sync-manifest.sqlite")
+
+        keys = df["engine_path"].unique().tolist()
+        entries = manifest.get(keys)
+        cache = listing_cache.get_listing_cache()
+        # Current version of the objects, only from sources checked against S3, so the raster cache
+        # is never looked up with an outdated ETag
+        remote = cache.get_objects(keys) if cache is not None else {}
+        missing = [key for key in keys if key not in remote]
+        if missing and s3_listing.is_available():
+            # Not listed by the native lister, only in expired listings or the listing cache is disabled
+            logger.info(
+                f"Getting the ETag of {len(missing)} objects without a valid listing"
+            )
+            lister = s3_listing.S3Lister(
+                no_sign_request=bool(self.no_sign_flag),
+                request_payer=bool(self.request_payer_flag),
+                profile=self.profile,
+            )
+            remote.update(lister.head_objects(missing))
+
+        to_sync, adopted = [], []
+        for key in keys:
+            obj = remote.get(key) or {}
+            entry = {
+                "key": key,
+                "local_path": f"{raw_dir}/{key.replace('s3://', '', 1)}",
+                "etag": obj.get("etag"),
+                "size": obj.get("size"),
+            }
+            if (
+                key not in entries
+                and entry["size"] is not None
+                and os.path.exists(entry["local_path"])
+                and os.path.getsize(entry["local_path"]) == entry["size"]
+            ):
+                # Synced before the manifest existed
+                adopted.append(entry)
+            elif sync_manifest.needs_sync(entries.get(key), obj or None, overwrite):
+                to_sync.append(entry)
+        manifest.complete(adopted)
+
+        logger.info(f"Syncing {len(to_sync)} of {len(keys)} files")
+        if to_sync:
+            # Pending until their local file is whole, an interrupted sync resumes with them
+            manifest.start(to_sync)
+
+            # Objects with a known current ETag may be in the raster cache already, eg: synced by another dataset
+            rasters = raster_cache.get_raster_cache()
+            cached, to_download = [], []
+            for e in to_sync:
+                if (
+                    rasters is not None
+                    and e["etag"]
+                    and rasters.get(e["key"], e["etag"], e["local_path"])
+                ):
+                    cached.append({**e, "size": os.path.getsize(e["local_path"])})
+                else:
+                    # Downloaded to a new file, the previous one may be linked to the raster cache
+                    helpers.remove_file_if_exists(e["local_path"])
+                    to_download.append(e)
+            manifest.complete(cached)
+            logger.info(
+                f"Linked {len(cached)} files from the raster cache, downloading {len(to_download)}"
+            )
+
+            if to_download:
+                pd.DataFrame(
+                    [f"cp --sp {e['key']} {e['local_path']}" for e in to_download]
+                ).to_csv(f"{tmp_base_dir}/sync_cmds.txt", index=False, header=False)
+                os.system(
+                    f"{edk.S5CMD_PATH} {self.no_sign_flag} {self.request_payer_flag} {self.profile_flag} run {tmp_base_dir}/sync_cmds.txt"
                 )
-                # File exists and is valid, no need to sync, unless overwrite is True
-                if overwrite:
-                    cmd = f"cp --sp {band_tile.tile.gdal_path.replace('/vsis3/', 's3://')} {tmp_base_dir}/raw-data/{band_tile.tile.gdal_path.replace('/vsis3/', '')}"
-                    cmds.append(cmd)
-            except Exception as e:
-                # Error getting metadata, file will be synced
-                cmd = f"cp --sp {band_tile.tile.gdal_path.replace('/vsis3/', 's3://')} {tmp_base_dir}/raw-data/{band_tile.tile.gdal_path.replace('/vsis3/', '')}"
-                cmds.append(cmd)
-
-        cmds = list(set(cmds))
-        helpers.make_sure_dir_exists(f"{tmp_base_dir}/raw-data")
-        logger.info(f"Syncing {len(cmds)} files")
-
-        pd.DataFrame(cmds).to_csv(
-            f"{tmp_base_dir}/sync_cmds.txt", index=False, header=False
-        )
-        os.system(f"{edk.S5CMD_PATH} run {tmp_base_dir}/sync_cmds.txt")
-        os.remove(f"{tmp_base_dir}/sync_cmds.txt")
+                os.remove(f"{tmp_base_dir}/sync_cmds.txt")
+
+                completed = []
+                for e in to_download:
+                    if not os.path.exists(e["local_path"]):
+                        continue
+                    size = os.path.getsize(e["local_path"])
+                    if e["size"] is None or size == e["size"]:
+                        completed.append({**e, "size": size})
+                manifest.complete(completed)
+                if rasters is not None:
+                    for e in completed:
+                        if e["etag"]:
+                            rasters.put(e["key"], e["etag"], e["local_path"])
+                if len(completed) < len(to_download):
+                    logger.error(
+                        f"{len(to_download) - len(completed)} files could not be synced, they will be synced again on the next run"
+                    )
 
         # Update gdal_path in dataframe with local paths
-        for band_tile in df.itertuples():
-            output_path = f"{tmp_base_dir}/raw-data/{band_tile.tile.gdal_path.replace('/vsis3/', '')}"
-            band_tile.tile.gdal_path = output_path
+        df["gdal_path"] = df["gdal_path"].str.replace(
+            "/vsis3/", f"{raw_dir}/", regex=False
+        )
 
         return df
-
-
-# TODO: Add more date formats like hour, minute, seconds, day of year
-def create_regex_template(template):
-    mts = (
-        template.replace("*", "(.*)")
-        .replace("%Y", r"(?P<year>\d{4})")
-        .replace("%-m", r"(?P<month>\d{1,2})")
-        .replace("%-j", r"(?P<day_of_year>\d{1,3})")
-        .replace("%m", r"(?P<month>\d{2})")
-        .replace("%j", r"(?P<day_of_year>\d{1,3})")
-        .replace("%d", r"(?P<day>\d{2})")
-        .replace("%-d", r"(?P<day>\d{1,2})")
-    )
-    return mts
-
-
-def create_parts(path):
-    parts = urlparse(path).path.strip("/").split("/")
-    return parts
-
-
-def contains_time_component(template):
-    comps = ["%Y", "%-m", "%m", "%d", "%-d"]
-    for c in comps:
-        if c in template:
-            return True
-
-
-def extract_date_components(test_str, template_str):
-    template_parts = create_parts(template_str)
-    test_parts = create_parts(test_str)
-    year, month, day, hour, min, sec = 1970, 1, 1, 0, 0, 0
-    day_of_year = None
-    for i in range(len(template_parts)):
-        if contains_time_component(template_parts[i]):
-            mts = create_regex_template(template_parts[i])
-            res = re.search(mts, test_parts[i])
-            if res:
-                groups = res.groupdict()
-                if "year" in groups:
-                    year = int(groups["year"])
-                if "month" in groups:
-                    month = int(groups["month"])
-                if "day" in groups:
-                    day = int(groups["day"])
-                if "day_of_year" in groups:
-                    day_of_year = int(groups["day_of_year"])
-
-    if day_of_year and year:
-        day = datetime.datetime.strptime(str(day_of_year), "%j").day
-
-    return datetime.datetime(year, month, day, hour, min, sec)
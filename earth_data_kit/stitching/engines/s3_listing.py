@@ -0,0 +1,312 @@
+import os
+import re
+import queue
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Wildcards supported in search paths, same as s5cmd: * matches any characters including "/"
+WILDCARD_CHARS = "*?"
+# Concurrent ListObjectsV2 requests, also the size of the connection pool
+MAX_CONCURRENCY = 64
+# Levels of sub-prefixes listed concurrently under the literal prefix of a wildcard path
+FANOUT_DEPTH = 2
+# Marks the end of the pages of a listing
+_DONE = object()
+
+
+def _import_aiobotocore():
+    try:
+        import aiobotocore.session
+        import aiobotocore.config
+        import botocore
+        import botocore.exceptions
+    except ImportError as e:
+        raise ImportError(
+            "The native S3 lister requires aiobotocore, install it with `pip install earth-data-kit[s3]`"
+        ) from e
+    return aiobotocore, botocore
+
+
+def is_available():
+    """Whether the native lister can be used, ie: aiobotocore is installed."""
+    try:
+        _import_aiobotocore()
+    except ImportError:
+        return False
+    return True
+
+
+def split_search_path(search_path):
+    """
+    Split an S3 search path into what ListObjectsV2 can filter on and what has to be matched.
+
+    Args:
+        search_path (str): ``s3://bucket/key``, the key possibly containing ``*`` and ``?`` wildcards
+
+    Returns:
+        tuple: (bucket, literal prefix of the key, compiled regex of the key or None without wildcards)
+    """
+    path = (
+        search_path[len("s3://") :] if search_path.startswith("s3://") else search_path
+    )
+    bucket, _, key = path.partition("/")
+    positions = [key.find(c) for c in WILDCARD_CHARS if c in key]
+    if not positions:
+        return bucket, key, None
+
+    regex = "".join(
+        ".*" if c == "*" else "." if c == "?" else re.escape(c) for c in key
+    )
+    return bucket, key[: min(positions)], re.compile(regex + r"\Z", re.DOTALL)
+
+
+class S3Lister:
+    """
+    Lists S3 search paths in process, with asyncio and a pool of connections.
+
+    Replaces ``s5cmd ls``: every search path is listed with paginated ``ListObjectsV2`` requests
+    on the literal prefix before its first wildcard, and the sub-prefixes under it are listed
+    concurrently, so a wildcard over thousands of directories does not go through a single
+    sequential listing. Pages of objects are yielded as they arrive.
+
+    The event loop runs in its own thread, so listing also works from a notebook whose loop is
+    already running.
+
+    Example:
+        >>> lister = S3Lister(no_sign_request=True)
+        >>> for idx, objects in lister.iter_objects(["s3://sentinel-cogs/sentinel-s2-l2a-cogs/34/T/DL/2023/1/*/B04.tif"]):
+        ...     print(idx, objects)
+    """
+
+    def __init__(
+        self,
+        no_sign_request=False,
+        request_payer=False,
+        profile=None,
+        max_concurrency=MAX_CONCURRENCY,
+    ):
+        """
+        Args:
+            no_sign_request (bool, optional): Send unsigned requests, for public buckets. Defaults to False
+            request_payer (bool, optional): Accept the charges of requester pays buckets. Defaults to False
+            profile (str, optional): AWS profile of the credentials. Defaults to the default credential chain
+            max_concurrency (int, optional): Maximum number of requests in flight. Defaults to 64
+        """
+        self.no_sign_request = no_sign_request
+        self.request_payer = request_payer
+        self.profile = profile
+        self.max_concurrency = max_concurrency
+
+    async def __list_prefix__(
+        self, client, semaphore, bucket, prefix, delimiter, on_page
+    ):
+        """List the keys under a prefix page by page, returns the sub-prefixes if a delimiter is given."""
+        kwargs = {"Bucket": bucket, "Prefix": prefix}
+        if delimiter:
+            kwargs["Delimiter"] = delimiter
+        if self.request_payer:
+            kwargs["RequestPayer"] = "requester"
+
+        sub_prefixes = []
+        async with semaphore:
+            paginator = client.get_paginator("list_objects_v2")
+            async for page in paginator.paginate(**kwargs):
+                on_page(page.get("Contents", []))
+                sub_prefixes.extend(p["Prefix"] for p in page.get("CommonPrefixes", []))
+        return sub_prefixes
+
+    async def __list_search_path__(self, client, semaphore, idx, search_path, emit):
+        bucket, prefix, regex = split_search_path(search_path)
+
+        def on_page(contents):
+            objects = [
+                {
+                    "key": f"s3://{bucket}/{obj['Key']}",
+                    "size": obj.get("Size"),
+                    "etag": obj.get("ETag", "").strip('"'),
+                    "last_modified": (
+                        obj["LastModified"].isoformat()
+                        if obj.get("LastModified")
+                        else None
+                    ),
+                }
+                for obj in contents
+                if regex is None or regex.match(obj["Key"])
+            ]
+            if objects:
+                emit((idx, objects))
+
+        if regex is None:
+            # Like `s5cmd ls`, a path without wildcards lists the objects directly under it
+            await self.__list_prefix__(client, semaphore, bucket, prefix, "/", on_page)
+            return
+
+        async def fan_out(prefix, depth):
+            if depth == 0:
+                await self.__list_prefix__(
+                    client, semaphore, bucket, prefix, None, on_page
+                )
+                return
+            sub_prefixes = await self.__list_prefix__(
+                client, semaphore, bucket, prefix, "/", on_page
+            )
+            await asyncio.gather(*(fan_out(p, depth - 1) for p in sub_prefixes))
+
+        await fan_out(prefix, FANOUT_DEPTH)
+
+    def __create_client__(self):
+        aiobotocore, botocore = _import_aiobotocore()
+        session = aiobotocore.session.AioSession(profile=self.profile)
+        config = aiobotocore.config.AioConfig(
+            max_pool_connections=self.max_concurrency,
+            retries={"max_attempts": 10, "mode": "adaptive"},
+            signature_version=botocore.UNSIGNED if self.no_sign_request else None,
+        )
+        # Picks AWS_REGION and AWS_ENDPOINT_URL from the environment, eg: for MinIO
+        return session.create_client("s3", config=config)
+
+    async def __list_all__(self, search_paths, emit):
+        async with self.__create_client__() as client:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            await asyncio.gather(
+                *(
+                    self.__list_search_path__(client, semaphore, idx, search_path, emit)
+                    for idx, search_path in enumerate(search_paths)
+                )
+            )
+
+    async def __head_object__(self, client, semaphore, key, emit):
+        _, botocore = _import_aiobotocore()
+        bucket, _, name = key[len("s3://") :].partition("/")
+        kwargs = {"Bucket": bucket, "Key": name}
+        if self.request_payer:
+            kwargs["RequestPayer"] = "requester"
+
+        async with semaphore:
+            try:
+                obj = await client.head_object(**kwargs)
+            except botocore.exceptions.ClientError as e:
+                if e.response.get("Error", {}).get("Code") in (
+                    "404",
+                    "NoSuchKey",
+                    "NotFound",
+                ):
+                    return
+                raise
+        emit(
+            {
+                "key": key,
+                "size": obj.get("ContentLength"),
+                "etag": obj.get("ETag", "").strip('"'),
+                "last_modified": (
+                    obj["LastModified"].isoformat() if obj.get("LastModified") else None
+                ),
+            }
+        )
+
+    async def __head_all__(self, keys, emit):
+        async with self.__create_client__() as client:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            await asyncio.gather(
+                *(self.__head_object__(client, semaphore, key, emit) for key in keys)
+            )
+
+    def iter_objects(self, search_paths):
+        """
+        List search paths, yielding their objects page by page as they arrive.
+
+        Args:
+            search_paths (list[str]): ``s3://bucket/key`` paths, with optional ``*`` and ``?`` wildcards
+
+        Yields:
+            tuple: (index of the search path, list of matching objects as dictionaries with the
+                ``s3://`` key, size, etag and last_modified of the object)
+
+        Raises:
+            botocore.exceptions.ClientError: If a listing fails, eg: missing bucket or access denied
+        """
+        pages = queue.Queue()
+        errors = []
+
+        def run():
+            try:
+                asyncio.run(self.__list_all__(search_paths, pages.put))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                pages.put(_DONE)
+
+        thread = threading.Thread(target=run, daemon=True, name="edk-s3-lister")
+        thread.start()
+        while True:
+            page = pages.get()
+            if page is _DONE:
+                break
+            yield page
+        thread.join()
+
+        if errors:
+            logger.error(f"Error listing S3 search paths: {errors[0]}")
+            raise errors[0]
+
+    def iter_keys(self, search_paths):
+        """Same as ``iter_objects``, yielding the ``s3://`` keys of the objects only."""
+        for idx, objects in self.iter_objects(search_paths):
+            yield idx, [obj["key"] for obj in objects]
+
+    def head_objects(self, keys):
+        """
+        Current size and ETag of objects, with concurrent ``HeadObject`` requests.
+
+        Args:
+            keys (list[str]): ``s3://`` keys of the objects
+
+        Returns:
+            dict: key, size, etag and last_modified of the objects, keyed by their key. Missing
+                objects are left out
+
+        Raises:
+            botocore.exceptions.ClientError: If a request fails for another reason than a missing object
+        """
+        objects = {}
+        errors = []
+
+        def run():
+            try:
+                asyncio.run(
+                    self.__head_all__(
+                        keys, lambda obj: objects.__setitem__(obj["key"], obj)
+                    )
+                )
+            except Exception as e:
+                errors.append(e)
+
+        # Own event loop in its own thread, like iter_objects
+        thread = threading.Thread(target=run, daemon=True, name="edk-s3-head")
+        thread.start()
+        thread.join()
+
+        if errors:
+            logger.error(f"Error getting the metadata of S3 objects: {errors[0]}")
+            raise errors[0]
+        return objects
+
+
+def get_lister_name():
+    """
+    Lister used by ``S3.scan``, from the ``EDK_S3_LISTER`` environment variable.
+
+    ``native`` lists in process with aiobotocore, ``s5cmd`` shells out to s5cmd. Defaults to
+    ``native`` when aiobotocore is installed, ``s5cmd`` otherwise.
+    """
+    name = os.getenv("EDK_S3_LISTER", "").lower()
+    if name in ("", "auto"):
+        return "native" if is_available() else "s5cmd"
+    if name not in ("native", "s5cmd"):
+        raise ValueError(
+            f"Unsupported EDK_S3_LISTER: {name}. Should be one of native, s5cmd"
+        )
+    return name
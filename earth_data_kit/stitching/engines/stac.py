@@ -23,7 +23,7 @@ class STAC:
             parts = _source.split("/collections/")
             if len(parts) == 2:
                 catalog_url = parts[0]
-                collection_name = parts[1].split('/')[0]
+                collection_name = parts[1].split("/")[0]
                 return catalog_url, collection_name
 
         return _source, None
@@ -61,11 +61,11 @@ class STAC:
 
         # Search for items using the collection
         logger.info(f"Searching collection: {collection_name}")
-        results = catalog.search(**search_kwargs) # type: ignore
+        results = catalog.search(**search_kwargs)  # type: ignore
         return results
 
     def scan(self, source, time_opts, space_opts, tmp_path, band_locator):
-        
+
         catalog_url, collection_name = STAC._parse_stac_url(source)
 
         if collection_name is None:
@@ -75,7 +75,9 @@ class STAC:
             )
 
         # Search catalog with filters
-        results = self._search_catalog(catalog_url, collection_name, time_opts, space_opts)
+        results = self._search_catalog(
+            catalog_url, collection_name, time_opts, space_opts
+        )
 
         items = []
         # Process each STAC item
@@ -106,24 +108,25 @@ class STAC:
         return dest
 
     def sync(self, df, tmp_base_dir, overwrite=False):
+        local_paths = {}
         with concurrent.futures.ThreadPoolExecutor(
             max_workers=helpers.get_threadpool_workers()
         ) as executor:
-            for band_tile in df.itertuples():
+            for gdal_path in df["gdal_path"].unique():
                 local_path = None
                 protocol = None
-                if band_tile.tile.gdal_path.startswith("/vsicurl/"):
-                    url = band_tile.tile.gdal_path
+                if gdal_path.startswith("/vsicurl/"):
+                    url = gdal_path
                     url_wo_gdal_prefix = url[len("/vsicurl/") :]
                     url_parts = urlparse(url_wo_gdal_prefix)
                     local_path = f"{tmp_base_dir}/raw-data{url_parts.path}"
                     protocol = "http"
-                elif band_tile.tile.gdal_path.startswith("/vsis3/"):
+                elif gdal_path.startswith("/vsis3/"):
                     protocol = "s3"
                     raise ValueError("S3 assets syncing is not yet supported for STAC")
                 else:
                     raise ValueError(
-                        f"Unknown protocol found in asset href: {band_tile.tile.gdal_path}. "
+                        f"Unknown protocol found in asset href: {gdal_path}. "
                         "Please raise an issue at https://github.com/earth-data-kit/earth-data-kit/issues with details about the STAC asset."
                     )
                 try:
@@ -131,29 +134,22 @@ class STAC:
                     # File exists and is valid, no need to sync, unless overwrite is True
                     if overwrite:
                         if protocol == "http":
-                            executor.submit(
-                                self._sync_http, band_tile.tile.gdal_path, local_path
-                            )
+                            executor.submit(self._sync_http, gdal_path, local_path)
                         elif protocol == "s3":
-                            executor.submit(
-                                self._sync_s3, band_tile.tile.gdal_path, local_path
-                            )
+                            executor.submit(self._sync_s3, gdal_path, local_path)
                     else:
                         logger.info("Tile found, not overwriting")
                 except Exception as e:
                     # Error getting metadata, file will be synced
                     if protocol == "http":
-                        executor.submit(
-                            self._sync_http, band_tile.tile.gdal_path, local_path
-                        )
+                        executor.submit(self._sync_http, gdal_path, local_path)
                     elif protocol == "s3":
-                        executor.submit(
-                            self._sync_s3, band_tile.tile.gdal_path, local_path
-                        )
-                # Updating the file path to local_path
-                band_tile.tile.gdal_path = local_path
+                        executor.submit(self._sync_s3, gdal_path, local_path)
+                local_paths[gdal_path] = local_path
 
             executor.shutdown(wait=True)
 
-        return df
+        # Updating the file paths to local paths
+        df["gdal_path"] = df["gdal_path"].map(local_paths)
 
+        return df
@@ -0,0 +1,123 @@
+import os
+import time
+import logging
+import earth_data_kit.stitching.engines.db as db
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    key TEXT PRIMARY KEY,
+    etag TEXT,
+    size INTEGER,
+    local_path TEXT NOT NULL,
+    completed INTEGER NOT NULL,
+    synced_at REAL
+);
+"""
+
+
+class SyncManifest:
+    """
+    Record of the objects synced to a local directory, so syncing again is a lookup per object.
+
+    Every object is stored with the ETag and size it was downloaded with, its local path and
+    whether its download completed. Objects are marked pending before a download starts and
+    completed once their local file is whole, so an interrupted sync leaves them pending and the
+    next sync resumes with them only.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Path of the SQLite database
+        """
+        self.path = path
+        with db.connect(self.path) as conn:
+            conn.executescript(SCHEMA)
+
+    def get(self, keys):
+        """
+        Manifest entries of objects.
+
+        Args:
+            keys (list[str]): ``s3://`` keys of the objects
+
+        Returns:
+            dict: etag, size, local_path and completed of the objects in the manifest, keyed by their key
+        """
+        with db.connect(self.path) as conn:
+            db.create_lookup(conn, "key_lookup", "key", keys)
+            rows = conn.execute(
+                "SELECT f.key, f.etag, f.size, f.local_path, f.completed FROM files f JOIN key_lookup USING (key)"
+            ).fetchall()
+        return {
+            key: {
+                "etag": etag,
+                "size": size,
+                "local_path": local_path,
+                "completed": bool(completed),
+            }
+            for key, etag, size, local_path, completed in rows
+        }
+
+    def __upsert__(self, entries, completed):
+        now = time.time()
+        with db.connect(self.path) as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        e["key"],
+                        e.get("etag"),
+                        e.get("size"),
+                        e["local_path"],
+                        int(completed),
+                        now,
+                    )
+                    for e in entries
+                ],
+            )
+
+    def start(self, entries):
+        """
+        Mark objects as pending, before downloading them.
+
+        Args:
+            entries (list[dict]): key, local_path and the expected etag and size, if known, of every object
+        """
+        self.__upsert__(entries, completed=False)
+
+    def complete(self, entries):
+        """
+        Mark objects as completed, once their local file is whole.
+
+        Args:
+            entries (list[dict]): key, local_path, etag and size of the downloaded objects
+        """
+        self.__upsert__(entries, completed=True)
+
+
+def needs_sync(entry, remote, overwrite=False):
+    """
+    Whether an object has to be downloaded.
+
+    Args:
+        entry (dict): Manifest entry of the object, None if it was never synced
+        remote (dict): Current size and etag of the object, None if unknown
+        overwrite (bool, optional): Download objects whose current version is unknown again. Defaults to False
+
+    Returns:
+        bool: True if the object was never fully synced, its local file is missing or truncated, or
+            it changed since it was synced
+    """
+    if entry is None or not entry["completed"]:
+        return True
+    try:
+        if os.path.getsize(entry["local_path"]) != entry["size"]:
+            return True
+    except OSError:
+        return True
+    if remote is None or remote.get("etag") is None:
+        return overwrite
+    return remote["etag"] != entry["etag"] or remote.get("size") != entry["size"]
@@ -0,0 +1,122 @@
+import os
+import logging
+import contextlib
+import concurrent.futures
+import earth_data_kit.utilities.helpers as helpers
+
+logger = logging.getLogger(__name__)
+
+# Client set by set_client(), takes precedence over EDK_DASK_SCHEDULER
+_client = None
+
+
+def _import_distributed():
+    try:
+        import distributed
+    except ImportError as e:
+        raise ImportError(
+            "Running on a dask cluster requires dask.distributed, install it with `pip install earth-data-kit[distributed]`"
+        ) from e
+    return distributed
+
+
+def set_client(client):
+    """
+    Run the heavy stages of the stitching module on a dask cluster.
+
+    Metadata fetching, warping, VRT creation and COG export submit their tasks to the cluster
+    instead of local process and thread pools. Tasks are module level functions called with
+    plain values (paths, specs, tile-band rows), their results are collected back on the client,
+    eg: to write the catalog. Outputs are written to the EDK tmp directory, which must be shared
+    by the client and the workers, eg: a network file system mounted at the same path.
+
+    The cluster can also be set with the ``EDK_DASK_SCHEDULER`` environment variable, holding the
+    address of its scheduler.
+
+    Args:
+        client (distributed.Client): Client of the cluster, or None to go back to local pools
+
+    Example:
+        >>> import earth_data_kit as edk
+        >>> from distributed import Client, LocalCluster
+        >>> edk.stitching.set_client(Client(LocalCluster(n_workers=4)))
+        >>> ds.discover()
+        >>> ds.mosaic(["red", "green", "blue"])
+    """
+    global _client
+    _client = client
+
+
+def get_client():
+    """
+    Client of the dask cluster the tasks run on, None when running locally.
+
+    Returns:
+        distributed.Client: The client set by ``set_client()``, or connected to ``EDK_DASK_SCHEDULER``
+    """
+    global _client
+    if _client is None and os.getenv("EDK_DASK_SCHEDULER"):
+        distributed = _import_distributed()
+        address = os.getenv("EDK_DASK_SCHEDULER")
+        logger.info(f"Connecting to dask scheduler {address}")
+        _client = distributed.Client(address)
+    return _client
+
+
+def get_workers(kind="process"):
+    """
+    Number of tasks running concurrently, to size batches of tasks.
+
+    Args:
+        kind (str, optional): ``process`` or ``thread``, the kind of local pool. Defaults to ``process``
+
+    Returns:
+        int: Threads of the cluster's workers, otherwise the size of the local pool
+    """
+    client = get_client()
+    if client is not None:
+        return max(1, sum(client.nthreads().values()))
+    if kind == "thread":
+        return helpers.get_threadpool_workers() or min(32, (os.cpu_count() or 1) + 4)
+    return helpers.get_processpool_workers() or os.cpu_count() or 1
+
+
+@contextlib.contextmanager
+def get_executor(kind="process", max_workers=None):
+    """
+    Executor running the tasks of a stage, see ``set_client()``.
+
+    Yields a ``concurrent.futures.Executor``: a local process or thread pool, or an executor
+    submitting to the dask cluster. Its futures are ``concurrent.futures.Future`` in both cases,
+    so callers use ``concurrent.futures.as_completed`` and ``Future.result`` as usual. Submitted
+    functions and arguments must be picklable when running on processes or a cluster.
+
+    Args:
+        kind (str, optional): ``process`` for CPU bound tasks, ``thread`` for I/O bound tasks or tasks
+            sharing state with the caller, used when running locally. Defaults to ``process``
+        max_workers (int, optional): Size of the local pool. Defaults to ``EDK_MAX_WORKERS``
+
+    Yields:
+        concurrent.futures.Executor: The executor
+    """
+    client = get_client()
+    if client is not None:
+        # Tasks write files, they must run every time they are submitted
+        with client.get_executor(pure=False) as executor:
+            yield executor
+        return
+
+    if kind == "process":
+        pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers or helpers.get_processpool_workers()
+        )
+    elif kind == "thread":
+        pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers or helpers.get_threadpool_workers()
+        )
+    else:
+        raise ValueError(
+            f"Unsupported executor kind: {kind}. Should be one of process, thread"
+        )
+    with pool:
+        yield pool
@@ -1,6 +1,6 @@
 import pandas as pd
 import earth_data_kit.stitching.engines.commons as commons
-from earth_data_kit.stitching.classes.tile import Tile
+from earth_data_kit.stitching.classes.tile_table import TileTable
 from earth_data_kit.utilities import geo, helpers
 import concurrent.futures
 from tqdm import tqdm
@@ -102,6 +102,6 @@ class EarthEngineAdapter:
         catalog_df = self._expand_catalog(catalog_df)
 
         # Passing array of jsons in a dataframe "bands" column
-        tiles = Tile.from_df(pd.DataFrame(catalog_df))
+        tiles = TileTable.from_df(pd.DataFrame(catalog_df))
 
         return tiles
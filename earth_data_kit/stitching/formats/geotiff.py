@@ -1,5 +1,5 @@
 import earth_data_kit.stitching.engines.commons as commons
-from earth_data_kit.stitching.classes.tile import Tile
+from earth_data_kit.stitching.classes.tile_table import TileTable
 import logging
 
 logger = logging.getLogger(__name__)
@@ -36,5 +36,5 @@ class GeoTiffAdapter:
             scan_df.at[idx, "bands"] = metadata[idx]["bands"]
         scan_df = scan_df[scan_df["geo_transform"].notna()].reset_index(drop=True)
 
-        tiles = Tile.from_df(scan_df)
+        tiles = TileTable.from_df(scan_df)
         return tiles
@@ -1,12 +1,12 @@
 import logging
 from osgeo import gdal
-from earth_data_kit.stitching.classes.tile import Tile
+from earth_data_kit.stitching.classes.tile_table import TileTable
 from earth_data_kit.utilities import geo, helpers
+import earth_data_kit.stitching.executors as executors
 import concurrent.futures
 from tqdm import tqdm
 import pandas as pd
 from pyproj import CRS
-from earth_data_kit.stitching.classes.tile import Tile
 
 logger = logging.getLogger(__name__)
 
@@ -20,9 +20,7 @@ class NetCDFAdapter:
         # This function will extract metadata and bands for each NetCDF file and including its subdatasets
         rows = []
 
-        with concurrent.futures.ProcessPoolExecutor(
-            max_workers=helpers.get_processpool_workers()
-        ) as executor:
+        with executors.get_executor("process") as executor:
             futures = []
             for df_row in df.itertuples():
                 futures.append(
@@ -59,7 +57,7 @@ class NetCDFAdapter:
             ),
         )
 
-        tiles = Tile.from_df(df)
+        tiles = TileTable.from_df(df)
         return tiles
 
 
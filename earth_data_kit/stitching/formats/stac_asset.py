@@ -4,7 +4,7 @@ import pystac
 import concurrent.futures
 import earth_data_kit.utilities as utilities
 from tqdm import tqdm
-from earth_data_kit.stitching.classes.tile import Tile
+from earth_data_kit.stitching.classes.tile_table import TileTable
 import logging
 import json
 import pandas as pd
@@ -30,12 +30,14 @@ class STACAssetAdapter:
             raster_ext = asset.ext.raster
 
             for idx in range(len(raster_ext.bands)):
-                bands.append({
-                    "nodataval": raster_ext.bands[idx].nodata,
-                    "dtype": raster_ext.bands[idx].data_type,
-                    "source_idx": idx + 1,
-                    "description": key,
-                })
+                bands.append(
+                    {
+                        "nodataval": raster_ext.bands[idx].nodata,
+                        "dtype": raster_ext.bands[idx].data_type,
+                        "source_idx": idx + 1,
+                        "description": key,
+                    }
+                )
 
         if len(bands) > 0:
             logger.info("Found in raster_ext")
@@ -43,7 +45,7 @@ class STACAssetAdapter:
 
         ds = gdal.OpenEx(gdal_path, gdal.OF_READONLY)
         bands = geo._get_bands(ds)
-        
+
         for idx in range(len(bands)):
             bands[idx]["description"] = key
 
@@ -74,12 +76,13 @@ class STACAssetAdapter:
 
         # Check if transform exists and handle None case
         if stac_transform is None:
-            raise ValueError("STAC transform is None - cannot process asset without projection info")
-        
+            raise ValueError(
+                "STAC transform is None - cannot process asset without projection info"
+            )
+
         # Sometimes stack gives transform as 9 values - [a, b, d, e, x, y, 0, 0, 1]
         if len(stac_transform) == 9:
             stac_transform = stac_transform[:6]
-            
 
         x_res, x_rot, x_ul, y_rot, y_res, y_ul = tuple(stac_transform)
         gdal_transform = (x_ul, x_res, x_rot, y_ul, y_rot, y_res)
@@ -149,7 +152,9 @@ class STACAssetAdapter:
             asset_row = [df_row.date, df_row.tile_name, df_row.engine_path]
             try:
                 # Construct GDAL path from asset href
-                if df_row.engine_path.startswith("https://planetarycomputer.microsoft.com/api/stac/v1/collections/"):
+                if df_row.engine_path.startswith(
+                    "https://planetarycomputer.microsoft.com/api/stac/v1/collections/"
+                ):
                     _, collection_name = STAC._parse_stac_url(df_row.engine_path)
                     gdal_path = f"/vsicurl?pc_url_signing=yes&pc_collection={collection_name}&url={asset.href}"
                 else:
@@ -243,5 +248,5 @@ class STACAssetAdapter:
 
     def create_tiles(self, scan_df, band_locator=None):
         df = self._get_assets_and_metadata(scan_df)
-        tiles = Tile.from_df(df)
-        return tiles
\ No newline at end of file
+        tiles = TileTable.from_df(df)
+        return tiles
@@ -0,0 +1,245 @@
+import logging
+from osgeo import gdal, ogr, osr
+from xml.sax.saxutils import escape
+import earth_data_kit.utilities.helpers as helpers
+import earth_data_kit.stitching.vrt as vrt
+
+gdal.UseExceptions()
+
+logger = logging.getLogger(__name__)
+
+LOCATION_FIELD = "location"
+SORT_FIELD = "tile_id"
+
+
+def get_location(gdal_path, source_idx):
+    """
+    Location of a tile band in the index. GTI reads band 1 of every source, other bands
+    are exposed through a ``vrt://`` connection string selecting them.
+    """
+    if int(source_idx) == 1:
+        return gdal_path
+    return f"vrt://{gdal_path}?bands={int(source_idx)}"
+
+
+def get_layer_name(projection):
+    """
+    Layer of the tiles of a projection. Derived from the projection only, so GTI files written
+    by an earlier mosaic still point to the right layer when the index is rewritten.
+    """
+    return f"tiles_{helpers.cheap_hash(projection)}"
+
+
+def write_tile_index(path, band_tiles):
+    """
+    Write a GeoPackage tile index of tile bands, as read by the GDAL Raster Tile Index (GTI) driver.
+
+    Every tile band becomes a feature with its location, date and band description, and its
+    extent in its own CRS as geometry. Tiles are split into one layer per CRS, as a layer holds a
+    single spatial reference. The GeoPackage R-tree and an attribute index on (date, band) let
+    GTI select the sources of a read window without scanning the whole index.
+
+    Args:
+        path (str): Output GeoPackage path, overwritten if it exists
+        band_tiles (pd.DataFrame): Tile-band rows, see ``TileTable.band_table``, with dates
+            formatted as in the VRT file names in a ``date_str`` column
+
+    Returns:
+        dict: Layer name of every projection found in band_tiles
+    """
+    helpers.make_sure_dir_exists(path)
+    driver = ogr.GetDriverByName("GPKG")
+    if gdal.VSIStatL(path) is not None:
+        driver.DeleteDataSource(path)
+    ds = driver.CreateDataSource(path)
+
+    layers = {}
+    for projection, tiles in band_tiles.groupby("projection", sort=False):
+        srs = osr.SpatialReference()
+        srs.SetFromUserInput(projection)
+        srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+
+        layer_name = get_layer_name(projection)
+        layer = ds.CreateLayer(layer_name, srs, ogr.wkbPolygon)
+        layer.CreateField(ogr.FieldDefn(LOCATION_FIELD, ogr.OFTString))
+        layer.CreateField(ogr.FieldDefn("date", ogr.OFTString))
+        layer.CreateField(ogr.FieldDefn("band", ogr.OFTString))
+        layer.CreateField(ogr.FieldDefn(SORT_FIELD, ogr.OFTInteger64))
+        defn = layer.GetLayerDefn()
+
+        locations = [
+            get_location(p, i) for p, i in zip(tiles["gdal_path"], tiles["source_idx"])
+        ]
+        layer.StartTransaction()
+        for location, row in zip(locations, tiles.itertuples(index=False)):
+            feature = ogr.Feature(defn)
+            feature.SetField(LOCATION_FIELD, location)
+            feature.SetField("date", row.date_str)
+            feature.SetField("band", row.description)
+            feature.SetField(SORT_FIELD, int(row.tile_id))
+            ring = ogr.Geometry(ogr.wkbLinearRing)
+            for x, y in [
+                (row.x_min, row.y_min),
+                (row.x_max, row.y_min),
+                (row.x_max, row.y_max),
+                (row.x_min, row.y_max),
+                (row.x_min, row.y_min),
+            ]:
+                ring.AddPoint_2D(float(x), float(y))
+            polygon = ogr.Geometry(ogr.wkbPolygon)
+            polygon.AddGeometry(ring)
+            feature.SetGeometryDirectly(polygon)
+            layer.CreateFeature(feature)
+        layer.CommitTransaction()
+
+        ds.ExecuteSQL(
+            f"CREATE INDEX idx_{layer_name}_date_band ON {layer_name} (date, band)"
+        )
+        layers[projection] = layer_name
+
+    ds = None
+    return layers
+
+
+def _quote(value):
+    """Quote a string literal for an OGR SQL attribute filter."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def build_band_gti(
+    index_path,
+    layer_name,
+    date_str,
+    description,
+    tiles,
+    geo_transform,
+    x_size,
+    y_size,
+    dtype,
+):
+    """
+    Build the XML of a GTI dataset exposing one band of one date, on the given output grid.
+
+    Args:
+        index_path (str): Path of the GeoPackage tile index
+        layer_name (str): Layer of the index holding the tiles
+        date_str (str): Date of the tiles, as stored in the index
+        description (str): Band description
+        tiles (pd.DataFrame): Tile-band rows of the band, used for its data type and nodata
+        geo_transform (tuple): Geotransform of the output grid
+        x_size (int): Width of the output grid
+        y_size (int): Height of the output grid
+        dtype (str): Output data type, or None to keep the data type of the tiles
+
+    Returns:
+        str: The GTI XML
+    """
+    data_type = vrt.get_gdal_type_name(
+        dtype if dtype is not None else tiles["dtype"].iloc[0]
+    )
+    min_x, max_y = geo_transform[0], geo_transform[3]
+    max_x = min_x + geo_transform[1] * x_size
+    min_y = max_y + geo_transform[5] * y_size
+
+    lines = ["<GDALTileIndexDataset>"]
+    lines.append(f"  <IndexDataset>{escape(index_path)}</IndexDataset>")
+    lines.append(f"  <IndexLayer>{escape(layer_name)}</IndexLayer>")
+    lines.append(
+        f"  <Filter>{escape(f'date = {_quote(date_str)} AND band = {_quote(description)}')}</Filter>"
+    )
+    lines.append(f"  <LocationField>{LOCATION_FIELD}</LocationField>")
+    # Later tiles are drawn on top, as in a VRT
+    lines.append(f"  <SortField>{SORT_FIELD}</SortField>")
+    lines.append(f"  <ResX>{vrt.format_number(geo_transform[1])}</ResX>")
+    lines.append(f"  <ResY>{vrt.format_number(-geo_transform[5])}</ResY>")
+    lines.append(f"  <MinX>{vrt.format_number(min_x)}</MinX>")
+    lines.append(f"  <MinY>{vrt.format_number(min_y)}</MinY>")
+    lines.append(f"  <MaxX>{vrt.format_number(max_x)}</MaxX>")
+    lines.append(f"  <MaxY>{vrt.format_number(max_y)}</MaxY>")
+    lines.append(f'  <Band band="1" dataType="{data_type}">')
+    lines.append(f"    <Description>{escape(description)}</Description>")
+    nodata = tiles["nodataval"].dropna()
+    if not nodata.empty:
+        lines.append(
+            f"    <NoDataValue>{vrt.format_number(nodata.iloc[0])}</NoDataValue>"
+        )
+    color_interp = vrt.get_color_interp(tiles)
+    if color_interp is not None:
+        lines.append(f"    <ColorInterp>{escape(color_interp)}</ColorInterp>")
+    lines.append("  </Band>")
+    lines.append("</GDALTileIndexDataset>")
+    return "\n".join(lines) + "\n"
+
+
+def write_mosaic_gti(
+    path, index_path, layers, date_str, band_tiles, bands, bbox, dtype=None, grid=None
+):
+    """
+    Write the stacked and clipped mosaic of a date as a VRT of per band GTI datasets.
+
+    Every band is a GTI dataset filtering the tile index on the date and band, clipped to the
+    output grid, so at read time GDAL only opens the sources intersecting the read window
+    through the spatial index instead of scanning a list of sources. The bands are stacked by
+    a small VRT with one source per band.
+
+    Args:
+        path (str): Output VRT path, the GTI files are written next to it
+        index_path (str): Path of the GeoPackage tile index, see ``write_tile_index``
+        layers (dict): Layer name of every projection, as returned by ``write_tile_index``
+        date_str (str): Date of the mosaic, as stored in the index
+        band_tiles (pd.DataFrame): Tile-band rows of the date
+        bands (list[str]): Ordered list of band descriptions to stack
+        bbox (tuple): (xmin, ymin, xmax, ymax) of the clip window in EPSG:4326
+        dtype (str, optional): Output data type, defaults to the data type of the tiles
+        grid (tuple, optional): (geo_transform, x_size, y_size) of the output grid, see ``vrt.get_mosaic_grid``
+
+    Returns:
+        list[str]: Descriptions of the bands written, in output order
+    """
+    bands_found = vrt.get_bands_found(band_tiles, bands)
+    geo_transform, x_size, y_size = vrt.get_mosaic_grid(
+        band_tiles, bands_found, bbox, grid
+    )
+    projection = band_tiles.loc[
+        band_tiles["description"].isin(bands_found), "projection"
+    ].iloc[0]
+
+    band_sources = []
+    for band_num, band_desc in enumerate(bands_found, start=1):
+        tiles = band_tiles[band_tiles["description"] == band_desc]
+        gti_path = f"{path[: -len('.vrt')]}-{band_num}.gti"
+        with open(gti_path, "w") as f:
+            f.write(
+                build_band_gti(
+                    index_path,
+                    layers[projection],
+                    date_str,
+                    band_desc,
+                    tiles,
+                    geo_transform,
+                    x_size,
+                    y_size,
+                    dtype,
+                )
+            )
+        band_sources.append(
+            {
+                "path": gti_path,
+                "description": band_desc,
+                "dtype": vrt.get_gdal_type_name(
+                    dtype if dtype is not None else tiles["dtype"].iloc[0]
+                ),
+                "nodataval": (
+                    tiles["nodataval"].dropna().iloc[0]
+                    if tiles["nodataval"].notna().any()
+                    else None
+                ),
+                "color_interp": vrt.get_color_interp(tiles),
+            }
+        )
+
+    with open(path, "w") as f:
+        f.write(
+            vrt.build_stack_vrt(band_sources, projection, geo_transform, x_size, y_size)
+        )
+    return bands_found
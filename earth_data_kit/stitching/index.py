@@ -0,0 +1,151 @@
+import os
+import logging
+import numpy as np
+import pandas as pd
+import shapely
+import earth_data_kit.stitching.catalog as catalog
+
+logger = logging.getLogger(__name__)
+
+# Non temporal tiles are stored with a null date, they match every time query
+NAT = np.iinfo(np.int64).min
+
+# Indexes already loaded in this process, keyed by catalog path
+_loaded = {}
+
+
+class CatalogIndex:
+    """
+    Spatio-temporal index over the tiles of a catalog.
+
+    The index keeps the EPSG:4326 bounds of every tile footprint, packed into an R-tree
+    (shapely's STRtree), and the tile dates sorted so that time ranges resolve through a
+    binary search. It is persisted next to the catalog and rebuilt automatically when the
+    catalog changes, so sub-queries never touch the remote data.
+    """
+
+    def __init__(self, bounds, dates, signature):
+        self.bounds = bounds
+        self.dates = dates
+        self.signature = signature
+
+        self.tree = shapely.STRtree(
+            shapely.box(bounds[:, 0], bounds[:, 1], bounds[:, 2], bounds[:, 3])
+        )
+        self.date_order = np.argsort(dates, kind="stable")
+        self.sorted_dates = dates[self.date_order]
+
+    @staticmethod
+    def get_path(catalog_path):
+        return f"{os.path.splitext(catalog_path)[0]}.index.npz"
+
+    @staticmethod
+    def get_signature(catalog_path):
+        stat = os.stat(catalog_path)
+        return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+    @staticmethod
+    def build(catalog_path):
+        """
+        Build the index from the ``bbox`` and ``date`` columns of a catalog and persist it.
+
+        Args:
+            catalog_path (str): Path of the catalog file
+
+        Returns:
+            CatalogIndex: The index
+        """
+        table = catalog.read_catalog_table(catalog_path, columns=["bbox", "date"])
+        bbox = table["bbox"].combine_chunks()
+        bounds = np.stack(
+            [
+                bbox.field(name).to_numpy(zero_copy_only=False)
+                for name in ["xmin", "ymin", "xmax", "ymax"]
+            ],
+            axis=1,
+        )
+        dates = table["date"].cast("int64").fill_null(NAT).to_numpy().astype(np.int64)
+
+        index = CatalogIndex(bounds, dates, CatalogIndex.get_signature(catalog_path))
+        index.save(CatalogIndex.get_path(catalog_path))
+        return index
+
+    @staticmethod
+    def load(catalog_path):
+        """
+        Load the persisted index of a catalog, rebuilding it if it is missing or stale.
+
+        Args:
+            catalog_path (str): Path of the catalog file
+
+        Returns:
+            CatalogIndex: The index
+        """
+        signature = CatalogIndex.get_signature(catalog_path)
+        index = _loaded.get(catalog_path)
+        if index is not None and np.array_equal(index.signature, signature):
+            return index
+
+        path = CatalogIndex.get_path(catalog_path)
+        index = None
+        if os.path.exists(path):
+            with np.load(path) as data:
+                if np.array_equal(data["signature"], signature):
+                    index = CatalogIndex(
+                        data["bounds"], data["dates"], data["signature"]
+                    )
+        if index is None:
+            logger.info("Catalog index missing or stale, rebuilding it")
+            index = CatalogIndex.build(catalog_path)
+
+        _loaded[catalog_path] = index
+        return index
+
+    def save(self, path):
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path, bounds=self.bounds, dates=self.dates, signature=self.signature
+        )
+        os.replace(tmp_path, path)
+
+    def query(self, aoi=None, start=None, end=None):
+        """
+        Return the ids (row numbers in the catalog) of tiles matching the given bounds.
+
+        Spatial matching is done on footprint bounds, callers needing the exact footprint
+        predicate should refine the candidates with the catalog geometries.
+
+        Args:
+            aoi (shapely.Geometry, optional): Area of interest in EPSG:4326
+            start (datetime, optional): Start of the time range (inclusive)
+            end (datetime, optional): End of the time range (inclusive)
+
+        Returns:
+            numpy.ndarray: Sorted tile ids
+        """
+        ids = np.arange(len(self.dates))
+
+        if start is not None or end is not None:
+            lo = 0
+            hi = len(self.sorted_dates)
+            # Null dates sort first, skip them and add them back as they match any time
+            first_dated = np.searchsorted(self.sorted_dates, NAT, side="right")
+            if start is not None:
+                lo = np.searchsorted(self.sorted_dates, _to_us(start), side="left")
+            if end is not None:
+                hi = np.searchsorted(self.sorted_dates, _to_us(end), side="right")
+            lo = max(lo, first_dated)
+            ids = np.concatenate(
+                [self.date_order[:first_dated], self.date_order[lo:hi]]
+            )
+
+        if aoi is not None:
+            ids = np.intersect1d(ids, self.tree.query(aoi, predicate="intersects"))
+
+        return np.sort(ids)
+
+
+def _to_us(ts):
+    ts = pd.Timestamp(ts)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return (ts - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(1, "us")
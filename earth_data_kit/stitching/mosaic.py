@@ -0,0 +1,353 @@
+import math
+import logging
+from osgeo import gdal
+import earth_data_kit.utilities.geo as geo
+import earth_data_kit.stitching.vrt as vrt
+import earth_data_kit.stitching.gti as gti
+import earth_data_kit.stitching.decorators as decorators
+
+gdal.UseExceptions()
+
+logger = logging.getLogger(__name__)
+
+# Tile-band columns read by the date tasks, the rest of the table is not sent to the workers
+TASK_COLUMNS = [
+    "date",
+    "gdal_path",
+    "source_idx",
+    "description",
+    "dtype",
+    "nodataval",
+    "color_interp",
+    "block_x_size",
+    "block_y_size",
+    "crs",
+    "projection",
+    "x_res",
+    "y_res",
+    "x_min",
+    "y_min",
+    "x_max",
+    "y_max",
+    "x_size",
+    "y_size",
+]
+# Repeated strings, sent as categories so a batch pickles every distinct value once
+CATEGORY_COLUMNS = ["description", "dtype", "color_interp", "crs", "projection"]
+# Batches per worker, so workers stay busy when some dates take longer than others
+BATCHES_PER_WORKER = 4
+
+
+def create_mosaic_spec(
+    output_dir, bbox, bands, resolution, dtype, crs, backend, tile_index=None, grid=None
+):
+    """
+    Parameters shared by the date tasks of a mosaic.
+
+    Plain values only, so a task pickles a few hundred bytes instead of the dataset with its
+    engine, format adapter and grid.
+
+    Args:
+        output_dir (str): Directory of the VRTs
+        bbox (tuple): (xmin, ymin, xmax, ymax) of the clip window in EPSG:4326
+        bands (list[str]): Ordered list of band descriptions to stack
+        resolution (tuple): Output resolution, or None to keep the resolution of the tiles
+        dtype (str): Output data type, or None to keep the data type of the tiles
+        crs (str): Output CRS, or None to keep the CRS of the tiles
+        backend (str): ``gdal``, ``xml`` or ``gti``, see ``Dataset.mosaic``
+        tile_index (tuple, optional): (path, layers) of the tile index, required by the ``gti`` backend
+        grid (TargetGrid, optional): Grid the tiles were warped onto, used as the output grid
+
+    Returns:
+        dict: The mosaic spec
+    """
+    return {
+        "output_dir": output_dir,
+        "bbox": tuple(bbox),
+        "bands": list(bands),
+        "resolution": resolution,
+        "dtype": dtype,
+        "crs": crs,
+        "backend": backend,
+        "tile_index": tile_index,
+        # (geo_transform, x_size, y_size, crs) of the output grid
+        "grid": (
+            (grid.geo_transform, grid.x_size, grid.y_size, grid.crs)
+            if grid is not None
+            else None
+        ),
+    }
+
+
+def get_task_tiles(df):
+    """Slim copy of the tile-band rows holding only what the date tasks read."""
+    tiles = df[TASK_COLUMNS].copy()
+    for col in CATEGORY_COLUMNS:
+        tiles[col] = tiles[col].astype("category")
+    return tiles
+
+
+def get_batch_size(n_dates, n_workers):
+    """
+    Number of dates per task. Large enough to amortize the per-task overhead over many small
+    dates, small enough to give every worker several batches to balance the load.
+    """
+    return max(1, math.ceil(n_dates / (max(1, n_workers) * BATCHES_PER_WORKER)))
+
+
+def get_output_vrt(spec, date_str):
+    return f"{spec['output_dir']}/{date_str}.vrt"
+
+
+def validate_band_properties(tiles_df, resolution, dtype, crs):
+    """
+    Validates that all tiles in a band have consistent data types, crs, and resolutions.
+    Ensures tiles can be properly mosaicked together.
+
+    Args:
+        tiles_df (pd.DataFrame): Tile-band rows with dtype, crs, x_res and y_res columns
+
+    Raises:
+        ValueError: If tiles have mismatched data types, crs, or resolutions
+    """
+    # Get unique values for each property
+    unique_dtypes = tiles_df["dtype"].unique()
+    unique_crs = tiles_df["crs"].unique()
+    unique_resolutions = list(
+        tiles_df[["x_res", "y_res"]]
+        .drop_duplicates()
+        .itertuples(index=False, name=None)
+    )
+
+    # Check data type consistency
+    if len(unique_dtypes) > 1 and dtype is None:
+        raise ValueError(
+            f"Band tiles have inconsistent data types. Found: {', '.join(map(str, unique_dtypes))}. "
+            "Please pass the desired data type using the 'dtype' parameter in mosaic() function."
+        )
+
+    # Check CRS consistency
+    if len(unique_crs) > 1 and crs is None:
+        raise ValueError(
+            f"Band tiles have inconsistent coordinate reference systems (CRS). Found: {', '.join(map(str, unique_crs))}. "
+            "Please pass the desired CRS using the 'crs' parameter in mosaic() function."
+        )
+
+    # Check resolution consistency
+    if len(unique_resolutions) > 1 and resolution is None:
+        raise ValueError(
+            f"Band tiles have inconsistent resolutions. Found: {', '.join(map(str, unique_resolutions))}. "
+            "Please pass the desired resolution using the 'resolution' parameter in mosaic() function."
+        )
+
+
+@decorators.log_time
+@decorators.log_init
+def create_band_mosaic(spec, band_tiles, date_str):
+    """
+    Create mosaic VRT files for the specified bands.
+
+    For each band, filters the relevant tiles, validates their properties, and creates a mosaic VRT
+    using gdalbuildvrt.
+
+    Args:
+        spec (dict): Mosaic spec, see ``create_mosaic_spec``
+        band_tiles (pd.DataFrame): Tile-band rows of the date
+        date_str (str): Date of the mosaics, used in output filenames
+
+    Returns:
+        tuple: Paths to the created band mosaic VRT files and the descriptions of their bands
+    """
+    band_mosaics = []
+    # Track only bands that were actually found to avoid "Illegal band #" error when setting descriptions on VRT
+    # If some requested bands are missing for this date, the VRT will have fewer bands than requested, causing a mismatch
+    bands_found_per_date = []
+
+    for band_desc in spec["bands"]:
+        # Filter tiles for current band
+        current_bands_df = band_tiles[band_tiles["description"] == band_desc]
+
+        # If no tiles are present for this band on the given date, skip it
+        if current_bands_df.empty:
+            logger.warning(
+                f"No tiles found for band '{band_desc}' on date {date_str}. Skipping this band."
+            )
+            continue
+        # Set up output path and validate band properties
+        band_mosaic_path = f"{spec['output_dir']}/{date_str}-{band_desc}.vrt"
+        validate_band_properties(
+            current_bands_df, spec["resolution"], spec["dtype"], spec["crs"]
+        )
+
+        # Tiles were already warped by mosaic() when resampling
+        gdal_paths = current_bands_df["gdal_path"].tolist()
+
+        # Create and save the VRT mosaic
+        ds = gdal.BuildVRT(
+            destName=band_mosaic_path,
+            srcDSOrSrcDSTab=gdal_paths,
+            separate=False,
+            bandList=[int(current_bands_df.iloc[0]["source_idx"])],
+        )
+
+        ds.Close()
+
+        band_mosaics.append(band_mosaic_path)
+        bands_found_per_date.append(band_desc)  # Record successful band processing
+
+    return band_mosaics, bands_found_per_date
+
+
+@decorators.log_time
+@decorators.log_init
+def stack_band_mosaics(spec, band_mosaics, date_str):
+    """
+    Stack individual band mosaic VRTs into a multi-band VRT and clip to spatial bounds.
+
+    Combines the mosaic VRTs using gdalbuildvrt with the -separate option, then clips
+    the result to the spatial bounds of the spec using gdal.Translate.
+
+    Args:
+        spec (dict): Mosaic spec, see ``create_mosaic_spec``
+        band_mosaics (list): List of band mosaic VRT paths to combine
+        date_str (str): Date used for naming the combined VRT
+
+    Returns:
+        str: Path to the stacked and clipped multi-band VRT
+    """
+    output_vrt = get_output_vrt(spec, date_str)
+    tmp_vrt = f"{spec['output_dir']}/{date_str}.tmp.vrt"
+
+    # Stack band mosaics into a temporary multi-band VRT
+    ds = gdal.BuildVRT(destName=tmp_vrt, srcDSOrSrcDSTab=band_mosaics, separate=True)
+    ds.Close()
+
+    if spec["grid"] is not None:
+        # Cut exactly the target grid, the stacked tiles being already aligned on it
+        geo_transform, x_size, y_size, crs = spec["grid"]
+        gdal.Translate(
+            output_vrt,
+            tmp_vrt,
+            projWin=[
+                geo_transform[0],
+                geo_transform[3],
+                geo_transform[0] + geo_transform[1] * x_size,
+                geo_transform[3] + geo_transform[5] * y_size,
+            ],
+            projWinSRS=crs,
+            width=x_size,
+            height=y_size,
+        )
+        return output_vrt
+
+    # Extract spatial bounds and clip the stacked VRT
+    xmin, ymin, xmax, ymax = spec["bbox"]
+    gdal.Translate(
+        output_vrt,
+        tmp_vrt,
+        projWin=[xmin, ymax, xmax, ymin],
+        projWinSRS="EPSG:4326",
+    )
+
+    return output_vrt
+
+
+@decorators.log_time
+@decorators.log_init
+def write_timestamped_vrt(spec, band_tiles, date_str):
+    """
+    Write the stacked and clipped VRT of a date straight from catalog metadata.
+
+    Same output as the ``gdal`` backend, but the XML is generated by ``vrt.write_mosaic_vrt``
+    so no source is opened. With a tile index, every band is a GTI dataset over the index
+    instead of a list of sources, see ``gti.write_mosaic_gti``.
+
+    Args:
+        spec (dict): Mosaic spec, see ``create_mosaic_spec``
+        band_tiles (pd.DataFrame): Tile-band rows of the date
+        date_str (str): Date of the VRT, used in the output filename
+
+    Returns:
+        str: Path to the created VRT file
+    """
+    output_vrt = get_output_vrt(spec, date_str)
+
+    for band_desc in spec["bands"]:
+        current_bands_df = band_tiles[band_tiles["description"] == band_desc]
+        if not current_bands_df.empty:
+            validate_band_properties(current_bands_df, None, spec["dtype"], None)
+
+    grid = spec["grid"][:3] if spec["grid"] is not None else None
+    if spec["tile_index"] is not None:
+        index_path, layers = spec["tile_index"]
+        gti.write_mosaic_gti(
+            output_vrt,
+            index_path,
+            layers,
+            date_str,
+            band_tiles,
+            spec["bands"],
+            spec["bbox"],
+            spec["dtype"],
+            grid,
+        )
+    else:
+        vrt.write_mosaic_vrt(
+            output_vrt, band_tiles, spec["bands"], spec["bbox"], spec["dtype"], grid
+        )
+    return output_vrt
+
+
+def create_timestamped_vrt(spec, band_tiles, date_str):
+    """
+    Create the multi-band VRT of a date from its tile-band rows.
+
+    With the ``gdal`` backend, a mosaic VRT is built for each band, the mosaics are stacked into a
+    multi-band VRT clipped to the bbox and the band descriptions are set. The ``xml`` and ``gti``
+    backends write the stacked VRT directly, see ``write_timestamped_vrt``.
+
+    Args:
+        spec (dict): Mosaic spec, see ``create_mosaic_spec``
+        band_tiles (pd.DataFrame): Tile-band rows of the date
+        date_str (str): Date of the VRT, formatted as YYYY-MM-DD-HH:MM:SS
+
+    Returns:
+        str: Path to the created VRT file
+    """
+    band_tiles = band_tiles.reset_index(drop=True)
+    # Categories of values absent from the date would otherwise show up in unique()
+    for col in CATEGORY_COLUMNS:
+        if hasattr(band_tiles[col], "cat"):
+            band_tiles[col] = band_tiles[col].cat.remove_unused_categories()
+
+    if spec["backend"] in ("xml", "gti"):
+        return write_timestamped_vrt(spec, band_tiles, date_str)
+
+    # Create mosaic VRTs for each band by combining single-band VRTs.
+    band_mosaics, bands_found_per_date = create_band_mosaic(spec, band_tiles, date_str)
+
+    # Create multi-band VRT by stacking individual band mosaics
+    output_vrt = stack_band_mosaics(spec, band_mosaics, date_str)
+
+    # Apply band descriptions only for bands that were actually mosaicked
+    geo.set_band_descriptions(output_vrt, bands_found_per_date)
+
+    return output_vrt
+
+
+def create_timestamped_vrts(spec, tiles):
+    """
+    Task creating the VRTs of a batch of dates, see ``create_timestamped_vrt``.
+
+    Args:
+        spec (dict): Mosaic spec, see ``create_mosaic_spec``
+        tiles (pd.DataFrame): Tile-band rows of the dates of the batch, see ``get_task_tiles``
+
+    Returns:
+        list[tuple]: (date_str, VRT path) of every date of the batch
+    """
+    results = []
+    for date, band_tiles in tiles.groupby("date", sort=True):
+        date_str = date.strftime("%Y-%m-%d-%H:%M:%S")
+        results.append((date_str, create_timestamped_vrt(spec, band_tiles, date_str)))
+    return results
@@ -0,0 +1,145 @@
+import queue
+import logging
+import threading
+from tqdm import tqdm
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the items of a queue
+_DONE = object()
+
+
+class Stage:
+    """
+    A step of a ``Pipeline``: a function applied to every item coming from the previous stage.
+
+    Args:
+        name (str): Name of the stage, shown on its progress bar
+        func (callable): Called with every item, returns the item passed to the next stage, or
+            None to drop it
+        workers (int, optional): Number of threads running the stage. Defaults to 1
+    """
+
+    def __init__(self, name, func, workers=1):
+        self.name = name
+        self.func = func
+        self.workers = max(1, int(workers))
+
+
+class Pipeline:
+    """
+    Streams items through stages running concurrently, connected by bounded queues.
+
+    An item moves to the next stage as soon as the current one is done with it, so stages
+    bound by different resources, eg: network for syncing and CPU for building VRTs, overlap
+    instead of waiting for each other. Queues hold at most ``queue_size`` items, so a fast stage
+    can not run far ahead of a slow one. Each stage reports its progress on its own bar.
+
+    Stages run in threads: they spend their time in GDAL, subprocesses or network calls, which
+    release the GIL.
+
+    Example:
+        >>> pipeline = Pipeline([Stage("Syncing", sync, workers=2), Stage("Creating VRTs", build, workers=4)])
+        >>> results = pipeline.run(dates)
+    """
+
+    def __init__(self, stages, queue_size=8):
+        self.stages = stages
+        self.queue_size = queue_size
+
+    def __worker__(self, stage, inputs, outputs, pbar, errors, stop):
+        while True:
+            item = inputs.get()
+            if item is _DONE:
+                # Every worker of the stage gets its own marker
+                inputs.put(_DONE)
+                return
+            if stop.is_set():
+                continue
+            try:
+                result = stage.func(item)
+            except Exception as e:
+                logger.error(f"Pipeline stage '{stage.name}' failed: {e}")
+                errors.append(e)
+                stop.set()
+                continue
+            pbar.update(1)
+            if result is not None:
+                self.__put__(outputs, result, stop)
+
+    @staticmethod
+    def __put__(q, item, stop):
+        # Waiting on a full queue, unless the pipeline is stopping and nothing consumes it anymore
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def run(self, items, total=None):
+        """
+        Run every item through all the stages.
+
+        Args:
+            items (iterable): Items fed to the first stage, consumed lazily
+            total (int, optional): Number of items, for the progress bars. Defaults to len(items) if known
+
+        Returns:
+            list: Outputs of the last stage, in completion order
+
+        Raises:
+            Exception: The first exception raised by a stage, once all stages have stopped
+        """
+        if total is None and hasattr(items, "__len__"):
+            total = len(items)
+
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages] + [
+            queue.Queue()
+        ]
+        stop = threading.Event()
+        errors = []
+        pbars = [
+            tqdm(total=total, desc=stage.name, unit="date", position=i, leave=True)
+            for i, stage in enumerate(self.stages)
+        ]
+
+        groups = []
+        for i, stage in enumerate(self.stages):
+            threads = [
+                threading.Thread(
+                    target=self.__worker__,
+                    args=(stage, queues[i], queues[i + 1], pbars[i], errors, stop),
+                    daemon=True,
+                    name=f"edk-pipeline-{stage.name}-{n}",
+                )
+                for n in range(stage.workers)
+            ]
+            for t in threads:
+                t.start()
+            groups.append(threads)
+
+        try:
+            for item in items:
+                if stop.is_set():
+                    break
+                self.__put__(queues[0], item, stop)
+        finally:
+            queues[0].put(_DONE)
+            # Stages finish in order, each one ending the next once all its workers are done
+            for i, threads in enumerate(groups):
+                for t in threads:
+                    t.join()
+                queues[i + 1].put(_DONE)
+                pbars[i].close()
+
+        if errors:
+            raise errors[0]
+
+        results = []
+        while True:
+            item = queues[-1].get()
+            if item is _DONE:
+                break
+            results.append(item)
+        return results
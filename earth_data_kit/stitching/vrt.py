@@ -0,0 +1,337 @@
+import logging
+import math
+import numpy as np
+from xml.sax.saxutils import escape
+import earth_data_kit.utilities.helpers as helpers
+import earth_data_kit.utilities.transform as transform
+
+logger = logging.getLogger(__name__)
+
+# numpy style dtype names accepted by mosaic(dtype=...) and their GDAL equivalents
+GDAL_TYPE_NAMES = {
+    "uint8": "Byte",
+    "int8": "Int8",
+    "uint16": "UInt16",
+    "int16": "Int16",
+    "uint32": "UInt32",
+    "int32": "Int32",
+    "uint64": "UInt64",
+    "int64": "Int64",
+    "float32": "Float32",
+    "float64": "Float64",
+}
+
+# Tolerance in pixels used when snapping the clip window to the grid, as gdal_translate does
+SNAP_TOLERANCE = 0.001
+
+
+def get_gdal_type_name(dtype):
+    """
+    Returns the GDAL data type name for a numpy style (``float32``) or GDAL style (``Float32``) name.
+    """
+    return GDAL_TYPE_NAMES.get(str(dtype).lower(), str(dtype))
+
+
+def get_color_interp(tiles):
+    """Color interpretation of a band, taken from its first tile. None if unknown or undefined."""
+    values = tiles["color_interp"].dropna()
+    if values.empty or values.iloc[0] == "Undefined":
+        return None
+    return values.iloc[0]
+
+
+def format_number(value):
+    """Formats a number for VRT XML, integral values without a decimal part."""
+    value = float(value)
+    if math.isnan(value):
+        return "nan"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def get_srs_xml(projection):
+    """
+    SRS element of a VRT, with the axis mapping GDAL writes for the projection, so readers do not
+    swap x and y of projections whose official axis order is latitude first, eg: EPSG:4326.
+    """
+    mapping = transform.get_data_axis_mapping(projection)
+    return f'  <SRS dataAxisToSRSAxisMapping="{mapping}">{escape(projection)}</SRS>'
+
+
+def get_mosaic_grid(band_tiles, bands, bbox, grid=None):
+    """
+    Compute the grid of the stacked and clipped mosaic of some bands, from catalog metadata only.
+
+    Mirrors what ``gdal.BuildVRT`` followed by ``gdal.Translate(projWin=...)`` would produce:
+    every band covers the union of its tiles, the stacked mosaic covers the union of the bands
+    at the average of their resolutions, and the clip window is the EPSG:4326 bbox transformed
+    to the mosaic CRS, snapped outwards to whole pixels.
+
+    Args:
+        band_tiles (pd.DataFrame): Tile-band rows, see ``TileTable.band_table``
+        bands (list[str]): Descriptions of the bands to stack
+        bbox (tuple): (xmin, ymin, xmax, ymax) of the clip window in EPSG:4326
+        grid (tuple, optional): (geo_transform, x_size, y_size) of a ``TargetGrid`` the tiles were
+            warped onto, returned as is instead of the grid derived from the tiles and bbox
+
+    Returns:
+        tuple: (geo_transform, x_size, y_size) of the output grid
+
+    Raises:
+        ValueError: If the bands are in different CRSs
+        Exception: If the bbox does not overlap the mosaic
+    """
+    rows = band_tiles[band_tiles["description"].isin(bands)]
+    if rows["projection"].nunique() > 1:
+        raise ValueError(
+            f"Bands to stack have different CRSs. Found: {', '.join(map(str, rows['crs'].unique()))}. "
+            "Please pass the desired CRS using the 'crs' parameter in mosaic() function."
+        )
+    if grid is not None:
+        geo_transform, x_size, y_size = grid
+        return tuple(geo_transform), int(x_size), int(y_size)
+
+    x_res, y_res = [], []
+    for _, tiles in rows.groupby("description", sort=False, observed=True):
+        x_res.append(np.mean((tiles["x_max"] - tiles["x_min"]) / tiles["x_size"]))
+        y_res.append(np.mean((tiles["y_max"] - tiles["y_min"]) / tiles["y_size"]))
+    x_res, y_res = float(np.mean(x_res)), float(np.mean(y_res))
+
+    origin_x, origin_y = rows["x_min"].min(), rows["y_max"].max()
+
+    _, from_wgs84 = transform.get_wgs84_transformers(rows["projection"].iloc[0])
+    clip_xmin, clip_ymin, clip_xmax, clip_ymax = from_wgs84.transform_bounds(
+        *bbox, densify_pts=21
+    )
+    col_start = math.floor((clip_xmin - origin_x) / x_res + SNAP_TOLERANCE)
+    col_end = math.ceil((clip_xmax - origin_x) / x_res - SNAP_TOLERANCE)
+    row_start = math.floor((origin_y - clip_ymax) / y_res + SNAP_TOLERANCE)
+    row_end = math.ceil((origin_y - clip_ymin) / y_res - SNAP_TOLERANCE)
+
+    x_size, y_size = col_end - col_start, row_end - row_start
+    if x_size <= 0 or y_size <= 0:
+        raise Exception("Spatial bounds do not overlap the mosaic")
+
+    geo_transform = (
+        origin_x + col_start * x_res,
+        x_res,
+        0.0,
+        origin_y - row_start * y_res,
+        0.0,
+        -y_res,
+    )
+    return geo_transform, x_size, y_size
+
+
+def _source_windows(tiles, geo_transform, x_size, y_size):
+    """
+    Source and destination windows of every tile in the output grid, clipped to it.
+
+    Returns:
+        tuple: (keep, src, dst) where keep is a mask of tiles overlapping the grid and src, dst
+            are (N, 4) arrays of (x_off, y_off, x_size, y_size) windows of the kept tiles
+    """
+    x_res, y_res = geo_transform[1], -geo_transform[5]
+    dst_x = (tiles["x_min"].to_numpy() - geo_transform[0]) / x_res
+    dst_y = (geo_transform[3] - tiles["y_max"].to_numpy()) / y_res
+    dst_w = (tiles["x_max"].to_numpy() - tiles["x_min"].to_numpy()) / x_res
+    dst_h = (tiles["y_max"].to_numpy() - tiles["y_min"].to_numpy()) / y_res
+
+    x0, x1 = np.maximum(dst_x, 0), np.minimum(dst_x + dst_w, x_size)
+    y0, y1 = np.maximum(dst_y, 0), np.minimum(dst_y + dst_h, y_size)
+    keep = (x1 > x0) & (y1 > y0)
+
+    # Scale factors from destination pixels back to source pixels
+    sx = tiles["x_size"].to_numpy() / dst_w
+    sy = tiles["y_size"].to_numpy() / dst_h
+    src = np.stack(
+        [(x0 - dst_x) * sx, (y0 - dst_y) * sy, (x1 - x0) * sx, (y1 - y0) * sy], axis=1
+    )
+    dst = np.stack([x0, y0, x1 - x0, y1 - y0], axis=1)
+    # Windows that are whole pixels up to floating point noise are written as such
+    return keep, np.round(src[keep], 6), np.round(dst[keep], 6)
+
+
+def _band_xml(band_num, description, tiles, geo_transform, x_size, y_size, dtype):
+    keep, src, dst = _source_windows(tiles, geo_transform, x_size, y_size)
+    tiles = tiles[keep]
+
+    data_type = get_gdal_type_name(
+        dtype if dtype is not None else tiles["dtype"].iloc[0]
+    )
+    lines = [f'  <VRTRasterBand dataType="{data_type}" band="{band_num}">']
+    lines.append(f"    <Description>{escape(description)}</Description>")
+    color_interp = get_color_interp(tiles)
+    if color_interp is not None:
+        lines.append(f"    <ColorInterp>{escape(color_interp)}</ColorInterp>")
+    has_nodata = (
+        tiles["nodataval"].notna().to_numpy() if len(tiles) else np.zeros(0, dtype=bool)
+    )
+    if has_nodata.any():
+        lines.append(
+            f"    <NoDataValue>{format_number(tiles['nodataval'].to_numpy()[has_nodata][0])}</NoDataValue>"
+        )
+
+    for i, row in enumerate(tiles.itertuples(index=False)):
+        # Source properties let GDAL defer opening the source until its pixels are actually read
+        block = (
+            f' BlockXSize="{row.block_x_size}" BlockYSize="{row.block_y_size}"'
+            if row.block_x_size > 0 and row.block_y_size > 0
+            else ""
+        )
+        source = "ComplexSource" if has_nodata[i] else "SimpleSource"
+        lines.append(f"    <{source}>")
+        lines.append(
+            f'      <SourceFilename relativeToVRT="0">{escape(row.gdal_path)}</SourceFilename>'
+        )
+        lines.append(f"      <SourceBand>{row.source_idx}</SourceBand>")
+        lines.append(
+            f'      <SourceProperties RasterXSize="{row.x_size}" RasterYSize="{row.y_size}" '
+            f'DataType="{get_gdal_type_name(row.dtype)}"{block} />'
+        )
+        lines.append(
+            '      <SrcRect xOff="{}" yOff="{}" xSize="{}" ySize="{}" />'.format(
+                *map(format_number, src[i])
+            )
+        )
+        lines.append(
+            '      <DstRect xOff="{}" yOff="{}" xSize="{}" ySize="{}" />'.format(
+                *map(format_number, dst[i])
+            )
+        )
+        if has_nodata[i]:
+            lines.append(f"      <NODATA>{format_number(row.nodataval)}</NODATA>")
+        lines.append(f"    </{source}>")
+
+    lines.append("  </VRTRasterBand>")
+    return lines
+
+
+def get_bands_found(band_tiles, bands):
+    """
+    Requested bands that have tiles, in requested order. Missing bands are skipped with a warning.
+
+    Raises:
+        Exception: If none of the bands have tiles
+    """
+    present = set(band_tiles["description"].unique())
+    bands_found = []
+    for band_desc in bands:
+        if band_desc in present:
+            bands_found.append(band_desc)
+        else:
+            logger.warning(
+                f"No tiles found for band '{band_desc}'. Skipping this band."
+            )
+    if not bands_found:
+        raise Exception("None of the requested bands have tiles")
+    return bands_found
+
+
+def build_stack_vrt(band_sources, projection, geo_transform, x_size, y_size):
+    """
+    Build the XML of a VRT stacking single band datasets that all share the output grid.
+
+    Args:
+        band_sources (list[dict]): One dictionary per output band with path, description, dtype,
+            nodataval and color_interp keys
+        projection (str): CRS of the output grid
+        geo_transform (tuple): Geotransform of the output grid
+        x_size (int): Width of the output grid
+        y_size (int): Height of the output grid
+
+    Returns:
+        str: The VRT XML
+    """
+    lines = [f'<VRTDataset rasterXSize="{x_size}" rasterYSize="{y_size}">']
+    lines.append(get_srs_xml(projection))
+    lines.append(
+        f"  <GeoTransform>{', '.join(map(format_number, geo_transform))}</GeoTransform>"
+    )
+    for band_num, source in enumerate(band_sources, start=1):
+        lines.append(
+            f'  <VRTRasterBand dataType="{source["dtype"]}" band="{band_num}">'
+        )
+        lines.append(f"    <Description>{escape(source['description'])}</Description>")
+        if source["nodataval"] is not None:
+            lines.append(
+                f"    <NoDataValue>{format_number(source['nodataval'])}</NoDataValue>"
+            )
+        if source["color_interp"] is not None:
+            lines.append(
+                f"    <ColorInterp>{escape(source['color_interp'])}</ColorInterp>"
+            )
+        lines.append("    <SimpleSource>")
+        lines.append(
+            f'      <SourceFilename relativeToVRT="0">{escape(source["path"])}</SourceFilename>'
+        )
+        lines.append("      <SourceBand>1</SourceBand>")
+        lines.append(
+            f'      <SourceProperties RasterXSize="{x_size}" RasterYSize="{y_size}" DataType="{source["dtype"]}" />'
+        )
+        lines.append(
+            f'      <SrcRect xOff="0" yOff="0" xSize="{x_size}" ySize="{y_size}" />'
+        )
+        lines.append(
+            f'      <DstRect xOff="0" yOff="0" xSize="{x_size}" ySize="{y_size}" />'
+        )
+        lines.append("    </SimpleSource>")
+        lines.append("  </VRTRasterBand>")
+    lines.append("</VRTDataset>")
+    return "\n".join(lines) + "\n"
+
+
+def build_mosaic_vrt(band_tiles, bands, bbox, dtype=None, grid=None):
+    """
+    Build the XML of a stacked and clipped mosaic VRT, from catalog metadata only.
+
+    This is the equivalent of mosaicking every band with ``gdal.BuildVRT``, stacking the band
+    mosaics with ``separate=True`` and clipping with ``gdal.Translate``, without opening any
+    source. Windows are computed analytically from the tile geotransforms and sizes and the
+    sources carry their size, data type and block size, so GDAL does not need to open them
+    before reading pixels either.
+
+    Args:
+        band_tiles (pd.DataFrame): Tile-band rows of a single date, see ``TileTable.band_table``.
+            Tiles must be north-up.
+        bands (list[str]): Ordered list of band descriptions to stack
+        bbox (tuple): (xmin, ymin, xmax, ymax) of the clip window in EPSG:4326
+        dtype (str, optional): Output data type, defaults to the data type of the tiles
+        grid (tuple, optional): (geo_transform, x_size, y_size) of the output grid, see ``get_mosaic_grid``
+
+    Returns:
+        tuple: (xml, bands_found) with the VRT XML and the descriptions of the bands that had
+            tiles, in output order
+    """
+    bands_found = get_bands_found(band_tiles, bands)
+    geo_transform, x_size, y_size = get_mosaic_grid(band_tiles, bands_found, bbox, grid)
+    projection = band_tiles.loc[
+        band_tiles["description"].isin(bands_found), "projection"
+    ].iloc[0]
+
+    lines = [f'<VRTDataset rasterXSize="{x_size}" rasterYSize="{y_size}">']
+    lines.append(get_srs_xml(projection))
+    lines.append(
+        f"  <GeoTransform>{', '.join(map(format_number, geo_transform))}</GeoTransform>"
+    )
+    for band_num, band_desc in enumerate(bands_found, start=1):
+        tiles = band_tiles[band_tiles["description"] == band_desc]
+        lines.extend(
+            _band_xml(band_num, band_desc, tiles, geo_transform, x_size, y_size, dtype)
+        )
+    lines.append("</VRTDataset>")
+
+    return "\n".join(lines) + "\n", bands_found
+
+
+def write_mosaic_vrt(path, band_tiles, bands, bbox, dtype=None, grid=None):
+    """
+    Write the stacked and clipped mosaic VRT of some bands, see ``build_mosaic_vrt``.
+
+    Returns:
+        list[str]: Descriptions of the bands written, in output order
+    """
+    xml, bands_found = build_mosaic_vrt(band_tiles, bands, bbox, dtype, grid)
+    helpers.make_sure_dir_exists(path)
+    with open(path, "w") as f:
+        f.write(xml)
+    return bands_found
@@ -0,0 +1,224 @@
+import os
+import json
+import uuid
+import hashlib
+import logging
+import concurrent.futures
+import numpy as np
+from osgeo import gdal
+from tqdm import tqdm
+import earth_data_kit.utilities.helpers as helpers
+import earth_data_kit.utilities.geo as geo
+import earth_data_kit.stitching.executors as executors
+
+gdal.UseExceptions()
+
+logger = logging.getLogger(__name__)
+
+
+def get_warp_key(
+    gdal_path, version, crs, resolution, resampling, materialize, bounds=None
+):
+    """
+    Key of a warped tile. Warped outputs only depend on the source, its version and the warp
+    parameters, so the same key is shared by every band and date using the source, and by later
+    runs until the source changes, see ``geo.get_source_version``.
+    """
+    key = [
+        gdal_path,
+        version,
+        crs,
+        [float(r) for r in resolution],
+        resampling,
+        materialize,
+    ]
+    if bounds is not None:
+        key.append([float(b) for b in bounds])
+    return hashlib.md5(json.dumps(key).encode("utf-8")).hexdigest()
+
+
+def get_output(output_path):
+    """
+    Path, geo_transform, size and block size of a local output, eg: a warped or clipped tile.
+
+    Args:
+        output_path (str): Path of the output
+
+    Returns:
+        dict: path, geo_transform, x_size, y_size, block_x_size and block_y_size of the output
+    """
+    ds = gdal.Open(output_path)
+    block_x_size, block_y_size = ds.GetRasterBand(1).GetBlockSize()
+    result = {
+        "path": output_path,
+        "geo_transform": ds.GetGeoTransform(),
+        "x_size": ds.RasterXSize,
+        "y_size": ds.RasterYSize,
+        "block_x_size": block_x_size,
+        "block_y_size": block_y_size,
+    }
+    ds = None
+    return result
+
+
+def set_outputs(df, outputs):
+    """
+    Point tile-band rows to local outputs, see ``get_output``.
+
+    Args:
+        df (pd.DataFrame): Tile-band rows, see ``TileTable.band_table``
+        outputs (list[dict]): Output of every row
+
+    Returns:
+        pd.DataFrame: A copy of the rows with gdal_path, extent, size and block size columns
+            describing the outputs
+    """
+    df = df.copy()
+    gt = np.array([o["geo_transform"] for o in outputs], dtype=np.float64).reshape(
+        -1, 6
+    )
+    x_size = np.array([o["x_size"] for o in outputs], dtype=np.int64)
+    y_size = np.array([o["y_size"] for o in outputs], dtype=np.int64)
+
+    df["gdal_path"] = [o["path"] for o in outputs]
+    df["x_min"] = gt[:, 0]
+    df["y_max"] = gt[:, 3]
+    df["x_max"] = gt[:, 0] + gt[:, 1] * x_size
+    df["y_min"] = gt[:, 3] + gt[:, 5] * y_size
+    df["x_size"] = x_size
+    df["y_size"] = y_size
+    df["block_x_size"] = [o["block_x_size"] for o in outputs]
+    df["block_y_size"] = [o["block_y_size"] for o in outputs]
+    return df
+
+
+def warp_tile(
+    gdal_path, output_path, crs, resolution, resampling, materialize, bounds=None
+):
+    """
+    Warp a tile to the target CRS and resolution, reusing a previous output if present.
+
+    Outputs are aligned on multiples of the resolution, or on the pixels of the target grid
+    the bounds were snapped to, so warped tiles share a common grid and mosaic without resampling.
+
+    Args:
+        gdal_path (str): Source path
+        output_path (str): Path of the warped output, a VRT or a COG when materialize is True
+        crs (str): Target CRS
+        resolution (tuple): Target (x_res, y_res)
+        resampling (str): GDAL resampling algorithm
+        materialize (bool): Write a local tiled COG instead of a warped VRT
+        bounds (tuple, optional): (xmin, ymin, xmax, ymax) of the output in the target CRS, aligned
+            on a ``TargetGrid``
+
+    Returns:
+        dict: Path, geo_transform, size and block size of the warped tile
+    """
+    if not os.path.exists(output_path):
+        # Written next to the final path and moved in place, so a reused output is always complete
+        tmp_path = f"{os.path.splitext(output_path)[0]}.{uuid.uuid4()}.tmp{os.path.splitext(output_path)[1]}"
+        if bounds is not None:
+            alignment = {"outputBounds": list(bounds)}
+        else:
+            alignment = {"targetAlignedPixels": True}
+        if materialize:
+            options = gdal.WarpOptions(
+                format="COG",
+                xRes=resolution[0],
+                yRes=resolution[1],
+                dstSRS=crs,
+                resampleAlg=resampling,
+                **alignment,
+                multithread=True,
+                warpOptions=["NUM_THREADS=ALL_CPUS"],
+                creationOptions=[
+                    "BLOCKSIZE=512",
+                    "COMPRESS=DEFLATE",
+                    "NUM_THREADS=ALL_CPUS",
+                ],
+            )
+        else:
+            options = gdal.WarpOptions(
+                format="VRT",
+                xRes=resolution[0],
+                yRes=resolution[1],
+                dstSRS=crs,
+                resampleAlg=resampling,
+                **alignment,
+            )
+        ds = gdal.Warp(tmp_path, gdal_path, options=options)
+        ds.Close()
+        os.replace(tmp_path, output_path)
+
+    return get_output(output_path)
+
+
+def warp_tiles(
+    df, warp_dir, crs, resolution, resampling="nearest", materialize=False, grid=None
+):
+    """
+    Warp the tiles of a tile-band table in parallel and point the table to the warped outputs.
+
+    Every distinct source is warped once, whatever the number of its bands and dates, and its
+    output is keyed by (source, source version, crs, resolution, resampling), so later runs reuse it
+    until the source changes.
+
+    Args:
+        df (pd.DataFrame): Tile-band rows, see ``TileTable.band_table``
+        warp_dir (str): Directory of the warped outputs, kept across runs
+        crs (str): Target CRS
+        resolution (tuple): Target (x_res, y_res)
+        resampling (str, optional): GDAL resampling algorithm. Defaults to ``nearest``
+        materialize (bool, optional): Write local tiled COGs with multithreaded warping instead of
+            warped VRTs, so reads do not reproject on the fly. Defaults to False
+        grid (TargetGrid, optional): Grid to warp the tiles onto, overriding crs and resolution.
+            Tiles outside the grid are dropped
+
+    Returns:
+        pd.DataFrame: The tile-band rows with gdal_path, grid placement, resolution and crs
+            columns describing the warped tiles
+    """
+    helpers.make_sure_dir_exists(warp_dir)
+    extension = "tif" if materialize else "vrt"
+
+    bounds = {}
+    if grid is not None:
+        crs, resolution = grid.crs, grid.get_resolution()
+        tile_bounds = grid.get_tile_bounds(df)
+        inside = ~np.isnan(tile_bounds).any(axis=1)
+        df = df[inside]
+        bounds = dict(zip(df["gdal_path"], map(tuple, tile_bounds[inside])))
+    sources = df["gdal_path"].unique()
+
+    warped = {}
+    with executors.get_executor("thread") as executor:
+        versions = dict(zip(sources, executor.map(geo.get_source_version, sources)))
+        futures = {
+            executor.submit(
+                warp_tile,
+                source,
+                f"{warp_dir}/{get_warp_key(source, versions[source], crs, resolution, resampling, materialize, bounds.get(source))}.{extension}",
+                crs,
+                resolution,
+                resampling,
+                materialize,
+                bounds.get(source),
+            ): source
+            for source in sources
+        }
+        for future in tqdm(
+            concurrent.futures.as_completed(futures),
+            total=len(futures),
+            desc="Warping tiles",
+            unit="tile",
+        ):
+            warped[futures[future]] = future.result()
+
+    rows = [warped[source] for source in df["gdal_path"]]
+    df = set_outputs(df, rows)
+    gt = np.array([r["geo_transform"] for r in rows], dtype=np.float64).reshape(-1, 6)
+    df["x_res"] = np.round(gt[:, 1], 6)
+    df["y_res"] = np.round(gt[:, 5], 6)
+    df["crs"] = crs
+    df["projection"] = crs
+    return df
@@ -1,8 +1,11 @@
 from osgeo import gdal, osr
+import os
+import copy
 import logging
 from earth_data_kit.stitching import decorators
 import earth_data_kit as edk
 import shapely
+import numpy as np
 import json
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_not_exception_type
 
@@ -36,11 +39,11 @@ def warp_and_get_extent(df_row):
     ds = gdal.Warp(
         "/vsimem/reprojected.tif", gdal.Open(df_row.gdal_path), dstSRS="EPSG:4326"
     )
-    geo_transform = ds.GetGeoTransform() # type: ignore
+    geo_transform = ds.GetGeoTransform()  # type: ignore
     x_min = geo_transform[0]
     y_max = geo_transform[3]
-    x_max = x_min + geo_transform[1] * ds.RasterXSize # type: ignore
-    y_min = y_max + geo_transform[5] * ds.RasterYSize # type: ignore
+    x_max = x_min + geo_transform[1] * ds.RasterXSize  # type: ignore
+    y_min = y_max + geo_transform[5] * ds.RasterYSize  # type: ignore
     polygon = shapely.geometry.box(x_min, y_min, x_max, y_max, ccw=True)
     ds = None
     return polygon
@@ -60,7 +63,7 @@ def get_bbox_from_raster(raster_path):
     xmin, ymax, xmax, ymin = ulx, uly, lrx, lry
 
     # TODO: Make the fetching of CRS dynamic instead of hardcoding it to 3857
-    lon_min, lat_min, lon_max, lat_max = edk.utilities.transform.transform_bbox( # type: ignore
+    lon_min, lat_min, lon_max, lat_max = edk.utilities.transform.transform_bbox(  # type: ignore
         xmin, ymin, xmax, ymax, 3857, 4326
     )
 
@@ -86,11 +89,17 @@ def _get_bands(ds, band_locator="description"):
                 f"Invalid band locator: {band_locator}. Should be one of: `desc`, `color_interp`, `filename`"
             )
 
+        block_x_size, block_y_size = band.GetBlockSize()
         b = {
             "source_idx": i,
             "description": (band_name if band_name != "" else "NoDescription"),
             "dtype": gdal.GetDataTypeName(band.DataType),
             "nodataval": band.GetNoDataValue(),
+            "block_x_size": block_x_size,
+            "block_y_size": block_y_size,
+            "color_interp": gdal.GetColorInterpretationName(
+                band.GetColorInterpretation()
+            ),
         }
         bands.append(b)
     return bands
@@ -123,7 +132,7 @@ def get_metadata(raster_path, band_locator):
     o = {
         "geo_transform": gt,
         "x_size": ds.RasterXSize,
-        "y_size": ds.RasterXSize,
+        "y_size": ds.RasterYSize,
         "projection": projection,
         "crs": "EPSG:" + osr.SpatialReference(projection).GetAttrValue("AUTHORITY", 1),
         "bands": _get_bands(ds, band_locator),
@@ -157,7 +166,79 @@ def get_subdatasets(gdal_path):
     return get_subdatasets_recursive(gdal_path)
 
 
-def tile_intersects(tile, bbox):
-    return shapely.intersects(
-        shapely.geometry.box(*tile.get_wgs_extent(), ccw=True), bbox
-    )
+def to_aoi_geometry(bbox):
+    """
+    Normalise a user supplied area of interest into a shapely geometry.
+
+    Parameters:
+        bbox (tuple or shapely.Geometry): Either a (xmin, ymin, xmax, ymax) tuple or a
+            shapely geometry (e.g. Polygon, MultiPolygon) in EPSG:4326.
+
+    Returns:
+        shapely.Geometry: The area of interest as a geometry.
+    """
+    if isinstance(bbox, shapely.Geometry):
+        return bbox
+    return shapely.geometry.box(*bbox, ccw=True)
+
+
+def intersects_aoi(footprints, aoi):
+    """
+    Vectorised intersection test of tile footprints against an area of interest.
+
+    The footprints are packed into an STRtree and queried once with the area of
+    interest, so the exact predicate is only evaluated for candidate tiles whose
+    envelopes overlap it.
+
+    Parameters:
+        footprints (numpy.ndarray): Array of shapely geometries in EPSG:4326.
+        aoi (shapely.Geometry): Area of interest in EPSG:4326.
+
+    Returns:
+        numpy.ndarray: Boolean mask, True where the footprint intersects the aoi.
+    """
+    mask = np.zeros(len(footprints), dtype=bool)
+    if len(footprints) == 0:
+        return mask
+
+    tree = shapely.STRtree(footprints)
+    # Prepare a copy, the aoi belongs to the caller
+    aoi = copy.copy(aoi)
+    shapely.prepare(aoi)
+    mask[tree.query(aoi, predicate="intersects")] = True
+    return mask
+
+
+def get_source_version(gdal_path):
+    """
+    Version of the file behind a GDAL path, changing whenever the file is replaced.
+
+    Local files are versioned by their size and modification time, remote files by the ETag,
+    or the Last-Modified date and size, returned by a HEAD request. Subdataset paths such as
+    ``NETCDF:"/path/file.nc":var`` are versioned by their file.
+
+    Parameters:
+        gdal_path (str): GDAL path of a tile
+
+    Returns:
+        str: The version, empty if it could not be determined
+    """
+    path = gdal_path
+    if '"' in gdal_path:
+        path = gdal_path.split('"')[1]
+
+    if not path.startswith("/vsi"):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return ""
+        return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+    try:
+        headers = gdal.GetFileMetadata(path, None) or {}
+    except RuntimeError:
+        return ""
+    headers = {k.lower(): v for k, v in headers.items()}
+    if "etag" in headers:
+        return headers["etag"].strip('"')
+    return f"{headers.get('content-length', '')}-{headers.get('last-modified', '')}"
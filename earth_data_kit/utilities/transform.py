@@ -1,6 +1,10 @@
 import logging
+import functools
+import warnings
 from osgeo import gdal, osr
 import numpy as np
+import shapely
+from pyproj import CRS, Transformer
 
 logger = logging.getLogger(__name__)
 
@@ -85,3 +89,253 @@ def transform_bbox(xmin, ymin, xmax, ymax, source_epsg, target_epsg):
         max(x_transformed),
         max(y_transformed),
     )
+
+
+@functools.lru_cache(maxsize=256)
+def get_wgs84_transformers(projection):
+    """
+    Return cached forward and inverse transformers between a projection and EPSG:4326.
+
+    Transformers are expensive to build, so they are created once per projection and
+    reused for every tile sharing it. Axis order is always (x, y) / (lon, lat).
+
+    Parameters:
+        projection (str): WKT, PROJ string or authority code of the source projection
+
+    Returns:
+        tuple: (to_wgs84, from_wgs84) pyproj Transformers
+    """
+    src = CRS.from_user_input(projection)
+    dst = CRS.from_epsg(4326)
+    return (
+        Transformer.from_crs(src, dst, always_xy=True),
+        Transformer.from_crs(dst, src, always_xy=True),
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def get_data_axis_mapping(projection):
+    """
+    Return the mapping of (x, y) data axes to the axes of a projection, as GDAL writes it in the
+    ``dataAxisToSRSAxisMapping`` attribute of VRT and GTI files.
+
+    Data is always (x, y) / (lon, lat), so the mapping is "2,1" for projections whose official
+    axis order is latitude first, eg: EPSG:4326, and "1,2" otherwise.
+
+    Parameters:
+        projection (str): WKT, PROJ string or authority code of the projection
+
+    Returns:
+        str: Comma separated mapping, eg: "1,2"
+    """
+    srs = osr.SpatialReference()
+    srs.SetFromUserInput(projection)
+    srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    return ",".join(str(axis) for axis in srs.GetDataAxisToSRSAxisMapping())
+
+
+@functools.lru_cache(maxsize=256)
+def get_transformer(src_projection, dst_projection):
+    """
+    Return a cached transformer between two projections, axis order always being (x, y) / (lon, lat).
+
+    Parameters:
+        src_projection (str): WKT, PROJ string or authority code of the source projection
+        dst_projection (str): WKT, PROJ string or authority code of the target projection
+
+    Returns:
+        pyproj.Transformer: The transformer
+    """
+    return Transformer.from_crs(
+        CRS.from_user_input(src_projection),
+        CRS.from_user_input(dst_projection),
+        always_xy=True,
+    )
+
+
+def transform_extents(extents, src_projection, dst_projection, densify=21):
+    """
+    Transform many extents at once, densifying their edges so curved edges in the target
+    projection are accounted for.
+
+    Parameters:
+        extents (array-like): Array of shape (N, 4) of (xmin, ymin, xmax, ymax) in src_projection
+        src_projection (str): Projection of the extents
+        dst_projection (str): Target projection
+        densify (int, optional): Number of points sampled along each edge. Defaults to 21
+
+    Returns:
+        numpy.ndarray: Array of shape (N, 4) of the bounding extents in dst_projection, NaN where
+            the transform failed
+    """
+    extents = np.asarray(extents, dtype=np.float64).reshape(-1, 4)
+    t = np.linspace(0.0, 1.0, densify)
+    xmin, ymin, xmax, ymax = (extents[:, i : i + 1] for i in range(4))
+    width, height = xmax - xmin, ymax - ymin
+    xs = np.concatenate(
+        [xmin + t * width, xmin + t * width, xmin + 0 * t, xmax + 0 * t], axis=1
+    )
+    ys = np.concatenate(
+        [ymin + 0 * t, ymax + 0 * t, ymin + t * height, ymin + t * height], axis=1
+    )
+
+    with np.errstate(all="ignore"):
+        tx, ty = get_transformer(src_projection, dst_projection).transform(
+            xs, ys, errcheck=False
+        )
+    tx = np.where(np.isfinite(tx), tx, np.nan)
+    ty = np.where(np.isfinite(ty), ty, np.nan)
+    with warnings.catch_warnings():
+        # All-NaN rows are extents that could not be transformed
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.stack(
+            [
+                np.nanmin(tx, axis=1),
+                np.nanmin(ty, axis=1),
+                np.nanmax(tx, axis=1),
+                np.nanmax(ty, axis=1),
+            ],
+            axis=1,
+        )
+
+
+def _edge_pixels(x_sizes, y_sizes, densify):
+    """Pixel/line coordinates of the densified outline of every raster, shape (N, 4 * densify)."""
+    t = np.linspace(0.0, 1.0, densify)
+    xs = x_sizes[:, None].astype(np.float64)
+    ys = y_sizes[:, None].astype(np.float64)
+    zeros = np.zeros((len(x_sizes), densify))
+    px = np.concatenate([t * xs, t * xs, zeros, zeros + xs], axis=1)
+    py = np.concatenate([zeros, zeros + ys, t * ys, t * ys], axis=1)
+    return px, py
+
+
+def _contains_pole(gt, x_sizes, y_sizes, from_wgs84, lat):
+    """
+    Returns a boolean mask of rasters whose pixel grid contains the given pole strictly inside.
+
+    Rasters only touching the pole with an edge or a corner, eg: the quadrants of a polar grid,
+    already reach it through their outline and do not cover all longitudes.
+    """
+    with np.errstate(all="ignore"):
+        x, y = from_wgs84.transform(0.0, lat)
+    if not (np.isfinite(x) and np.isfinite(y)):
+        return np.zeros(len(gt), dtype=bool)
+
+    # Inverting the affine geotransform for every raster at once
+    det = gt[:, 1] * gt[:, 5] - gt[:, 2] * gt[:, 4]
+    with np.errstate(all="ignore"):
+        dx = x - gt[:, 0]
+        dy = y - gt[:, 3]
+        col = (gt[:, 5] * dx - gt[:, 2] * dy) / det
+        row = (gt[:, 1] * dy - gt[:, 4] * dx) / det
+    return (col > 0) & (col < x_sizes) & (row > 0) & (row < y_sizes)
+
+
+def get_wgs84_footprints(
+    geo_transforms, x_sizes, y_sizes, projections, densify=21, projection_table=None
+):
+    """
+    Compute EPSG:4326 footprints of many rasters from their georeferencing only.
+
+    Rasters are grouped by projection and one cached transformer is used per group.
+    The outline of every raster is densified and transformed in a single vectorised
+    call, so curved edges in the target CRS are accounted for. Rasters covering a pole
+    are extended analytically to that pole over all longitudes, and rasters crossing the
+    antimeridian are split into two boxes on either side of it. No file is opened.
+
+    Parameters:
+        geo_transforms (array-like): Array of shape (N, 6) of GDAL geotransforms
+        x_sizes (array-like): Raster widths in pixels
+        y_sizes (array-like): Raster heights in pixels
+        projections (array-like): Projection (WKT or authority code) of every raster
+        densify (int, optional): Number of points sampled along each edge. Defaults to 21
+        projection_table (array-like, optional): If given, ``projections`` holds integer codes
+            into this table of interned projections instead of the projections themselves
+
+    Returns:
+        numpy.ndarray: Array of N shapely geometries (boxes, or multipolygons for rasters
+            crossing the antimeridian)
+    """
+    gt = np.asarray(geo_transforms, dtype=np.float64).reshape(-1, 6)
+    x_sizes = np.asarray(x_sizes, dtype=np.float64)
+    y_sizes = np.asarray(y_sizes, dtype=np.float64)
+    if projection_table is None:
+        projections = np.asarray(projections, dtype=object)
+    else:
+        projections = np.asarray(projections)
+
+    extents = np.full((len(gt), 4), np.nan)
+    crosses_antimeridian = np.zeros(len(gt), dtype=bool)
+
+    if len(gt) == 0:
+        return np.empty(0, dtype=object)
+
+    unique_projections, group_ids = np.unique(projections, return_inverse=True)
+    for group_id, projection in enumerate(unique_projections):
+        idx = np.flatnonzero(group_ids == group_id)
+        g = gt[idx]
+        if projection_table is not None:
+            projection = projection_table[projection]
+        to_wgs84, from_wgs84 = get_wgs84_transformers(projection)
+
+        px, py = _edge_pixels(x_sizes[idx], y_sizes[idx], densify)
+        x = g[:, [0]] + px * g[:, [1]] + py * g[:, [2]]
+        y = g[:, [3]] + px * g[:, [4]] + py * g[:, [5]]
+
+        with np.errstate(all="ignore"):
+            lon, lat = to_wgs84.transform(x.ravel(), y.ravel())
+        lon = np.asarray(lon).reshape(x.shape)
+        lat = np.asarray(lat).reshape(x.shape)
+        invalid = ~(np.isfinite(lon) & np.isfinite(lat))
+        lon[invalid] = np.nan
+        lat[invalid] = np.nan
+        # The longitude of a pole is arbitrary, outlines touching it get their longitudes from the other points
+        lon[np.abs(lat) > 90.0 - 1e-9] = np.nan
+
+        # All-NaN rows are expected for outlines that could not be transformed at all
+        with np.errstate(all="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            min_lon = np.nanmin(lon, axis=1)
+            max_lon = np.nanmax(lon, axis=1)
+            min_lat = np.nanmin(lat, axis=1)
+            max_lat = np.nanmax(lat, axis=1)
+
+            # Edges jumping by more than half the globe means the outline wraps around the antimeridian
+            shifted = np.where(lon < 0, lon + 360.0, lon)
+            min_shifted = np.nanmin(shifted, axis=1)
+            max_shifted = np.nanmax(shifted, axis=1)
+        wraps = (max_lon - min_lon > 180.0) & (max_shifted - min_shifted < 180.0)
+
+        north = _contains_pole(g, x_sizes[idx], y_sizes[idx], from_wgs84, 90.0)
+        south = _contains_pole(g, x_sizes[idx], y_sizes[idx], from_wgs84, -90.0)
+        max_lat = np.where(north, 90.0, max_lat)
+        min_lat = np.where(south, -90.0, min_lat)
+        polar = north | south
+        min_lon = np.where(polar, -180.0, np.where(wraps, min_shifted, min_lon))
+        max_lon = np.where(polar, 180.0, np.where(wraps, max_shifted, max_lon))
+
+        extents[idx] = np.stack([min_lon, min_lat, max_lon, max_lat], axis=1)
+        crosses_antimeridian[idx] = wraps & ~polar
+
+    unresolved = np.isnan(extents).any(axis=1)
+    if unresolved.any():
+        logger.warning(
+            f"Could not transform the outline of {int(unresolved.sum())} tile(s) to EPSG:4326. "
+            "Assuming a global footprint for them."
+        )
+        extents[unresolved] = [-180.0, -90.0, 180.0, 90.0]
+
+    footprints = shapely.box(
+        extents[:, 0], extents[:, 1], np.minimum(extents[:, 2], 180.0), extents[:, 3]
+    )
+    for i in np.flatnonzero(crosses_antimeridian):
+        min_lon, min_lat, max_lon, max_lat = extents[i]
+        footprints[i] = shapely.MultiPolygon(
+            [
+                shapely.box(min_lon, min_lat, 180.0, max_lat),
+                shapely.box(-180.0, min_lat, max_lon - 360.0, max_lat),
+            ]
+        )
+
+    return footprints
@@ -1,6 +1,7 @@
 import xarray as xr
 import logging
 import earth_data_kit.stitching.decorators as decorators
+import earth_data_kit.stitching.executors as executors
 from earth_data_kit.xarray_boosted.plotters.folium import Folium
 from osgeo import gdal
 import earth_data_kit.utilities.helpers as helpers
@@ -132,9 +133,7 @@ class EDKAccessor:
         futures = []
         num_bands, width, height = da.shape
 
-        with concurrent.futures.ProcessPoolExecutor(
-            max_workers=helpers.get_processpool_workers()
-        ) as executor:
+        with executors.get_executor("process") as executor:
             args = []
             for band_idx in range(0, num_bands):
                 x_chunk_size, y_chunk_size = (
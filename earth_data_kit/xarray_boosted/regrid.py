@@ -0,0 +1,325 @@
+import os
+import hashlib
+import logging
+import functools
+import numpy as np
+import scipy.sparse
+import dask.array as dsa
+import xarray as xr
+import earth_data_kit.utilities.helpers as helpers
+
+logger = logging.getLogger(__name__)
+
+METHODS = {
+    "nearest": "nearest",
+    "linear": "bilinear",
+    "bilinear": "bilinear",
+    "conservative": "conservative",
+    "average": "conservative",
+}
+# Output chunk size along x and y when the reference grid is not chunked
+DEFAULT_CHUNK_SIZE = 1024
+# Version of the weights, part of their hash so weights cached by a previous version are not reused
+WEIGHTS_VERSION = 2
+
+
+def get_cell_edges(centers):
+    """
+    Lower and upper edges of the cells of a 1D grid of cell centers, ascending or descending.
+    Inner edges are half way between centers, outer edges half a cell beyond the outer centers.
+    """
+    centers = np.asarray(centers, dtype=np.float64)
+    if len(centers) == 1:
+        # A single cell has no known size, it only covers its center
+        return centers.copy(), centers.copy()
+    mids = (centers[1:] + centers[:-1]) / 2
+    edges = np.concatenate(
+        [
+            [centers[0] - (mids[0] - centers[0])],
+            mids,
+            [centers[-1] + (centers[-1] - mids[-1])],
+        ]
+    )
+    return np.minimum(edges[:-1], edges[1:]), np.maximum(edges[:-1], edges[1:])
+
+
+def _nearest_weights(src, dst):
+    """(rows, cols, values) of the nearest source cell of every destination center within the source grid."""
+    lo, hi = get_cell_edges(src)
+    order = np.argsort(src, kind="stable")
+    s = src[order]
+
+    pos = np.clip(np.searchsorted(s, dst), 1, max(len(s) - 1, 1))
+    left = np.maximum(pos - 1, 0)
+    right = np.minimum(pos, len(s) - 1)
+    nearest = np.where(np.abs(dst - s[left]) <= np.abs(s[right] - dst), left, right)
+    cols = order[nearest]
+
+    inside = (dst >= lo[cols]) & (dst <= hi[cols])
+    rows = np.nonzero(inside)[0]
+    return rows, cols[inside], np.ones(len(rows))
+
+
+def _bilinear_weights(src, dst):
+    """
+    (rows, cols, values) interpolating linearly between the two source centers around every
+    destination center. Like ``DataArray.interp``, destination centers beyond the outer source
+    centers are not extrapolated and get no weights.
+    """
+    if len(src) < 2:
+        return _nearest_weights(src, dst)
+    order = np.argsort(src, kind="stable")
+    s = src[order]
+
+    inside = (dst >= s[0]) & (dst <= s[-1])
+    rows = np.nonzero(inside)[0]
+    d = dst[inside]
+    left = np.clip(np.searchsorted(s, d, side="right") - 1, 0, len(s) - 2)
+    t = np.clip((d - s[left]) / (s[left + 1] - s[left]), 0.0, 1.0)
+
+    rows = np.concatenate([rows, rows])
+    cols = np.concatenate([order[left], order[left + 1]])
+    values = np.concatenate([1.0 - t, t])
+    keep = values > 0
+    return rows[keep], cols[keep], values[keep]
+
+
+def _conservative_weights(src, dst):
+    """
+    (rows, cols, values) averaging the source cells overlapping every destination cell, weighted
+    by the length of their overlap. Weights of a destination cell sum to one over the part of it
+    covered by the source grid.
+    """
+    lo, hi = get_cell_edges(src)
+    d_lo, d_hi = get_cell_edges(dst)
+    order = np.argsort(lo, kind="stable")
+    s_lo, s_hi = lo[order], hi[order]
+
+    # Source cells overlapping [d_lo, d_hi], the cells being sorted and contiguous
+    first = np.searchsorted(s_hi, d_lo, side="right")
+    last = np.searchsorted(s_lo, d_hi, side="left")
+    counts = np.maximum(last - first, 0)
+
+    rows = np.repeat(np.arange(len(dst)), counts)
+    sorted_cols = np.repeat(first, counts) + (
+        np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    )
+    overlap = np.minimum(d_hi[rows], s_hi[sorted_cols]) - np.maximum(
+        d_lo[rows], s_lo[sorted_cols]
+    )
+    if len(src) == 1 or len(dst) == 1:
+        # Zero width cells, count them when they fall inside the other cell
+        overlap = np.where(overlap >= 0, np.maximum(overlap, 1.0), 0.0)
+
+    keep = overlap > 0
+    rows, cols, overlap = rows[keep], order[sorted_cols[keep]], overlap[keep]
+    totals = np.bincount(rows, weights=overlap, minlength=len(dst))
+    return rows, cols, overlap / totals[rows]
+
+
+WEIGHT_BUILDERS = {
+    "nearest": _nearest_weights,
+    "bilinear": _bilinear_weights,
+    "conservative": _conservative_weights,
+}
+
+
+def get_grid_hash(src, dst, method):
+    """Hash of a 1D source grid, destination grid and method, keying their weights."""
+    h = hashlib.sha256(f"{WEIGHTS_VERSION}:{method}".encode("utf-8"))
+    for coords in (src, dst):
+        coords = np.ascontiguousarray(coords, dtype=np.float64)
+        h.update(str(len(coords)).encode("utf-8"))
+        h.update(coords.tobytes())
+    return h.hexdigest()
+
+
+def get_weights_dir():
+    path = f"{helpers.get_tmp_dir()}/regrid-weights"
+    helpers.make_sure_dir_exists(path)
+    return path
+
+
+@functools.lru_cache(maxsize=64)
+def _load_weights(grid_hash):
+    path = f"{get_weights_dir()}/{grid_hash}.npz"
+    if not os.path.exists(path):
+        return None
+    return scipy.sparse.load_npz(path).tocsr()
+
+
+def get_weights(src, dst, method):
+    """
+    Sparse (len(dst), len(src)) matrix regridding a 1D source grid to a 1D destination grid.
+
+    Grids are separable, so regridding a raster is applying the weights of its y axis and of its
+    x axis. Weights are cached on disk by grid hash, and in memory, so they are computed once for
+    every pair of grids.
+
+    Args:
+        src (np.ndarray): Cell centers of the source grid, ascending or descending
+        dst (np.ndarray): Cell centers of the destination grid
+        method (str): ``nearest``, ``bilinear`` or ``conservative``
+
+    Returns:
+        scipy.sparse.csr_matrix: The weights, destination cells outside the source grid having no weights
+    """
+    src = np.asarray(src, dtype=np.float64)
+    dst = np.asarray(dst, dtype=np.float64)
+    grid_hash = get_grid_hash(src, dst, method)
+    weights = _load_weights(grid_hash)
+    if weights is not None:
+        return weights
+
+    rows, cols, values = WEIGHT_BUILDERS[method](src, dst)
+    weights = scipy.sparse.csr_matrix(
+        (values, (rows, cols)), shape=(len(dst), len(src))
+    )
+
+    # Written next to the final path and moved in place, so concurrent writers do not corrupt it
+    path = f"{get_weights_dir()}/{grid_hash}.npz"
+    tmp_path = f"{path[: -len('.npz')]}.{os.getpid()}.tmp.npz"
+    scipy.sparse.save_npz(tmp_path, weights)
+    os.replace(tmp_path, path)
+    _load_weights.cache_clear()
+    return weights
+
+
+def _apply_axis(data, weights, axis):
+    """Apply sparse weights to an axis of an array."""
+    data = np.moveaxis(data, axis, -1)
+    shape = data.shape
+    flat = data.reshape(int(np.prod(shape[:-1])), shape[-1])
+    out = np.asarray((weights @ flat.T).T)
+    return np.moveaxis(out.reshape(shape[:-1] + (weights.shape[0],)), -1, axis)
+
+
+def apply_weights(data, x_weights, y_weights, dtype):
+    """
+    Regrid a block of shape (..., x, y) with the weights of its x and y axes.
+
+    Missing values do not spread: weights are renormalized over the valid source cells, and
+    destination cells without any valid source cell are NaN.
+    """
+    valid = ~np.isnan(data)
+    filled = np.where(valid, data, 0).astype(np.float64)
+    num = _apply_axis(_apply_axis(filled, x_weights, -2), y_weights, -1)
+    den = _apply_axis(
+        _apply_axis(valid.astype(np.float64), x_weights, -2), y_weights, -1
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = np.where(den > 0, num / den, np.nan)
+    return out.astype(dtype)
+
+
+def is_same_grid(da, ref_da, tolerance=1e-6):
+    """
+    Whether two DataArrays have the same x and y coordinates, up to a fraction of a pixel,
+    so one can be used on the grid of the other without regridding.
+    """
+    for dim in ("x", "y"):
+        a, b = np.asarray(da[dim].values), np.asarray(ref_da[dim].values)
+        if a.ndim != 1 or a.shape != b.shape:
+            return False
+        res = np.abs(np.diff(b)).min() if len(b) > 1 else 1.0
+        if not np.allclose(a, b, rtol=0, atol=tolerance * res):
+            return False
+    return True
+
+
+def _get_windows(weights, chunks):
+    """
+    For every output chunk along an axis, its rows of the weights and the source window they read.
+    """
+    windows = []
+    start = 0
+    for size in chunks:
+        rows = weights[start : start + size]
+        cols = rows.indices
+        if len(cols) == 0:
+            src_start, src_stop = 0, 0
+        else:
+            src_start, src_stop = int(cols.min()), int(cols.max()) + 1
+        windows.append((rows[:, src_start:src_stop].tocsr(), src_start, src_stop))
+        start += size
+    return windows
+
+
+def _get_output_chunks(ref_da, dim):
+    if ref_da.chunks is not None:
+        return ref_da.chunksizes[dim]
+    size = ref_da.sizes[dim]
+    return tuple(
+        min(DEFAULT_CHUNK_SIZE, size - i) for i in range(0, size, DEFAULT_CHUNK_SIZE)
+    )
+
+
+def regrid(da, ref_da, method="linear"):
+    """
+    Lazily regrid a DataArray to the x and y grid of a reference DataArray.
+
+    Sparse weights between the 1D grids of both arrays are precomputed, or read from the cache,
+    and the output is a dask array chunked like the reference along x and y. Every output chunk
+    only reads the window of the source it needs and applies the weights to it, so the source is
+    read block by block when the output is computed.
+
+    Both arrays are expected to have their spatial dimensions last, as ("time", "band", "x", "y")
+    returned by ``to_dataarray()``, with 1D ``x`` and ``y`` coordinates in the same CRS.
+
+    Args:
+        da (xarray.DataArray): DataArray to regrid
+        ref_da (xarray.DataArray): DataArray whose x and y grid is used
+        method (str, optional): ``nearest``, ``linear``/``bilinear`` or ``conservative``/``average``.
+            Defaults to ``linear``
+
+    Returns:
+        xarray.DataArray: The regridded DataArray, with the x and y coordinates of ref_da
+    """
+    if method not in METHODS:
+        raise ValueError(
+            f"Unsupported regrid method: {method}. Should be one of {', '.join(METHODS)}"
+        )
+    if da.dims[-2:] != ("x", "y"):
+        raise ValueError(
+            f"Spatial dimensions should be last as (..., x, y), found {da.dims}"
+        )
+    method = METHODS[method]
+
+    x_weights = get_weights(da.x.values, ref_da.x.values, method)
+    y_weights = get_weights(da.y.values, ref_da.y.values, method)
+    dtype = np.result_type(da.dtype, np.float32)
+
+    if not isinstance(da.data, dsa.Array):
+        da = da.chunk({"x": DEFAULT_CHUNK_SIZE, "y": DEFAULT_CHUNK_SIZE})
+    data = da.data
+    x_windows = _get_windows(x_weights, _get_output_chunks(ref_da, "x"))
+    y_windows = _get_windows(y_weights, _get_output_chunks(ref_da, "y"))
+
+    blocks = []
+    for xw, x_start, x_stop in x_windows:
+        row = []
+        for yw, y_start, y_stop in y_windows:
+            # Every output chunk reads a single block, the source window it needs
+            window = data[..., x_start:x_stop, y_start:y_stop].rechunk(
+                {data.ndim - 2: -1, data.ndim - 1: -1}
+            )
+            row.append(
+                window.map_blocks(
+                    apply_weights,
+                    xw,
+                    yw,
+                    dtype,
+                    chunks=window.chunks[:-2] + ((xw.shape[0],), (yw.shape[0],)),
+                    dtype=dtype,
+                )
+            )
+        blocks.append(row)
+    # Outer lists are concatenated along x, inner lists along y
+    out = dsa.block(blocks)
+
+    coords = {
+        k: v for k, v in da.coords.items() if "x" not in v.dims and "y" not in v.dims
+    }
+    coords["x"] = ref_da.x
+    coords["y"] = ref_da.y
+    return xr.DataArray(out, dims=da.dims, coords=coords, name=da.name, attrs=da.attrs)
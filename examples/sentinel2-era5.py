@@ -9,7 +9,7 @@ The workflow includes:
 1. Defining an area of interest (AOI) and time range.
 2. Downloading and mosaicking Sentinel-2 RGB bands as VRTs.
 3. Downloading and mosaicking ERA5 daily temperature as VRTs.
-4. Combining the two datasets into a single multi-band dataset, spatially and temporally aligned.
+4. Combining the two datasets, mosaicked on a shared target grid, into a single multi-band dataset.
 5. Exporting the combined dataset as COGs.
 
 This example is intended to show how you can combine two different datasets using edk.
@@ -35,6 +35,11 @@ def get_timebounds():
     return (datetime.datetime(2023, 12, 28), datetime.datetime(2023, 12, 31))
 
 
+def get_grid():
+    # Shared output grid, both datasets are warped onto it so they line up pixel for pixel
+    return edk.stitching.TargetGrid.from_bbox(get_aoi(), "EPSG:4326", (0.0006, -0.0006))
+
+
 def get_sentinel2_dataset():
     # Sentinel-2 L2A S3 bucket template
     source = "s3://e84-earth-search-sentinel-data/sentinel-2-c1-l2a/{utm_code}/{lat_band}/{square}/%Y/%-m/*_%Y%m%dT*/*.tif"
@@ -62,9 +67,8 @@ def get_sentinel2_dataset():
         bands=["B04", "B03", "B02"],
         sync=False,
         overwrite=True,
-        resolution=(0.0006, -0.0006),
         dtype="uint16",
-        crs="EPSG:4326",
+        grid=get_grid(),
     )
     s2_ds.save()
     return s2_ds
@@ -89,6 +93,7 @@ def get_era5_dataset():
         bands=["temperature_2m"],
         sync=False,
         overwrite=True,
+        grid=get_grid(),
     )
     era5_ds.save()
     return era5_ds
@@ -104,7 +109,7 @@ if __name__ == "__main__":
     print("ERA5 DataArray:", era5_ds.to_dataarray())
 
     # Example: Combine the two datasets into a single multi-band dataset
-    # This will align the datasets spatially and temporally as much as possible
+    # Both are on the same grid, so this is a plain concat, aligned temporally as much as possible
     combined_ds = edk.stitching.Dataset.combine(
         s2_ds.to_dataarray(), [era5_ds.to_dataarray()]
     )
@@ -0,0 +1,90 @@
+import datetime
+import pandas as pd
+from earth_data_kit.stitching.engines import commons
+
+DATES = ["2020-01-10", "2020-01-15", "2020-01-20", "2020-02-03", "2020-02-10"]
+
+
+def _aggregate(resolution):
+    df = pd.DataFrame({"date": pd.to_datetime(DATES)})
+    return commons.aggregate_temporally(
+        df, datetime.datetime(2020, 1, 15), datetime.datetime(2020, 2, 29), resolution
+    )
+
+
+def test_anchored_bins_keep_rows_before_the_first_anchor():
+    """Test that rows between start and the first anchor fall in the bin of the last anchor before start"""
+    assert _aggregate("MS")["date"].dt.strftime("%Y-%m-%d").tolist() == [
+        "2020-01-01",
+        "2020-01-01",
+        "2020-02-01",
+        "2020-02-01",
+    ]
+    assert _aggregate("W-MON")["date"].dt.strftime("%Y-%m-%d").tolist() == [
+        "2020-01-13",
+        "2020-01-20",
+        "2020-02-03",
+        "2020-02-10",
+    ]
+
+
+def test_rows_before_start_are_dropped():
+    """Test that rows before start are dropped"""
+    assert _aggregate("1D")["date"].dt.strftime("%Y-%m-%d").tolist() == DATES[1:]
+
+
+def test_bins_are_anchored_at_start_by_default():
+    """Test that bins start at start for fixed frequencies, without an origin before the requested period"""
+    df = pd.DataFrame(
+        {
+            "date": pd.to_datetime(
+                ["2020-01-03 02:00", "2020-01-09 00:00", "2020-01-10 00:00"]
+            )
+        }
+    )
+    end = datetime.datetime(2020, 1, 16)
+
+    weekly = commons.aggregate_temporally(df, datetime.datetime(2020, 1, 3), end, "7D")
+    assert weekly["date"].dt.strftime("%Y-%m-%d").tolist() == [
+        "2020-01-03",
+        "2020-01-03",
+        "2020-01-10",
+    ]
+    hourly = commons.aggregate_temporally(
+        df, datetime.datetime(2020, 1, 3, 1), end, "5h"
+    )
+    assert hourly["date"].iloc[0] == pd.Timestamp("2020-01-03 01:00", tz="UTC")
+
+
+def test_bins_do_not_move_with_start_with_a_fixed_origin():
+    """Test that a date falls in the same bin whatever the start with a fixed origin, so incremental runs extend previous bins"""
+    df = pd.DataFrame(
+        {"date": pd.to_datetime(["2020-01-12", "2020-01-16", "2020-01-25"])}
+    )
+    end = datetime.datetime(2020, 1, 31)
+    for resolution in ["7D", "2MS", "W-MON"]:
+        full = commons.aggregate_temporally(
+            df, datetime.datetime(2020, 1, 1), end, resolution, commons.BIN_ORIGIN
+        )
+        moved = commons.aggregate_temporally(
+            df, datetime.datetime(2020, 1, 10), end, resolution, commons.BIN_ORIGIN
+        )
+        assert full["date"].tolist() == moved["date"].tolist()
+
+
+def test_bin_start_is_anchored_at_a_fixed_origin():
+    """Test that fixed frequencies are floored from 1970-01-01 and multiples of anchored ones count anchors from it"""
+    ts = pd.Timestamp("2020-01-15 05:00", tz="UTC")
+    to_offset = pd.tseries.frequencies.to_offset
+    assert commons.get_bin_start(ts, to_offset("3h")) == pd.Timestamp(
+        "2020-01-15 03:00", tz="UTC"
+    )
+    assert commons.get_bin_start(ts, to_offset("7D")) == pd.Timestamp(
+        "2020-01-09", tz="UTC"
+    )
+    assert commons.get_bin_start(ts, to_offset("MS")) == pd.Timestamp(
+        "2020-01-01", tz="UTC"
+    )
+    assert commons.get_bin_start(
+        pd.Timestamp("2020-02-15", tz="UTC"), to_offset("2MS")
+    ) == pd.Timestamp("2020-01-01", tz="UTC")
@@ -0,0 +1,125 @@
+import json
+import datetime
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import shapely
+from earth_data_kit.stitching import catalog
+from earth_data_kit.stitching.classes.tile_table import TileTable
+
+
+def _catalog_table(names, dates, footprints):
+    bands = [
+        {
+            "source_idx": 1,
+            "description": "B01",
+            "dtype": "UInt16",
+            "nodataval": 0.0,
+            "color_interp": "Gray",
+        }
+    ]
+    tiles = TileTable.from_df(
+        pd.DataFrame(
+            {
+                "engine_path": [f"s3://bucket/{n}.tif" for n in names],
+                "gdal_path": [f"/vsis3/bucket/{n}.tif" for n in names],
+                "tile_name": [f"{n}.tif" for n in names],
+                "date": dates,
+                "geo_transform": [(0.0, 10.0, 0.0, 0.0, 0.0, -10.0)] * len(names),
+                "projection": ["EPSG:32634"] * len(names),
+                "length_unit": ["metre"] * len(names),
+                "crs": ["EPSG:32634"] * len(names),
+                "x_size": [100] * len(names),
+                "y_size": [100] * len(names),
+                "bands": [bands] * len(names),
+            }
+        )
+    )
+    return tiles.to_catalog_table(np.array(footprints, dtype=object))
+
+
+def _boxes(n):
+    return [shapely.box(19.0 + i, 40.0, 20.0 + i, 41.0) for i in range(n)]
+
+
+def test_write_and_read_catalog(tmp_path):
+    """Test that a catalog and its state are read back as written"""
+    path = str(tmp_path / "catalog.parquet")
+    dates = [datetime.datetime(2020, 1, 1), datetime.datetime(2020, 1, 2)]
+    catalog.write_catalog(
+        _catalog_table(["a", "b"], dates, _boxes(2)), path, state={"fingerprint": "abc"}
+    )
+
+    df = catalog.read_catalog(path)
+    assert df["gdal_path"].tolist() == ["/vsis3/bucket/a.tif", "/vsis3/bucket/b.tif"]
+    assert df["date"].tolist() == [
+        pd.Timestamp("2020-01-01", tz="UTC"),
+        pd.Timestamp("2020-01-02", tz="UTC"),
+    ]
+    assert df["crs"].tolist() == ["EPSG:32634", "EPSG:32634"]
+    assert [dict(b)["description"] for b in df["bands"].iloc[0]] == ["B01"]
+    assert catalog.read_state(path) == {"fingerprint": "abc"}
+    assert list(catalog.read_catalog(path, columns=["tile_name"]).columns) == [
+        "tile_name"
+    ]
+    assert catalog.read_state(str(tmp_path / "missing.parquet")) is None
+
+
+def test_geoparquet_metadata(tmp_path):
+    """Test that the GeoParquet metadata describes the footprints, multipart ones included"""
+    path = str(tmp_path / "catalog.parquet")
+    catalog.write_catalog(_catalog_table(["a", "b"], [None, None], _boxes(2)), path)
+
+    geo = json.loads(pq.read_schema(path).metadata[b"geo"])
+    assert geo["version"] == "1.1.0" and geo["primary_column"] == "geometry"
+    assert geo["columns"]["geometry"]["encoding"] == "WKB"
+    assert geo["columns"]["geometry"]["geometry_types"] == ["Polygon"]
+    assert geo["columns"]["geometry"]["bbox"] == [19.0, 40.0, 21.0, 41.0]
+    assert not catalog.has_multipart_footprints(path)
+
+    split = shapely.MultiPolygon(
+        [shapely.box(179.0, 40.0, 180.0, 41.0), shapely.box(-180.0, 40.0, -179.0, 41.0)]
+    )
+    catalog.write_catalog(
+        _catalog_table(["a", "c"], [None, None], [_boxes(1)[0], split]), path
+    )
+    assert catalog.has_multipart_footprints(path)
+
+
+def test_concat_tables_drops_repeated_tiles():
+    """Test that tiles already in an earlier table are dropped, and the metadata covers the result"""
+    dates = [datetime.datetime(2020, 1, 1), datetime.datetime(2020, 1, 2)]
+    first = _catalog_table(["a", "b"], dates, _boxes(2))
+    # Same path and date as "b" in the first table, a different date for "a"
+    second = _catalog_table(
+        ["b", "a"],
+        [dates[1], dates[1]],
+        [shapely.box(0, 0, 1, 1), shapely.box(25, 40, 26, 41)],
+    )
+
+    table = catalog.concat_tables([first, second])
+
+    assert table["tile_name"].to_pylist() == ["a.tif", "b.tif", "a.tif"]
+    assert shapely.from_wkb(table["geometry"][1].as_py()).equals(_boxes(2)[1])
+    assert json.loads(table.schema.metadata[b"geo"])["columns"]["geometry"]["bbox"] == [
+        19.0,
+        40.0,
+        26.0,
+        41.0,
+    ]
+
+
+def test_export_csv(tmp_path):
+    """Test that catalogs are exported in the legacy CSV layout"""
+    path = str(tmp_path / "catalog.parquet")
+    catalog.write_catalog(
+        _catalog_table(["a"], [datetime.datetime(2020, 1, 1)], _boxes(1)), path
+    )
+
+    catalog.export_csv(path, str(tmp_path / "catalog.csv"))
+
+    df = pd.read_csv(tmp_path / "catalog.csv")
+    assert "bbox" not in df.columns
+    assert df["geo_transform"].iloc[0] == "(0.0, 10.0, 0.0, 0.0, 0.0, -10.0)"
+    assert json.loads(df["bands"].iloc[0])[0]["description"] == "B01"
+    assert shapely.from_wkt(df["geometry"].iloc[0]).equals(_boxes(1)[0])
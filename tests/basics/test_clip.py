@@ -0,0 +1,40 @@
+import pandas as pd
+from earth_data_kit.stitching import clip
+
+
+def _tiles():
+    # Two 10980 x 10980 Sentinel-2 like tiles at 10m in UTM 34N, side by side
+    return pd.DataFrame(
+        {
+            "gdal_path": ["/vsis3/bucket/a.tif", "/vsis3/bucket/b.tif"],
+            "projection": ["EPSG:32634", "EPSG:32634"],
+            "x_min": [399960.0, 509760.0],
+            "x_max": [509760.0, 619560.0],
+            "y_min": [4490220.0, 4490220.0],
+            "y_max": [4600020.0, 4600020.0],
+            "x_size": [10980, 10980],
+            "y_size": [10980, 10980],
+        }
+    )
+
+
+def test_windows_cover_the_bbox_with_a_margin():
+    """Test that windows are computed in pixels of every tile, clamped to it, with empty windows outside"""
+    windows = clip.get_windows(_tiles(), (20.5, 41.2, 20.55, 41.25), margin=8)
+
+    x_off, y_off, x_size, y_size = windows[0]
+    assert 0 < x_off and x_off + x_size < 10980 and 0 < y_off and y_off + y_size < 10980
+    # About 4.2km x 5.6km at 10m, plus the margin on both sides
+    assert 400 < x_size < 460 and 540 < y_size < 600
+    assert windows[1][2] == 0
+
+
+def test_clip_key_changes_with_the_source_version():
+    """Test that a source replaced in place is clipped again instead of reusing the stale output"""
+    window = (10, 20, 100, 100)
+    assert clip.get_clip_key(
+        "/vsis3/bucket/a.tif", "etag-1", window
+    ) == clip.get_clip_key("/vsis3/bucket/a.tif", "etag-1", window)
+    assert clip.get_clip_key(
+        "/vsis3/bucket/a.tif", "etag-1", window
+    ) != clip.get_clip_key("/vsis3/bucket/a.tif", "etag-2", window)
@@ -0,0 +1,53 @@
+import concurrent.futures
+import numpy as np
+import pandas as pd
+import pytest
+from osgeo import gdal
+import earth_data_kit as edk
+import earth_data_kit.stitching.executors as executors
+import earth_data_kit.stitching.warp as warp
+
+distributed = pytest.importorskip("distributed")
+
+
+@pytest.fixture
+def client():
+    with distributed.LocalCluster(
+        n_workers=2, threads_per_worker=1, processes=True
+    ) as cluster:
+        with distributed.Client(cluster) as client:
+            edk.stitching.set_client(client)
+            yield client
+            edk.stitching.set_client(None)
+
+
+def _write_raster(path):
+    ds = gdal.GetDriverByName("GTiff").Create(path, 64, 64, 1, gdal.GDT_Byte)
+    ds.SetGeoTransform((20.0, 0.01, 0, 42.0, 0, -0.01))
+    ds.SetProjection("EPSG:4326")
+    ds.GetRasterBand(1).WriteArray(np.arange(64 * 64, dtype=np.uint8).reshape(64, 64))
+    ds.Close()
+
+
+def test_executor_runs_on_cluster(client):
+    """Test that tasks are submitted to the cluster and their futures behave like local ones"""
+    assert executors.get_workers() == 2
+
+    with executors.get_executor("process") as executor:
+        futures = [executor.submit(pow, i, 2) for i in range(10)]
+        results = sorted(f.result() for f in concurrent.futures.as_completed(futures))
+
+    assert results == [i**2 for i in range(10)]
+
+
+def test_warp_tiles_on_cluster(client, tmp_path):
+    """Test that tiles warped by the workers are collected back into the tile-band rows"""
+    source = str(tmp_path / "tile.tif")
+    _write_raster(source)
+    df = pd.DataFrame({"gdal_path": [source]})
+
+    df = warp.warp_tiles(df, str(tmp_path / "warped"), "EPSG:3857", (1000, -1000))
+
+    assert df["gdal_path"].iloc[0].startswith(str(tmp_path / "warped"))
+    assert df["crs"].iloc[0] == "EPSG:3857"
+    assert gdal.Open(df["gdal_path"].iloc[0]).RasterXSize == df["x_size"].iloc[0]
@@ -0,0 +1,57 @@
+import shapely
+from earth_data_kit.utilities import geo, transform
+
+# NSIDC Sea Ice Polar Stereographic North
+POLAR_NORTH = "EPSG:3413"
+
+
+def _footprint(geo_transform, size, projection):
+    return transform.get_wgs84_footprints(
+        [geo_transform], [size], [size], [projection]
+    )[0]
+
+
+def test_tile_containing_the_pole_covers_all_longitudes():
+    """Test that a tile with the pole inside its grid is extended to the pole over all longitudes"""
+    footprint = _footprint(
+        (-1000000.0, 1000.0, 0.0, 1000000.0, 0.0, -1000.0), 2000, POLAR_NORTH
+    )
+
+    assert (
+        footprint.bounds[0] == -180.0
+        and footprint.bounds[2] == 180.0
+        and footprint.bounds[3] == 90.0
+    )
+
+
+def test_tile_touching_the_pole_keeps_its_longitudes():
+    """Test that a quadrant with a corner on the pole reaches it without covering all longitudes"""
+    footprint = _footprint(
+        (0.0, 1000.0, 0.0, 1000000.0, 0.0, -1000.0), 1000, POLAR_NORTH
+    )
+
+    min_lon, _, max_lon, max_lat = footprint.bounds
+    assert max_lat > 89.99
+    assert max_lon - min_lon < 180.0
+
+
+def test_tile_crossing_the_antimeridian_is_split():
+    """Test that a tile crossing the antimeridian is split into a box on each side of it"""
+    # UTM zone 60N, from about 179E to 178W at 45N
+    footprint = _footprint(
+        (640000.0, 1000.0, 0.0, 5000000.0, 0.0, -1000.0), 300, "EPSG:32660"
+    )
+
+    assert isinstance(footprint, shapely.MultiPolygon)
+    east, west = sorted(footprint.geoms, key=lambda g: -g.bounds[0])
+    assert east.bounds[2] == 180.0 and west.bounds[0] == -180.0
+    assert east.bounds[0] > 178.0 and west.bounds[2] < -177.0
+
+
+def test_intersects_aoi_leaves_the_aoi_unprepared():
+    """Test that matching footprints against an aoi does not prepare the geometry of the caller"""
+    aoi = shapely.box(19.2, 40.2, 19.8, 40.8)
+    footprints = shapely.box([19.0, 25.0], [40.0, 40.0], [20.0, 26.0], [41.0, 41.0])
+
+    assert geo.intersects_aoi(footprints, aoi).tolist() == [True, False]
+    assert not shapely.is_prepared(aoi)
@@ -0,0 +1,174 @@
+import xml.etree.ElementTree as ET
+import numpy as np
+import pandas as pd
+import pytest
+from osgeo import gdal, ogr, osr
+from earth_data_kit.stitching import gti, vrt
+from earth_data_kit.stitching.classes.tile_table import TileTable
+
+gdal.UseExceptions()
+
+SIZE = 100
+RES = 0.001
+
+
+def _wkt(crs):
+    srs = osr.SpatialReference()
+    srs.SetFromUserInput(crs)
+    return srs.ExportToWkt()
+
+
+def _write_tile(path, x_min, y_max, offset, wkt):
+    """Two band UInt16 tile, the second band having 0 as nodata over its left half"""
+    ds = gdal.GetDriverByName("GTiff").Create(str(path), SIZE, SIZE, 2, gdal.GDT_UInt16)
+    ds.SetGeoTransform((x_min, RES, 0.0, y_max, 0.0, -RES))
+    ds.SetProjection(wkt)
+    values = np.arange(SIZE * SIZE, dtype=np.uint16).reshape(SIZE, SIZE) + offset
+    masked = values.copy()
+    masked[:, : SIZE // 2] = 0
+    for band_num, (description, data) in enumerate(
+        [("B01", values), ("B02", masked)], start=1
+    ):
+        band = ds.GetRasterBand(band_num)
+        band.SetDescription(description)
+        band.WriteArray(data)
+    ds.GetRasterBand(2).SetNoDataValue(0)
+    ds.Close()
+
+
+def _band_tiles(paths, origins, projections):
+    bands = [
+        {
+            "source_idx": i,
+            "description": d,
+            "dtype": "UInt16",
+            "nodataval": n,
+            "color_interp": "Gray",
+        }
+        for i, d, n in [(1, "B01", None), (2, "B02", 0.0)]
+    ]
+    df = pd.DataFrame(
+        {
+            "engine_path": paths,
+            "gdal_path": paths,
+            "tile_name": paths,
+            "date": [pd.Timestamp("2020-01-01")] * len(paths),
+            "geo_transform": [(x, RES, 0.0, y, 0.0, -RES) for x, y in origins],
+            "projection": projections,
+            "length_unit": ["degree"] * len(paths),
+            "crs": ["EPSG:4326"] * len(paths),
+            "x_size": [SIZE] * len(paths),
+            "y_size": [SIZE] * len(paths),
+            "bands": [bands] * len(paths),
+        }
+    )
+    band_tiles = TileTable.from_df(df).band_table()
+    band_tiles["date_str"] = band_tiles["date"].dt.strftime("%Y-%m-%d-%H:%M:%S")
+    return band_tiles
+
+
+def test_tile_index_has_a_layer_per_projection(tmp_path):
+    """Test that every tile band is a feature of the layer of its projection, with its location and extent"""
+    wgs84, nad83 = _wkt("EPSG:4326"), _wkt("EPSG:4269")
+    paths = [f"/data/tile_{i}.tif" for i in range(3)]
+    band_tiles = _band_tiles(
+        paths, [(20.0, 40.1), (20.08, 40.095), (21.0, 40.1)], [wgs84, wgs84, nad83]
+    )
+    index_path = str(tmp_path / "index.gpkg")
+
+    layers = gti.write_tile_index(index_path, band_tiles)
+
+    assert layers == {p: gti.get_layer_name(p) for p in (wgs84, nad83)}
+    # Layer names only depend on the projection, so they are stable across mosaics
+    assert gti.get_layer_name(wgs84) == gti.get_layer_name(_wkt("EPSG:4326"))
+    ds = ogr.Open(index_path)
+    layer = ds.GetLayerByName(layers[wgs84])
+    features = sorted(
+        (
+            f.GetField("tile_id"),
+            f.GetField("band"),
+            f.GetField("location"),
+            f.GetField("date"),
+        )
+        for f in layer
+    )
+    assert features == [
+        (0, "B01", paths[0], "2020-01-01-00:00:00"),
+        (0, "B02", f"vrt://{paths[0]}?bands=2", "2020-01-01-00:00:00"),
+        (1, "B01", paths[1], "2020-01-01-00:00:00"),
+        (1, "B02", f"vrt://{paths[1]}?bands=2", "2020-01-01-00:00:00"),
+    ]
+    layer.SetAttributeFilter("tile_id = 1 AND band = 'B01'")
+    np.testing.assert_allclose(
+        layer.GetNextFeature().GetGeometryRef().GetEnvelope(),
+        (20.08, 20.18, 39.995, 40.095),
+    )
+    assert ds.GetLayerByName(layers[nad83]).GetFeatureCount() == 2
+
+
+def test_band_gti_filters_on_date_and_band(tmp_path):
+    """Test that the GTI XML selects the tiles of one date and band, drawn in tile order"""
+    band_tiles = _band_tiles(["/data/tile_0.tif"], [(20.0, 40.1)], [_wkt("EPSG:4326")])
+    tiles = band_tiles[band_tiles["description"] == "B02"]
+
+    xml = gti.build_band_gti(
+        "/data/index.gpkg",
+        "tiles_abc",
+        "2020-01-01-00:00:00",
+        "it's B02",
+        tiles,
+        (20.0, RES, 0.0, 40.1, 0.0, -RES),
+        200,
+        100,
+        None,
+    )
+    root = ET.fromstring(xml)
+
+    assert root.findtext("IndexDataset") == "/data/index.gpkg"
+    assert root.findtext("IndexLayer") == "tiles_abc"
+    assert (
+        root.findtext("Filter") == "date = '2020-01-01-00:00:00' AND band = 'it''s B02'"
+    )
+    assert root.findtext("LocationField") == gti.LOCATION_FIELD
+    assert root.findtext("SortField") == gti.SORT_FIELD
+    assert [
+        float(root.findtext(k)) for k in ("MinX", "MinY", "MaxX", "MaxY")
+    ] == pytest.approx([20.0, 40.0, 20.2, 40.1])
+    assert root.find("Band").get("dataType") == "UInt16"
+    assert root.find("Band").findtext("NoDataValue") == "0"
+
+
+@pytest.mark.skipif(
+    gdal.GetDriverByName("GTI") is None, reason="GTI driver requires GDAL >= 3.9"
+)
+def test_mosaic_gti_matches_mosaic_vrt(tmp_path):
+    """Test that a geographic GTI mosaic reads the same pixels, at the same place, as the VRT mosaic"""
+    wkt = _wkt("EPSG:4326")
+    origins = [(20.0, 40.1), (20.08, 40.095), (21.0, 40.1)]
+    paths = [str(tmp_path / f"tile_{i}.tif") for i in range(len(origins))]
+    for i, (path, (x_min, y_max)) in enumerate(zip(paths, origins)):
+        _write_tile(path, x_min, y_max, i * 10000, wkt)
+    band_tiles = _band_tiles(paths, origins, [wkt] * len(paths))
+    bbox = (20.0255, 40.0123, 20.1537, 40.0871)
+
+    index_path = str(tmp_path / "index.gpkg")
+    layers = gti.write_tile_index(index_path, band_tiles)
+    gti_path = str(tmp_path / "2020-01-01-00:00:00.vrt")
+    bands_found = gti.write_mosaic_gti(
+        gti_path,
+        index_path,
+        layers,
+        "2020-01-01-00:00:00",
+        band_tiles,
+        ["B01", "B02"],
+        bbox,
+    )
+    xml, _ = vrt.build_mosaic_vrt(band_tiles, bands_found, bbox)
+    (tmp_path / "mosaic.vrt").write_text(xml)
+
+    ds = gdal.Open(gti_path)
+    reference = gdal.Open(str(tmp_path / "mosaic.vrt"))
+    assert bands_found == ["B01", "B02"]
+    np.testing.assert_allclose(ds.GetGeoTransform(), reference.GetGeoTransform())
+    np.testing.assert_array_equal(ds.ReadAsArray(), reference.ReadAsArray())
+    assert ds.GetSpatialRef().GetDataAxisToSRSAxisMapping() == [2, 1]
@@ -0,0 +1,62 @@
+import datetime
+import shapely
+import pyarrow as pa
+import pandas as pd
+from earth_data_kit.stitching.classes.dataset import Dataset
+
+
+def _dataset(start, end, resolution):
+    # Only the bounds are needed to prune a catalog, no source is scanned
+    ds = Dataset.__new__(Dataset)
+    ds.time_opts = {"start": start, "end": end, "resolution": resolution}
+    ds.space_opts = {"aoi": shapely.box(19, 39, 21, 42)}
+    return ds
+
+
+def _catalog(dates):
+    footprint = shapely.to_wkb(shapely.box(19.5, 39.5, 20.5, 40.5))
+    return pa.table(
+        {
+            "date": pa.array(pd.to_datetime(dates).tz_localize("UTC")),
+            "geometry": pa.array([footprint] * len(dates), type=pa.binary()),
+        }
+    )
+
+
+def test_prune_keeps_the_bin_straddling_start():
+    """Test that moving the start into a bin keeps the bin, its remaining days not being scanned again"""
+    # Weekly bins from 1970-01-01 start on 2020-01-02, 2020-01-09 and 2020-01-16
+    table = _catalog(["2020-01-02", "2020-01-09", "2020-01-16"])
+    ds = _dataset(datetime.datetime(2020, 1, 12), datetime.datetime(2020, 1, 20), "7D")
+
+    pruned = ds.__prune_catalog__(table)
+
+    assert pruned["date"].to_pandas().dt.strftime("%Y-%m-%d").tolist() == [
+        "2020-01-09",
+        "2020-01-16",
+    ]
+
+
+def test_missing_time_windows_extend_the_covered_period():
+    """Test that only the periods outside the previous time bounds are scanned"""
+    ds = _dataset(datetime.datetime(2020, 1, 12), datetime.datetime(2020, 1, 20), "7D")
+    state = {"start": "2020-01-01T00:00:00+00:00", "end": "2020-01-15T00:00:00+00:00"}
+
+    windows = ds.__get_missing_time_windows__(state)
+
+    assert [(w["start"], w["end"]) for w in windows] == [
+        (pd.Timestamp("2020-01-15", tz="UTC"), pd.Timestamp("2020-01-20", tz="UTC"))
+    ]
+
+
+def test_only_incremental_discovers_anchor_bins_at_the_fixed_origin():
+    """Test that bins start at start by default and at 1970-01-01 for incremental discovers"""
+    ds = _dataset(datetime.datetime(2020, 1, 3), datetime.datetime(2020, 1, 20), "7D")
+    scan = pd.DataFrame({"date": ["2020-01-04T00:00:00"]})
+
+    full = ds.__aggregate_scan__(scan.copy())
+    incremental = ds.__aggregate_scan__(scan.copy(), incremental=True)
+
+    assert full["date"].tolist() == [pd.Timestamp("2020-01-03", tz="UTC")]
+    # Weekly bins from 1970-01-01 start on 2020-01-02
+    assert incremental["date"].tolist() == [pd.Timestamp("2020-01-02", tz="UTC")]
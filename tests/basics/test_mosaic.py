@@ -0,0 +1,118 @@
+import pickle
+import pandas as pd
+import pytest
+from earth_data_kit.stitching import mosaic
+from earth_data_kit.stitching.classes.target_grid import TargetGrid
+from earth_data_kit.stitching.classes.tile_table import TileTable
+
+PLAIN_TYPES = (str, int, float, bool, type(None))
+
+
+def _is_plain(value):
+    if isinstance(value, (tuple, list)):
+        return all(_is_plain(v) for v in value)
+    if isinstance(value, dict):
+        return all(isinstance(k, str) and _is_plain(v) for k, v in value.items())
+    return type(value) in PLAIN_TYPES
+
+
+@pytest.mark.parametrize(
+    "grid, tile_index",
+    [
+        (None, None),
+        (
+            TargetGrid("EPSG:32634", (30, -30), (400010, 4400010, 500000, 4500000)),
+            ("/data/index.gpkg", {"PROJCS[...]": "tiles_abc"}),
+        ),
+    ],
+)
+def test_mosaic_spec_is_plain_values(grid, tile_index):
+    """Test that the spec sent with every date task only holds builtins, and pickles back unchanged"""
+    spec = mosaic.create_mosaic_spec(
+        "/data/pre-processing",
+        [19.3, 39.6, 21.1, 42.7],
+        ["B04", "B03"],
+        (30, -30),
+        "UInt16",
+        "EPSG:32634",
+        "gti",
+        tile_index,
+        grid,
+    )
+
+    assert _is_plain(spec)
+    assert pickle.loads(pickle.dumps(spec)) == spec
+    if grid is not None:
+        assert spec["grid"] == (
+            grid.geo_transform,
+            grid.x_size,
+            grid.y_size,
+            "EPSG:32634",
+        )
+
+
+def test_task_tiles_only_keep_the_task_columns():
+    """Test that date tasks get the columns they read, with repeated strings as categories"""
+    bands = [
+        {
+            "source_idx": i,
+            "description": d,
+            "dtype": "UInt16",
+            "nodataval": 0.0,
+            "color_interp": "Gray",
+        }
+        for i, d in [(1, "B01"), (2, "B02")]
+    ]
+    df = TileTable.from_df(
+        pd.DataFrame(
+            {
+                "engine_path": ["s3://bucket/a.tif", "s3://bucket/b.tif"],
+                "gdal_path": ["/vsis3/bucket/a.tif", "/vsis3/bucket/b.tif"],
+                "tile_name": ["a.tif", "b.tif"],
+                "date": pd.to_datetime(["2020-01-01", "2020-01-02"]),
+                "geo_transform": [(0.0, 10.0, 0.0, 0.0, 0.0, -10.0)] * 2,
+                "projection": ["EPSG:32634"] * 2,
+                "length_unit": ["metre"] * 2,
+                "crs": ["EPSG:32634"] * 2,
+                "x_size": [100] * 2,
+                "y_size": [100] * 2,
+                "bands": [bands] * 2,
+            }
+        )
+    ).band_table()
+
+    tiles = mosaic.get_task_tiles(df)
+
+    assert list(tiles.columns) == mosaic.TASK_COLUMNS
+    assert {"tile_id", "engine_path"} <= set(df.columns)
+    for col in mosaic.CATEGORY_COLUMNS:
+        assert isinstance(tiles[col].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(
+        tiles.astype({c: object for c in mosaic.CATEGORY_COLUMNS}),
+        df[mosaic.TASK_COLUMNS].astype({c: object for c in mosaic.CATEGORY_COLUMNS}),
+    )
+    # The rows of the caller are left untouched
+    assert not isinstance(df["description"].dtype, pd.CategoricalDtype)
+
+
+@pytest.mark.parametrize(
+    "n_dates, n_workers, batch_size",
+    [
+        (0, 8, 1),
+        (0, 0, 1),
+        (1, 8, 1),
+        # Fewer dates than workers, one date per task
+        (5, 8, 1),
+        (32, 8, 1),
+        (33, 8, 2),
+        (1000, 8, 32),
+        # Workers not known yet
+        (100, 0, 25),
+    ],
+)
+def test_batch_size(n_dates, n_workers, batch_size):
+    """Test that every worker gets several batches of dates, of at least one date"""
+    assert mosaic.get_batch_size(n_dates, n_workers) == batch_size
+    if n_dates:
+        n_batches = -(-n_dates // batch_size)
+        assert n_batches <= max(1, n_workers) * mosaic.BATCHES_PER_WORKER
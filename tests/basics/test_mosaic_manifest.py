@@ -0,0 +1,127 @@
+import os
+import pandas as pd
+from earth_data_kit.stitching.classes.dataset import Dataset
+from earth_data_kit.stitching.classes.tile_table import TileTable
+
+PARAMS = {"bands": ["B01"], "resolution": None, "crs": None, "backend": "gdal"}
+DATES = ["2020-01-01-00:00:00", "2020-01-02-00:00:00"]
+
+
+def _band_tiles(paths, dates, x_origins):
+    bands = [
+        {
+            "source_idx": 1,
+            "description": "B01",
+            "dtype": "UInt16",
+            "nodataval": 0.0,
+            "color_interp": "Gray",
+        }
+    ]
+    df = pd.DataFrame(
+        {
+            "engine_path": paths,
+            "gdal_path": paths,
+            "tile_name": paths,
+            "date": pd.to_datetime(dates),
+            "geo_transform": [(x, 10.0, 0.0, 0.0, 0.0, -10.0) for x in x_origins],
+            "projection": ["EPSG:32634"] * len(paths),
+            "length_unit": ["metre"] * len(paths),
+            "crs": ["EPSG:32634"] * len(paths),
+            "x_size": [100] * len(paths),
+            "y_size": [100] * len(paths),
+            "bands": [bands] * len(paths),
+        }
+    )
+    return TileTable.from_df(df).band_table()
+
+
+def _two_dates(second_tile="/data/b_1.tif", second_x=1000.0):
+    """Two tiles on each of two days"""
+    return _band_tiles(
+        ["/data/a_0.tif", "/data/a_1.tif", "/data/b_0.tif", second_tile],
+        ["2020-01-01", "2020-01-01", "2020-01-02", "2020-01-02"],
+        [0.0, 1000.0, 0.0, second_x],
+    )
+
+
+def test_date_hashes_only_change_with_the_inputs_of_the_date():
+    """Test that a date keeps its hash until one of its tiles or the mosaic parameters change"""
+    ds = Dataset.__new__(Dataset)
+    hashes = ds.__get_date_hashes__(_two_dates(), PARAMS)
+
+    assert list(hashes) == DATES
+    assert ds.__get_date_hashes__(_two_dates(), PARAMS) == hashes
+    # Dropping a date leaves the others untouched
+    df = _two_dates()
+    assert ds.__get_date_hashes__(df[df["tile_id"] < 2], PARAMS) == {
+        DATES[0]: hashes[DATES[0]]
+    }
+
+    for changed in [
+        _two_dates(second_tile="/data/b_1_v2.tif"),
+        _two_dates(second_x=2000.0),
+        _two_dates().iloc[[0, 1, 3, 2]],
+    ]:
+        changed_hashes = ds.__get_date_hashes__(changed, PARAMS)
+        assert changed_hashes[DATES[0]] == hashes[DATES[0]]
+        assert changed_hashes[DATES[1]] != hashes[DATES[1]]
+
+    resampled = ds.__get_date_hashes__(_two_dates(), {**PARAMS, "dtype": "Float32"})
+    assert all(resampled[d] != hashes[d] for d in DATES)
+
+
+def test_changed_and_stale_dates(tmp_path):
+    """Test that dates with a new hash, without a VRT or new are rebuilt, and dates out of the catalog are stale"""
+    ds = Dataset.__new__(Dataset)
+    vrt_path = tmp_path / "2020-01-01-00:00:00.vrt"
+    vrt_path.write_text("<VRTDataset/>")
+    manifest = {
+        "2020-01-01-00:00:00": {"hash": "a", "source": str(vrt_path)},
+        "2020-01-02-00:00:00": {"hash": "b", "source": str(vrt_path)},
+        "2020-01-03-00:00:00": {"hash": "c", "source": str(tmp_path / "gone.vrt")},
+        "2020-01-04-00:00:00": {"hash": "d", "source": str(vrt_path)},
+    }
+    date_hashes = {
+        "2020-01-01-00:00:00": "a",
+        "2020-01-02-00:00:00": "b2",
+        "2020-01-03-00:00:00": "c",
+        "2020-01-05-00:00:00": "e",
+    }
+
+    stale_dates, changed_dates = ds.__get_changed_dates__(date_hashes, manifest)
+
+    assert stale_dates == ["2020-01-04-00:00:00"]
+    assert changed_dates == {
+        "2020-01-02-00:00:00",
+        "2020-01-03-00:00:00",
+        "2020-01-05-00:00:00",
+    }
+
+
+def test_remove_date_outputs_only_removes_the_files_of_the_date(tmp_path):
+    """Test that the VRT, band VRTs and temporary VRT of a date are removed, and nothing else"""
+    ds = Dataset.__new__(Dataset)
+    ds.__get_ds_tmp_path__ = lambda: str(tmp_path)
+    output_dir = tmp_path / "pre-processing"
+    output_dir.mkdir()
+    removed = [
+        "2020-01-01-00:00:00.vrt",
+        "2020-01-01-00:00:00.tmp.vrt",
+        "2020-01-01-00:00:00-B01.vrt",
+        "2020-01-01-00:00:00-B 02.vrt",
+    ]
+    kept = [
+        "2020-01-02-00:00:00.vrt",
+        "2020-01-02-00:00:00-B01.vrt",
+        "2020-01-01-00:00:00_notes.txt",
+        "tile_index.gpkg",
+        "manifest.json",
+    ]
+    for name in removed + kept:
+        (output_dir / name).write_text("")
+    (tmp_path / "2020-01-01-00:00:00.vrt").write_text("")
+
+    ds.__remove_date_outputs__("2020-01-01-00:00:00")
+
+    assert sorted(os.listdir(output_dir)) == sorted(kept)
+    assert (tmp_path / "2020-01-01-00:00:00.vrt").exists()
@@ -0,0 +1,29 @@
+import pytest
+from earth_data_kit.stitching.pipeline import Pipeline, Stage
+
+
+def test_pipeline_runs_every_stage():
+    """Test that items go through all stages and items dropped by a stage do not reach the next ones"""
+    stages = [
+        Stage("Double", lambda x: x * 2, workers=2),
+        Stage("Drop", lambda x: None if x % 3 == 0 else x),
+        Stage("Negate", lambda x: -x, workers=3),
+    ]
+
+    results = Pipeline(stages, queue_size=1).run(range(10))
+
+    assert sorted(results) == [-16, -14, -10, -8, -4, -2]
+
+
+def test_pipeline_raises_stage_errors():
+    """Test that the first error of a stage stops the pipeline and is raised"""
+
+    def fail(x):
+        if x == 5:
+            raise RuntimeError("failed on 5")
+        return x
+
+    with pytest.raises(RuntimeError, match="failed on 5"):
+        Pipeline(
+            [Stage("Identity", lambda x: x), Stage("Fail", fail)], queue_size=1
+        ).run(iter(range(1000)))
@@ -0,0 +1,119 @@
+import datetime
+import numpy as np
+import pandas as pd
+import shapely
+from earth_data_kit.stitching import catalog
+from earth_data_kit.stitching.index import CatalogIndex
+from earth_data_kit.stitching.classes.dataset import Dataset
+from earth_data_kit.stitching.classes.tile_table import TileTable
+
+
+def _catalog_table(names, dates, lons):
+    bands = [
+        {
+            "source_idx": 1,
+            "description": "B01",
+            "dtype": "UInt16",
+            "nodataval": None,
+            "color_interp": "Gray",
+        }
+    ]
+    tiles = TileTable.from_df(
+        pd.DataFrame(
+            {
+                "engine_path": [f"s3://bucket/{n}.tif" for n in names],
+                "gdal_path": [f"/vsis3/bucket/{n}.tif" for n in names],
+                "tile_name": [f"{n}.tif" for n in names],
+                "date": dates,
+                "geo_transform": [(0.0, 10.0, 0.0, 0.0, 0.0, -10.0)] * len(names),
+                "projection": ["EPSG:32634"] * len(names),
+                "length_unit": ["metre"] * len(names),
+                "crs": ["EPSG:32634"] * len(names),
+                "x_size": [100] * len(names),
+                "y_size": [100] * len(names),
+                "bands": [bands] * len(names),
+            }
+        )
+    )
+    return tiles.to_catalog_table(
+        np.array([shapely.box(lon, 40.0, lon + 1.0, 41.0) for lon in lons])
+    )
+
+
+def _write(path, tables):
+    catalog.write_catalog(catalog.concat_tables(tables), path)
+    CatalogIndex.build(path)
+
+
+def _dataset(path):
+    # Only the catalog is needed to query a dataset, no source is scanned
+    ds = Dataset.__new__(Dataset)
+    ds.name = "query-test"
+    ds.catalog_path = path
+    ds.tile_ids = ds.tile_keys = ds.tile_signature = None
+    ds.time_opts = {}
+    ds.space_opts = {}
+    return ds
+
+
+def _gdal_paths(ds):
+    return sorted(ds.__get_tiles__().gdal_path.tolist())
+
+
+def test_index_query_matches_bounds_and_dates(tmp_path):
+    """Test that the index matches tiles by footprint and inclusive time range, non temporal tiles matching any time"""
+    path = str(tmp_path / "catalog.parquet")
+    dates = [datetime.datetime(2020, 1, 1), datetime.datetime(2020, 1, 2), None]
+    _write(path, [_catalog_table(["a", "b", "c"], dates, [19.0, 25.0, 19.5])])
+
+    index = CatalogIndex.load(path)
+    assert index.query(aoi=shapely.box(19.2, 40.2, 19.8, 40.8)).tolist() == [0, 2]
+    assert index.query(
+        start=datetime.datetime(2020, 1, 2), end=datetime.datetime(2020, 1, 2)
+    ).tolist() == [1, 2]
+    assert index.query(
+        shapely.box(19.2, 40.2, 19.8, 40.8), end=datetime.datetime(2020, 1, 1)
+    ).tolist() == [0, 2]
+
+
+def test_views_keep_their_tiles_when_the_catalog_is_rewritten(tmp_path):
+    """Test that a view resolves its tiles by key after the catalog rows moved, eg: after an incremental discover"""
+    path = str(tmp_path / "catalog.parquet")
+    dates = [datetime.datetime(2020, 1, 1), datetime.datetime(2020, 1, 2)]
+    old = _catalog_table(["a", "b"], dates, [19.0, 25.0])
+    _write(path, [old])
+    ds = _dataset(path)
+
+    view = ds.query(bbox=(19.2, 40.2, 19.8, 40.8))
+    nested = view.query(
+        time=(datetime.datetime(2020, 1, 1), datetime.datetime(2020, 1, 1))
+    )
+    assert _gdal_paths(view) == _gdal_paths(nested) == ["/vsis3/bucket/a.tif"]
+
+    # New rows come first, moving the rows of the view
+    new = _catalog_table(["c", "d"], [datetime.datetime(2020, 1, 3)] * 2, [19.0, 19.5])
+    _write(path, [new, old])
+    assert _gdal_paths(view) == _gdal_paths(nested) == ["/vsis3/bucket/a.tif"]
+    assert view.tile_ids.tolist() == [2]
+
+    _write(path, [new])
+    assert _gdal_paths(view) == []
+
+
+def test_get_bands_keeps_the_deprecated_tiles_column(tmp_path):
+    """Test that get_bands still returns the tiles of each band configuration next to their ids"""
+    path = str(tmp_path / "catalog.parquet")
+    dates = [
+        datetime.datetime(2020, 1, 1),
+        datetime.datetime(2020, 1, 2),
+        datetime.datetime(2020, 1, 3),
+    ]
+    _write(path, [_catalog_table(["a", "b", "c"], dates, [19.0, 25.0, 19.5])])
+    view = _dataset(path).query(bbox=(19.2, 40.2, 19.8, 40.8))
+
+    bands = view.get_bands()
+    assert bands["tile_ids"].tolist() == [[0, 2]]
+    assert [t.gdal_path for t in bands["tiles"].iloc[0]] == [
+        "/vsis3/bucket/a.tif",
+        "/vsis3/bucket/c.tif",
+    ]
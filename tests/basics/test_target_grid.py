@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import earth_data_kit as edk
+
+
+def test_target_grid_snaps_to_origin():
+    """Test that grid bounds are snapped outwards to pixels aligned on the origin"""
+    grid = edk.stitching.TargetGrid(
+        "EPSG:32634", (30, -30), (400010, 4400010, 500000, 4500000), origin=(15, 15)
+    )
+
+    assert grid.bounds == (400005.0, 4399995.0, 500025.0, 4500015.0)
+    assert (grid.x_size, grid.y_size) == (3334, 3334)
+    assert grid.geo_transform == (400005.0, 30.0, 0.0, 4500015.0, 0.0, -30.0)
+
+
+def test_target_grid_tile_bounds():
+    """Test that tiles are placed on the grid pixels and tiles outside the grid are dropped"""
+    grid = edk.stitching.TargetGrid.from_bbox(
+        (19.3, 39.6, 21.1, 42.7), "EPSG:4326", (0.0006, -0.0006)
+    )
+    tiles = pd.DataFrame(
+        {
+            "x_min": [400000, 0],
+            "y_min": [4400000, 0],
+            "x_max": [500000, 1],
+            "y_max": [4500000, 1],
+            "projection": ["EPSG:32634", "EPSG:32634"],
+        }
+    )
+
+    bounds = grid.get_tile_bounds(tiles)
+
+    assert np.isnan(bounds[1]).all()
+    cols = (bounds[0, [0, 2]] - grid.bounds[0]) / grid.x_res
+    np.testing.assert_allclose(cols, np.round(cols), atol=1e-6)
+    assert bounds[0, 2] <= grid.bounds[2]
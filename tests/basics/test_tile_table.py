@@ -0,0 +1,122 @@
+import pickle
+import datetime
+import numpy as np
+import pandas as pd
+import shapely
+from earth_data_kit.stitching.classes.tile_table import TileTable
+
+UTM_34N = "EPSG:32634"
+
+
+def _band(source_idx, description, nodataval=None):
+    return {
+        "source_idx": source_idx,
+        "description": description,
+        "dtype": "UInt16",
+        "nodataval": nodataval,
+        "block_x_size": 512,
+        "block_y_size": 512,
+        "color_interp": "Gray",
+    }
+
+
+def _tiles():
+    # Three tiles with 2, 1 and 3 bands, the second one non temporal and without CRS
+    return TileTable.from_df(
+        pd.DataFrame(
+            {
+                "engine_path": [f"s3://bucket/{name}.tif" for name in "abc"],
+                "gdal_path": [f"/vsis3/bucket/{name}.tif" for name in "abc"],
+                "tile_name": [f"{name}.tif" for name in "abc"],
+                "date": [
+                    datetime.datetime(2020, 1, 1),
+                    None,
+                    datetime.datetime(2020, 1, 3),
+                ],
+                "geo_transform": [
+                    (399960.0 + i * 109800.0, 10.0, 0.0, 4600020.0, 0.0, -10.0)
+                    for i in range(3)
+                ],
+                "projection": [UTM_34N, None, UTM_34N],
+                "length_unit": ["metre", None, "metre"],
+                "crs": [UTM_34N, None, UTM_34N],
+                "x_size": [10980, 10980, 10980],
+                "y_size": [10980, 10980, 10980],
+                "bands": [
+                    [_band(1, "B01", 0.0), _band(2, "B02")],
+                    [_band(1, "B01")],
+                    [_band(1, "B01"), _band(2, "B02"), _band(3, "B03", -1.0)],
+                ],
+            }
+        )
+    )
+
+
+def _footprints(tiles):
+    return np.array(
+        [shapely.box(19.0 + i, 40.0, 20.0 + i, 41.0) for i in range(len(tiles))]
+    )
+
+
+def test_take_and_filter_gather_bands_through_offsets():
+    """Test that selecting tiles keeps their ids, interned values and own bands only"""
+    tiles = _tiles()
+
+    taken = tiles.take([2, 0])
+    assert taken.ids.tolist() == [2, 0]
+    assert taken.band_offsets.tolist() == [0, 3, 5]
+    assert [b["description"] for b in taken.get_bands(0)] == ["B01", "B02", "B03"]
+    assert taken.get_bands(0)[2]["nodataval"] == -1.0
+    assert taken.get_values("crs").tolist() == [UTM_34N, UTM_34N]
+
+    filtered = tiles.filter([False, True, True])
+    assert filtered.ids.tolist() == [1, 2]
+    assert filtered.get_values("projection").tolist() == [None, UTM_34N]
+    assert [len(filtered.get_bands(i)) for i in range(len(filtered))] == [1, 3]
+    assert len(tiles.filter([False, False, False])) == 0
+
+
+def test_band_table_broadcasts_tiles_to_their_bands():
+    """Test that the band table has one row per band, with the attributes of its tile"""
+    df = _tiles().take([2, 1]).band_table()
+
+    assert df["tile_id"].tolist() == [2, 2, 2, 1]
+    assert df["description"].tolist() == ["B01", "B02", "B03", "B01"]
+    assert df["gdal_path"].tolist() == ["/vsis3/bucket/c.tif"] * 3 + [
+        "/vsis3/bucket/b.tif"
+    ]
+    assert df["nodataval"].isna().tolist() == [True, True, False, True]
+    assert df["x_min"].tolist() == [619560.0] * 3 + [509760.0]
+    assert df["date"].isna().tolist() == [False, False, False, True]
+
+
+def test_pickling_keeps_the_table():
+    """Test that tables pickled through __getstate__ come back with the same values"""
+    tiles = _tiles().take([1, 2])
+
+    restored = pickle.loads(pickle.dumps(tiles))
+
+    assert restored.ids.tolist() == [1, 2]
+    assert (
+        restored.gdal_path.dtype == object
+        and restored.gdal_path.tolist() == tiles.gdal_path.tolist()
+    )
+    assert restored.get_values("crs").tolist() == [None, UTM_34N]
+    assert restored.band_table().equals(tiles.band_table())
+
+
+def test_catalog_table_round_trip():
+    """Test that tiles written to a catalog table are read back unchanged, null values included"""
+    tiles = _tiles()
+
+    table = tiles.to_catalog_table(_footprints(tiles))
+    restored = TileTable.from_catalog_table(table)
+
+    assert table["bbox"].to_pylist()[1] == {
+        "xmin": 20.0,
+        "ymin": 40.0,
+        "xmax": 21.0,
+        "ymax": 41.0,
+    }
+    pd.testing.assert_frame_equal(restored.to_df(), tiles.to_df())
+    pd.testing.assert_frame_equal(restored.band_table(), tiles.band_table())
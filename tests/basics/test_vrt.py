@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+import pytest
+from osgeo import gdal, osr
+from earth_data_kit.stitching import vrt
+from earth_data_kit.stitching.classes.tile_table import TileTable
+from earth_data_kit.utilities import transform
+
+gdal.UseExceptions()
+
+SIZE = 100
+
+
+def _write_tile(path, x_min, y_max, res, offset, wkt):
+    """Two band UInt16 tile, the second band having 0 as nodata over its left half"""
+    ds = gdal.GetDriverByName("GTiff").Create(str(path), SIZE, SIZE, 2, gdal.GDT_UInt16)
+    ds.SetGeoTransform((x_min, res, 0.0, y_max, 0.0, -res))
+    ds.SetProjection(wkt)
+    values = np.arange(SIZE * SIZE, dtype=np.uint16).reshape(SIZE, SIZE) + offset
+    masked = values.copy()
+    masked[:, : SIZE // 2] = 0
+    for band_num, (description, data) in enumerate(
+        [("B01", values), ("B02", masked)], start=1
+    ):
+        band = ds.GetRasterBand(band_num)
+        band.SetDescription(description)
+        band.WriteArray(data)
+    ds.GetRasterBand(2).SetNoDataValue(0)
+    ds.Close()
+
+
+def _band_tiles(paths, origins, res, wkt, crs):
+    bands = [
+        {
+            "source_idx": i,
+            "description": d,
+            "dtype": "UInt16",
+            "nodataval": n,
+            "color_interp": "Gray",
+        }
+        for i, d, n in [(1, "B01", None), (2, "B02", 0.0)]
+    ]
+    df = pd.DataFrame(
+        {
+            "engine_path": paths,
+            "gdal_path": paths,
+            "tile_name": paths,
+            "date": [None] * len(paths),
+            "geo_transform": [(x, res, 0.0, y, 0.0, -res) for x, y in origins],
+            "projection": [wkt] * len(paths),
+            "length_unit": ["metre"] * len(paths),
+            "crs": [crs] * len(paths),
+            "x_size": [SIZE] * len(paths),
+            "y_size": [SIZE] * len(paths),
+            "bands": [bands] * len(paths),
+        }
+    )
+    return TileTable.from_df(df).band_table()
+
+
+# Two tiles overlapping by 20 pixels, the later one winning where it has data, one far away, and
+# a clip window in the CRS of the tiles
+CASES = {
+    "EPSG:32634": (
+        10.0,
+        [(500000.0, 4501000.0), (500800.0, 4500950.0), (600000.0, 4501000.0)],
+        (500255.0, 4500123.0, 501537.0, 4500871.0),
+    ),
+    # Latitude first in its official axis order
+    "EPSG:4326": (
+        0.001,
+        [(20.0, 40.1), (20.08, 40.095), (21.0, 40.1)],
+        (20.0255, 40.0123, 20.1537, 40.0871),
+    ),
+}
+
+
+@pytest.mark.parametrize("crs", CASES)
+def test_mosaic_vrt_matches_build_vrt_and_translate(tmp_path, crs):
+    """Test that the analytic windows read the same pixels as gdal.BuildVRT followed by gdal.Translate"""
+    res, origins, window = CASES[crs]
+    srs = osr.SpatialReference()
+    srs.SetFromUserInput(crs)
+    wkt = srs.ExportToWkt()
+
+    paths = [str(tmp_path / f"tile_{i}.tif") for i in range(len(origins))]
+    for i, (path, (x_min, y_max)) in enumerate(zip(paths, origins)):
+        _write_tile(path, x_min, y_max, res, i * 10000, wkt)
+
+    to_wgs84, _ = transform.get_wgs84_transformers(wkt)
+    bbox = to_wgs84.transform_bounds(*window)
+    band_tiles = _band_tiles(paths, origins, res, wkt, crs)
+
+    xml, bands_found = vrt.build_mosaic_vrt(band_tiles, ["B01", "B02"], bbox)
+    assert bands_found == ["B01", "B02"]
+    assert xml.count(paths[2]) == 0
+    (tmp_path / "mosaic.vrt").write_text(xml)
+    ds = gdal.Open(str(tmp_path / "mosaic.vrt"))
+
+    geo_transform, x_size, y_size = vrt.get_mosaic_grid(band_tiles, bands_found, bbox)
+    mosaic = gdal.BuildVRT(str(tmp_path / "reference.vrt"), paths)
+    reference = gdal.Translate(
+        str(tmp_path / "reference.tif"),
+        mosaic,
+        projWin=[
+            geo_transform[0],
+            geo_transform[3],
+            geo_transform[0] + x_size * geo_transform[1],
+            geo_transform[3] + y_size * geo_transform[5],
+        ],
+    )
+
+    assert (ds.RasterXSize, ds.RasterYSize) == (
+        reference.RasterXSize,
+        reference.RasterYSize,
+    )
+    np.testing.assert_allclose(ds.GetGeoTransform(), reference.GetGeoTransform())
+    np.testing.assert_array_equal(ds.ReadAsArray(), reference.ReadAsArray())
+    assert [ds.GetRasterBand(i).GetDescription() for i in (1, 2)] == ["B01", "B02"]
+    assert ds.GetRasterBand(2).GetNoDataValue() == 0
+    # Same axis mapping as GDAL, so readers do not swap x and y of latitude first CRSs
+    assert (
+        ds.GetSpatialRef().GetDataAxisToSRSAxisMapping()
+        == mosaic.GetSpatialRef().GetDataAxisToSRSAxisMapping()
+    )
+    if crs == "EPSG:4326":
+        assert ds.GetSpatialRef().GetDataAxisToSRSAxisMapping() == [2, 1]
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import earth_data_kit.stitching.warp as warp
+
+PARAMS = ("EPSG:4326", (0.0001, -0.0001), "nearest", False)
+
+
+def _output(path, x_min=20.0, y_max=41.0, res=0.0001, x_size=500, y_size=400):
+    return {
+        "path": path,
+        "geo_transform": (x_min, res, 0.0, y_max, 0.0, -res),
+        "x_size": x_size,
+        "y_size": y_size,
+        "block_x_size": 128,
+        "block_y_size": 128,
+    }
+
+
+def test_warp_key_only_changes_with_the_source_and_warp_parameters():
+    """Test that the key is stable across calls, and changes with the source version and every warp parameter"""
+    key = warp.get_warp_key("/data/a.tif", "v1", *PARAMS)
+
+    assert warp.get_warp_key("/data/a.tif", "v1", *PARAMS) == key
+    # Resolutions from the grid or from the user are normalized
+    assert (
+        warp.get_warp_key(
+            "/data/a.tif", "v1", "EPSG:4326", [0.0001, -0.0001], "nearest", False
+        )
+        == key
+    )
+    assert warp.get_warp_key("/data/b.tif", "v1", *PARAMS) != key
+    assert warp.get_warp_key("/data/a.tif", "v2", *PARAMS) != key
+    for i, value in enumerate(["EPSG:3857", (0.0002, -0.0002), "bilinear", True]):
+        params = list(PARAMS)
+        params[i] = value
+        assert warp.get_warp_key("/data/a.tif", "v1", *params) != key
+    bounds = (20.0, 40.0, 21.0, 41.0)
+    assert warp.get_warp_key("/data/a.tif", "v1", *PARAMS, bounds) != key
+    assert warp.get_warp_key("/data/a.tif", "v1", *PARAMS, bounds) == warp.get_warp_key(
+        "/data/a.tif", "v1", *PARAMS, [20, 40, 21, 41]
+    )
+
+
+def test_sources_are_warped_once_whatever_their_bands_and_dates(tmp_path, monkeypatch):
+    """Test that all bands and dates of a source share its warped output, until the source changes"""
+    sources = [tmp_path / "a.tif", tmp_path / "b.tif"]
+    for source in sources:
+        source.write_bytes(b"v1")
+    # A non temporal source a, used on both dates, and a source b on the second date
+    df = pd.DataFrame(
+        {
+            "gdal_path": [str(sources[i]) for i in (0, 0, 0, 0, 1, 1)],
+            "date": pd.to_datetime(["2020-01-01", "2020-01-01"] + ["2020-01-02"] * 4),
+            "description": ["B01", "B02"] * 3,
+        }
+    )
+    calls = []
+
+    def warp_tile(gdal_path, output_path, *args):
+        calls.append(gdal_path)
+        return _output(output_path)
+
+    monkeypatch.setattr(warp, "warp_tile", warp_tile)
+    warp_dir = str(tmp_path / "warped")
+
+    first = warp.warp_tiles(df, warp_dir, *PARAMS)
+
+    assert sorted(calls) == [str(s) for s in sources]
+    outputs = first.groupby(df["gdal_path"])["gdal_path"].unique()
+    assert outputs.map(len).tolist() == [1, 1]
+    assert first["gdal_path"].str.startswith(warp_dir).all()
+
+    sources[1].write_bytes(b"v2, replaced in place")
+    second = warp.warp_tiles(df, warp_dir, *PARAMS)
+
+    assert (second["gdal_path"] == first["gdal_path"]).tolist() == [True] * 4 + [
+        False
+    ] * 2
+
+
+def test_set_outputs_describes_the_extent_of_the_outputs():
+    """Test that rows get the extent, size and block size of their output, without modifying the input rows"""
+    df = pd.DataFrame(
+        {
+            "gdal_path": ["/data/a.tif", "/data/b.tif"],
+            "description": ["B01", "B01"],
+            "x_min": [0.0, 0.0],
+        }
+    )
+    outputs = [
+        _output("/warped/a.vrt"),
+        _output("/warped/b.vrt", x_min=-10.5, y_max=-3.0, res=0.5, x_size=3, y_size=2),
+    ]
+
+    result = warp.set_outputs(df, outputs)
+
+    assert result["gdal_path"].tolist() == ["/warped/a.vrt", "/warped/b.vrt"]
+    np.testing.assert_allclose(
+        result[["x_min", "y_min", "x_max", "y_max"]],
+        [[20.0, 40.96, 20.05, 41.0], [-10.5, -4.0, -9.0, -3.0]],
+    )
+    assert result[["x_size", "y_size"]].values.tolist() == [[500, 400], [3, 2]]
+    assert result["block_x_size"].tolist() == [128, 128]
+    assert result["description"].tolist() == ["B01", "B01"]
+    assert df["gdal_path"].tolist() == ["/data/a.tif", "/data/b.tif"]
+    assert df["x_min"].tolist() == [0.0, 0.0]
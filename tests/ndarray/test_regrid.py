@@ -0,0 +1,66 @@
+# This file tests the regridding engine used by Dataset.combine on synthetic grids,
+# against xarray's own interpolation and a block average.
+import numpy as np
+import xarray as xr
+import earth_data_kit.xarray_boosted.regrid as regrid
+
+
+def _grid(n_x, n_y, res, chunks=None):
+    x = np.arange(n_x) * res + res / 2
+    y = 100 - (np.arange(n_y) * res + res / 2)
+    data = np.random.default_rng(0).random((1, 1, n_x, n_y)).astype(np.float32)
+    da = xr.DataArray(
+        data,
+        dims=("time", "band", "x", "y"),
+        coords={"time": [np.datetime64("2020-01-01")], "band": [1], "x": x, "y": y},
+    )
+    return da.chunk(chunks) if chunks else da
+
+
+def test_linear_matches_interp():
+    src = _grid(200, 150, 1.0, {"x": 64, "y": 64})
+    ref = _grid(90, 70, 2.1, {"x": 32, "y": 32})
+
+    out = regrid.regrid(src, ref, method="linear")
+    expected = src.interp(x=ref.x, y=ref.y, method="linear")
+
+    assert out.chunksizes["x"] == ref.chunksizes["x"]
+    np.testing.assert_allclose(out.values, expected.values, rtol=1e-5)
+
+
+def test_linear_is_not_extrapolated_beyond_outer_centers():
+    src = _grid(10, 10, 1.0)
+    # Centers before the first source center, on both outer centers and after the last one
+    ref = src.isel(x=[0, 0, 9, 9], y=[0, 0, 9, 9]).assign_coords(
+        x=[0.2, 0.5, 9.5, 9.8], y=[99.8, 99.5, 90.5, 90.2]
+    )
+
+    out = regrid.regrid(src, ref, method="linear")
+    expected = src.interp(x=ref.x, y=ref.y, method="linear")
+
+    assert (
+        np.isnan(out.values[0, 0, [0, 3], :]).all()
+        and np.isnan(out.values[0, 0, :, [0, 3]]).all()
+    )
+    np.testing.assert_allclose(out.values, expected.values, rtol=1e-5, equal_nan=True)
+
+
+def test_conservative_is_block_average():
+    src = _grid(40, 40, 1.0)
+    ref = _grid(10, 10, 4.0)
+
+    out = regrid.regrid(src, ref, method="conservative").values
+    expected = src.values.reshape(1, 1, 10, 4, 10, 4).mean(axis=(3, 5))
+
+    np.testing.assert_allclose(out, expected, rtol=1e-5)
+
+
+def test_nodata_does_not_spread():
+    src = _grid(40, 40, 1.0)
+    src[0, 0, :4, :4] = np.nan
+    ref = _grid(10, 10, 4.0)
+
+    out = regrid.regrid(src, ref, method="nearest").values
+
+    assert np.isnan(out[0, 0, 0, 0])
+    assert not np.isnan(out[0, 0, 1:, 1:]).any()
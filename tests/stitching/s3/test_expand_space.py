@@ -0,0 +1,46 @@
+import datetime
+import shapely
+import geopandas as gpd
+from earth_data_kit.stitching.engines.s3 import S3
+
+SOURCE = "s3://modis-pds/MCD43A4.006/{h}/{v}/%Y%j/*_B0?.TIF"
+GRID = gpd.GeoDataFrame(
+    {
+        "h": ["19", "20", "21"],
+        "v": ["04", "04", "05"],
+        "geometry": [
+            shapely.box(0, 0, 1, 1),
+            shapely.box(1, 0, 2, 1),
+            shapely.box(5, 5, 6, 6),
+        ],
+    }
+)
+
+
+def test_patterns_are_expanded_over_intersecting_cells():
+    """Test that every time pattern is expanded with the grid cells intersecting the AOI only"""
+    aoi = shapely.Polygon([(0.5, 0.5), (1.5, 0.5), (1.5, 0.9)])
+    space_opts = {"grid_dataframe": GRID, "bbox": aoi.bounds, "aoi": aoi}
+    time_opts = {
+        "start": datetime.datetime(2017, 1, 1),
+        "end": datetime.datetime(2017, 1, 2, 12),
+    }
+
+    df = S3().get_patterns(SOURCE, time_opts, space_opts)
+
+    assert df["search_path"].tolist() == [
+        "s3://modis-pds/MCD43A4.006/19/04/2017001/*_B0?.TIF",
+        "s3://modis-pds/MCD43A4.006/20/04/2017001/*_B0?.TIF",
+        "s3://modis-pds/MCD43A4.006/19/04/2017002/*_B0?.TIF",
+        "s3://modis-pds/MCD43A4.006/20/04/2017002/*_B0?.TIF",
+    ]
+    assert df["date"].dt.day.tolist() == [1, 1, 2, 2]
+
+
+def test_spatial_only_template():
+    """Test that templates without time directives are expanded over the grid"""
+    space_opts = {"grid_dataframe": GRID, "bbox": (4.5, 4.5, 5.5, 5.5)}
+
+    df = S3().get_patterns("s3://bucket/{h}/{v}/*.TIF", {}, space_opts)
+
+    assert df["search_path"].tolist() == ["s3://bucket/21/05/*.TIF"]
@@ -0,0 +1,100 @@
+import time
+import pandas as pd
+from earth_data_kit.stitching.engines import planner
+from earth_data_kit.stitching.engines.listing_cache import ListingCache
+
+OBJECTS = [
+    {
+        "key": "s3://bucket/a/B01.TIF",
+        "size": 10,
+        "etag": "abc",
+        "last_modified": "2017-01-02T00:00:00+00:00",
+    }
+]
+
+
+def test_historical_listings_never_expire(tmp_path):
+    """Test that listings of old periods stay valid after the TTL while recent ones expire"""
+    cache = ListingCache(
+        path=str(tmp_path / "cache.sqlite"), ttl=0.5, immutable_after_days=30
+    )
+    cache.put(
+        [
+            ("s3://bucket/2017001/*.TIF", pd.Timestamp("2017-01-02"), OBJECTS),
+            ("s3://bucket/today/*.TIF", pd.Timestamp.now(), OBJECTS),
+            ("s3://bucket/no-date/*.TIF", None, []),
+        ]
+    )
+    search_paths = [
+        "s3://bucket/2017001/*.TIF",
+        "s3://bucket/today/*.TIF",
+        "s3://bucket/no-date/*.TIF",
+    ]
+
+    assert cache.get(search_paths) == {0: OBJECTS, 1: OBJECTS, 2: []}
+    time.sleep(0.6)
+    assert cache.get(search_paths) == {0: OBJECTS}
+
+
+def test_prefix_ttl_and_invalidation(tmp_path):
+    """Test that per prefix TTLs override the default one and invalidated prefixes are listed again"""
+    cache = ListingCache(
+        path=str(tmp_path / "cache.sqlite"),
+        ttl=0,
+        immutable_after_days=None,
+        prefix_ttls={"s3://bucket/slow_": 3600},
+    )
+    cache.put(
+        [
+            ("s3://bucket/slow_a/*.TIF", None, OBJECTS),
+            ("s3://bucket/fast/*.TIF", None, OBJECTS),
+        ]
+    )
+
+    assert cache.get(["s3://bucket/slow_a/*.TIF", "s3://bucket/fast/*.TIF"]) == {
+        0: OBJECTS
+    }
+    # "_" is not a wildcard of the prefix
+    assert cache.invalidate("s3://bucket/slowXa") == 0
+    assert cache.invalidate("s3://bucket/slow_") == 1
+    assert cache.get(["s3://bucket/slow_a/*.TIF"]) == {}
+
+
+def test_periods_in_progress_are_not_immutable(tmp_path):
+    """Test that a yearly prefix whose year started long ago but is not over keeps expiring"""
+    cache = ListingCache(
+        path=str(tmp_path / "cache.sqlite"), ttl=0, immutable_after_days=30
+    )
+    now = pd.Timestamp.now(tz="UTC").tz_localize(None)
+    df = planner.plan_search_paths(
+        "s3://bucket/%Y/*/B04.tif", now.replace(month=1, day=1), now
+    )
+    ((search_path, end),) = df[["search_path", "end"]].itertuples(index=False)
+
+    assert end == pd.Timestamp(now.year + 1, 1, 1)
+    cache.put(
+        [
+            (search_path, end, OBJECTS),
+            ("s3://bucket/2017/*/B04.tif", pd.Timestamp("2018-01-01"), OBJECTS),
+        ]
+    )
+    assert cache.get([search_path, "s3://bucket/2017/*/B04.tif"]) == {1: OBJECTS}
+
+
+def test_objects_of_expired_listings_are_not_trusted(tmp_path):
+    """Test that the ETag of an object only comes from valid listings, an expired one may be outdated"""
+    cache = ListingCache(
+        path=str(tmp_path / "cache.sqlite"), ttl=0.5, immutable_after_days=30
+    )
+    recent = [{**OBJECTS[0], "key": "s3://bucket/today/B01.TIF"}]
+    cache.put(
+        [
+            ("s3://bucket/2017001/*.TIF", pd.Timestamp("2017-01-02"), OBJECTS),
+            ("s3://bucket/today/*.TIF", pd.Timestamp.now(), recent),
+        ]
+    )
+    keys = ["s3://bucket/a/B01.TIF", "s3://bucket/today/B01.TIF"]
+
+    assert cache.get_objects(keys) == {o["key"]: o for o in OBJECTS + recent}
+    time.sleep(0.6)
+    assert cache.get_objects(keys) == {o["key"]: o for o in OBJECTS}
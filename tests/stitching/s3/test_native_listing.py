@@ -0,0 +1,163 @@
+import os
+import time
+import datetime
+import pandas as pd
+import pytest
+import earth_data_kit.stitching.engines.s3 as s3
+import earth_data_kit.stitching.engines.s3_listing as s3_listing
+import earth_data_kit.stitching.engines.listing_cache as listing_cache
+import earth_data_kit.stitching.engines.raster_cache as raster_cache
+
+pytest.importorskip("aiobotocore")
+boto3 = pytest.importorskip("boto3")
+moto_server = pytest.importorskip("moto.server")
+
+BUCKET = "edk-listing"
+KEYS = [
+    "modis/h19/v04/2017001/B01.TIF",
+    "modis/h19/v04/2017001/B02.TIF",
+    "modis/h19/v04/2017002/B01.TIF",
+    "modis/h19/v05/2017001/B01.TIF",
+    "modis/h20/v04/2017001/B01.TIF",
+    "modis/h20/v04/2017001/B01.TIF.aux.xml",
+    "other/2017001/B01.TIF",
+]
+
+
+@pytest.fixture(scope="module")
+def s3_server():
+    server = moto_server.ThreadedMotoServer(port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    endpoint = f"http://{host}:{port}"
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("AWS_ENDPOINT_URL", endpoint)
+        mp.setenv("AWS_ACCESS_KEY_ID", "testing")
+        mp.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+        mp.setenv("AWS_REGION", "us-east-1")
+        mp.setenv("AWS_DEFAULT_REGION", "us-east-1")
+        client = boto3.client("s3", endpoint_url=endpoint)
+        client.create_bucket(Bucket=BUCKET)
+        for key in KEYS:
+            client.put_object(Bucket=BUCKET, Key=key, Body=b"")
+        yield endpoint
+    server.stop()
+
+
+def _list(search_paths, **kwargs):
+    pages = list(s3_listing.S3Lister(**kwargs).iter_keys(search_paths))
+    return sorted(k for _, keys in pages for k in keys)
+
+
+def test_wildcards_match_across_prefixes(s3_server):
+    """Test that * matches across "/" like s5cmd, with sub-prefixes listed concurrently"""
+    assert _list([f"s3://{BUCKET}/modis/*/2017001/*.TIF"]) == [
+        f"s3://{BUCKET}/modis/h19/v04/2017001/B01.TIF",
+        f"s3://{BUCKET}/modis/h19/v04/2017001/B02.TIF",
+        f"s3://{BUCKET}/modis/h19/v05/2017001/B01.TIF",
+        f"s3://{BUCKET}/modis/h20/v04/2017001/B01.TIF",
+    ]
+    assert _list(
+        [f"s3://{BUCKET}/modis/h19/v04/2017001/B0?.TIF", f"s3://{BUCKET}/missing/*"]
+    ) == [
+        f"s3://{BUCKET}/modis/h19/v04/2017001/B01.TIF",
+        f"s3://{BUCKET}/modis/h19/v04/2017001/B02.TIF",
+    ]
+
+
+def test_pagination(s3_server):
+    """Test that listings larger than a page are fully returned"""
+    client = boto3.client("s3", endpoint_url=s3_server)
+    for i in range(1500):
+        client.put_object(Bucket=BUCKET, Key=f"many/{i:05d}.TIF", Body=b"")
+
+    assert len(_list([f"s3://{BUCKET}/many/*.TIF"], max_concurrency=4)) == 1500
+
+
+def test_missing_bucket_raises(s3_server):
+    """Test that listing errors are raised instead of returning no keys"""
+    with pytest.raises(Exception):
+        _list(["s3://edk-missing-bucket/*"])
+
+
+def test_scan_with_native_lister(s3_server, tmp_path, monkeypatch):
+    """Test that S3.scan builds the same rows from the native lister"""
+    monkeypatch.setenv("EDK_S3_LISTER", "native")
+    monkeypatch.setattr(
+        listing_cache._cache,
+        "cache",
+        listing_cache.ListingCache(path=str(tmp_path / "cache.sqlite")),
+    )
+    source = f"s3://{BUCKET}/modis/h19/v04/%Y%j/*.TIF"
+    time_opts = {
+        "start": datetime.datetime(2017, 1, 1),
+        "end": datetime.datetime(2017, 1, 2, 12),
+    }
+
+    df = s3.S3().scan(source, time_opts, {}, str(tmp_path), "description")
+
+    assert sorted(df["tile_name"]) == ["B01.TIF", "B01.TIF", "B02.TIF"]
+    assert df["gdal_path"].str.startswith(f"/vsis3/{BUCKET}/").all()
+    assert sorted(df["date"].dt.day.unique()) == [1, 2]
+
+    # Historical search paths are served from the listing cache
+    cached = listing_cache.get_listing_cache().get(
+        [f"s3://{BUCKET}/modis/h19/v04/2017001/*.TIF"]
+    )
+    assert [o["key"] for o in cached[0]] == [
+        f"s3://{BUCKET}/modis/h19/v04/2017001/B01.TIF",
+        f"s3://{BUCKET}/modis/h19/v04/2017001/B02.TIF",
+    ]
+
+
+def test_head_objects(s3_server):
+    """Test that the ETag and size of objects are fetched, missing objects being left out"""
+    key = f"s3://{BUCKET}/modis/h19/v04/2017001/B01.TIF"
+    objects = s3_listing.S3Lister().head_objects([key, f"s3://{BUCKET}/missing.TIF"])
+
+    assert list(objects) == [key]
+    assert objects[key]["size"] == 0 and objects[key]["etag"]
+
+
+def test_sync_does_not_serve_changed_objects_from_expired_listings(
+    s3_server, tmp_path, monkeypatch
+):
+    """Test that an object changed since an expired listing is downloaded again, not linked from the raster cache"""
+    client = boto3.client("s3", endpoint_url=s3_server)
+    key = "changed/B01.TIF"
+    client.put_object(Bucket=BUCKET, Key=key, Body=b"old")
+    old = client.head_object(Bucket=BUCKET, Key=key)
+
+    # The old version was listed and cached by another dataset, then the object changed
+    cache = listing_cache.ListingCache(
+        path=str(tmp_path / "listings.sqlite"), ttl=0.5, immutable_after_days=None
+    )
+    obj = {"key": f"s3://{BUCKET}/{key}", "size": 3, "etag": old["ETag"].strip('"')}
+    cache.put([(f"s3://{BUCKET}/changed/*.TIF", None, [obj])])
+    rasters = raster_cache.RasterCache(path=str(tmp_path / "rasters"))
+    (tmp_path / "old.TIF").write_bytes(b"old")
+    rasters.put(obj["key"], obj["etag"], str(tmp_path / "old.TIF"))
+    client.put_object(Bucket=BUCKET, Key=key, Body=b"new!")
+    time.sleep(0.6)
+
+    def download(cmd):
+        # Stands in for `s5cmd run`, copying with boto3 from the commands file
+        with open(cmd.split()[-1]) as f:
+            for line in f:
+                _, _, src, dst = line.split()
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                client.download_file(BUCKET, src[len(f"s3://{BUCKET}/") :], dst)
+        return 0
+
+    monkeypatch.setattr(listing_cache._cache, "cache", cache)
+    monkeypatch.setattr(raster_cache._cache, "cache", rasters)
+    monkeypatch.setattr(s3.os, "system", download)
+    df = pd.DataFrame(
+        {"engine_path": [obj["key"]], "gdal_path": [f"/vsis3/{BUCKET}/{key}"]}
+    )
+
+    df = s3.S3().sync(df, str(tmp_path / "ds"))
+
+    with open(df["gdal_path"].iloc[0], "rb") as f:
+        assert f.read() == b"new!"
@@ -0,0 +1,63 @@
+import datetime
+from earth_data_kit.stitching.engines import planner
+
+GOES = "s3://noaa-goes16/ABI-L1b-RadC/%Y/%j/%H/*_s%Y%j%H%M*.nc"
+
+
+def test_minute_template_is_listed_per_hour():
+    """Test that directives after the first wildcard do not multiply the search paths"""
+    df = planner.plan_search_paths(
+        GOES, datetime.datetime(2023, 1, 1), datetime.datetime(2023, 1, 31)
+    )
+
+    assert len(df) == 30 * 24
+    assert df["search_path"].is_unique
+    assert (
+        df["search_path"].iloc[0] == "s3://noaa-goes16/ABI-L1b-RadC/2023/001/00/*_s*.nc"
+    )
+
+
+def test_month_template_is_listed_per_month():
+    """Test that month level prefixes are listed once, not once per day"""
+    df = planner.plan_search_paths(
+        "s3://bucket/%Y/%-m/*/B04.tif",
+        datetime.datetime(2022, 12, 15),
+        datetime.datetime(2023, 1, 20),
+    )
+
+    assert df["search_path"].tolist() == [
+        "s3://bucket/2022/12/*/B04.tif",
+        "s3://bucket/2023/1/*/B04.tif",
+    ]
+
+
+def test_template_regex_filters_keys():
+    """Test that keys are matched against the full template, repeated directives matching the same value"""
+    regex = planner.template_to_regex(GOES)
+    key = "s3://noaa-goes16/ABI-L1b-RadC/2023/001/00/OR_ABI-L1b-RadC-M6C01_G16_s20230010001174_e20230010003547_c20230010004022.nc"
+
+    assert regex.match(key).groupdict() == {
+        "year": "2023",
+        "day_of_year": "001",
+        "hour": "00",
+        "minute": "01",
+    }
+    assert regex.match(key.replace("_s2023001", "_s2023002")) is None
+    assert regex.match(key + ".aux.xml") is None
+
+
+def test_dates_are_extracted_with_sub_daily_components():
+    """Test that keys get their full timestamp, day of year and unpadded directives included"""
+    keys = [
+        "s3://noaa-goes16/ABI-L1b-RadC/2023/032/05/OR_ABI-L1b-RadC-M6C01_G16_s20230320501174_e20230320503547.nc",
+        "s3://noaa-goes16/ABI-L1b-RadC/2023/032/05/OR_ABI-L1b-RadC-M6C01_G16_s20230330501174_e20230320503547.nc",
+    ]
+    dates = planner.extract_dates(
+        keys, "s3://noaa-goes16/ABI-L1b-RadC/%Y/%j/%H/*_s%Y%j%H%M%S*.nc"
+    )
+
+    assert dates.iloc[0] == datetime.datetime(2023, 2, 1, 5, 1, 17)
+    assert dates.isna().iloc[1]
+    assert planner.extract_dates(
+        ["s3://bucket/2020/3/7/B04.tif"], "s3://bucket/%Y/%-m/%-d/*.tif"
+    ).tolist() == [datetime.datetime(2020, 3, 7)]
@@ -0,0 +1,42 @@
+import os
+from earth_data_kit.stitching.engines.raster_cache import RasterCache
+
+
+def test_objects_are_linked_by_uri_and_etag(tmp_path):
+    """Test that a cached object is materialized in another workspace without copying, a new ETag being a miss"""
+    cache = RasterCache(path=str(tmp_path / "cache"))
+    synced = tmp_path / "ds1" / "B01.TIF"
+    synced.parent.mkdir()
+    synced.write_bytes(b"1234")
+    cache.put("s3://bucket/B01.TIF", "abc", str(synced))
+
+    linked = tmp_path / "ds2" / "B01.TIF"
+    assert cache.get("s3://bucket/B01.TIF", "abc", str(linked))
+    assert os.path.samefile(synced, linked)
+    assert not cache.get(
+        "s3://bucket/B01.TIF", "def", str(tmp_path / "ds3" / "B01.TIF")
+    )
+
+    stats = cache.stats()
+    assert (stats["objects"], stats["hits"], stats["misses"], stats["bytes_saved"]) == (
+        1,
+        1,
+        1,
+        4,
+    )
+
+
+def test_least_recently_used_objects_are_evicted(tmp_path):
+    """Test that objects over the size cap are evicted, least recently used first"""
+    cache = RasterCache(path=str(tmp_path / "cache"), max_bytes=8)
+    for name in ["a", "b", "c"]:
+        path = tmp_path / name
+        path.write_bytes(b"1234")
+        cache.put(f"s3://bucket/{name}", "etag", str(path))
+        if name == "b":
+            # Using "a" makes "b" the least recently used
+            assert cache.get("s3://bucket/a", "etag", str(tmp_path / "a2"))
+
+    assert cache.get("s3://bucket/a", "etag", str(tmp_path / "a3"))
+    assert not cache.get("s3://bucket/b", "etag", str(tmp_path / "b2"))
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,27 @@
+from earth_data_kit.stitching.engines.sync_manifest import SyncManifest, needs_sync
+
+
+def test_only_partial_truncated_and_changed_objects_are_synced(tmp_path):
+    """Test that skip decisions come from the manifest, the local size and the current ETag"""
+    manifest = SyncManifest(str(tmp_path / "sync-manifest.sqlite"))
+    local_path = tmp_path / "B01.TIF"
+    local_path.write_bytes(b"1234")
+    entry = {
+        "key": "s3://bucket/B01.TIF",
+        "local_path": str(local_path),
+        "etag": "abc",
+        "size": 4,
+    }
+
+    manifest.start([entry])
+    assert needs_sync(manifest.get([entry["key"]])[entry["key"]], None)
+
+    manifest.complete([entry])
+    synced = manifest.get([entry["key"]])[entry["key"]]
+    assert not needs_sync(synced, {"etag": "abc", "size": 4})
+    assert not needs_sync(synced, None)
+    assert needs_sync(synced, None, overwrite=True)
+    assert needs_sync(synced, {"etag": "def", "size": 4})
+
+    local_path.write_bytes(b"12")
+    assert needs_sync(synced, {"etag": "abc", "size": 4})